@@ -1,6 +1,17 @@
 import requests
 import json
 import datetime
+import os
+import sys
+import argparse
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from requests.adapters import HTTPAdapter
+
+# 수집 결과를 웹앱 DB(web_app/data/mirae.db)에도 저장
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'web_app'))
+from utils import cache_store, data_store
 
 client_id = '_f7DWBVIPxS1suzjejQN'
 client_secret = 'kl4NjeHtnQ'
@@ -9,18 +20,84 @@ headers = {
     "X-Naver-Client-Secret": client_secret
 }
 
+NAVER_NEWS_URL = 'https://openapi.naver.com/v1/search/news.json'
+
+# True 면 {query}_news.jsonl 에 줄 단위 JSON으로 이어 쓰기 (대용량 수집용)
+SAVE_JSONL = False
+
+# 네이버 검색 API: 한 번에 최대 100건, start 는 1000 까지 (검색어당 최대 1000건)
+PAGE_SIZE = 100
+MAX_RESULTS = 1000
+
+# 동시 요청 수 / 전체 초당 요청 수 (네이버 API 초당 호출 한도 이내)
+CRAWL_WORKERS = 4
+REQUESTS_PER_SECOND = 8
+
+# 페이지 요청 실패시 재시도 횟수
+MAX_RETRIES = 3
+
+# 중단된 수집을 이어서 하기 위한 진행 상황 파일
+CHECKPOINT_FILE = 'news_crawl_checkpoint.json'
+
+# 증분 수집용 검색어별 기준점 (마지막으로 수집한 발행 시각 + 그 시각의 기사 링크)
+WATERMARK_FILE = 'news_watermarks.json'
+
+_session = None
+_session_lock = threading.Lock()
+_rate_lock = threading.Lock()
+_next_request_at = 0.0
+_checkpoint_lock = threading.Lock()
 
-def get_naver_search(query, start, display):
-    url = f"https://openapi.naver.com/v1/search/news.json?query={query}&start={start}&display={display}"
-    response = requests.get(url, headers=headers)
-    return response.json()
+
+def get_session():
+    """연결을 재사용하는 공용 세션"""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                session = requests.Session()
+                session.headers.update(headers)
+                adapter = HTTPAdapter(pool_connections=4, pool_maxsize=CRAWL_WORKERS * 2)
+                session.mount('https://', adapter)
+                session.mount('http://', adapter)
+                _session = session
+    return _session
+
+
+def wait_for_rate_limit(requests_per_second=REQUESTS_PER_SECOND):
+    """모든 스레드가 공유하는 초당 요청 수 제한 (다음 요청 시각까지 대기)"""
+    global _next_request_at
+    with _rate_lock:
+        now = time.monotonic()
+        scheduled = max(now, _next_request_at)
+        _next_request_at = scheduled + 1.0 / requests_per_second
+    if scheduled > now:
+        time.sleep(scheduled - now)
+
+
+def get_naver_search(query, start, display, base_url=NAVER_NEWS_URL, sort='sim',
+                     requests_per_second=REQUESTS_PER_SECOND):
+    params = {'query': query, 'start': start, 'display': display, 'sort': sort}
+
+    for attempt in range(1, MAX_RETRIES + 1):
+        wait_for_rate_limit(requests_per_second)
+        try:
+            response = get_session().get(base_url, params=params, timeout=10)
+            if response.status_code == 200:
+                return response.json()
+            print(f"[WARN] {query} (start={start}) 응답 {response.status_code} - 재시도 {attempt}/{MAX_RETRIES}")
+        except (requests.RequestException, ValueError) as e:
+            print(f"[WARN] {query} (start={start}) 요청 실패: {e} - 재시도 {attempt}/{MAX_RETRIES}")
+        time.sleep(attempt)
+
+    return None
 
 
 def extract_article_info(json_result, results):
     for item in json_result['items']:
         title = item['title'].replace('<b>', '').replace('</b>', '')
         description = item['description'].replace('<b>', '').replace('</b>', '')
-        link = item['originallink']
+        link = item.get('originallink') or item['link']
         pub_date = datetime.datetime.strptime(item['pubDate'], '%a, %d %b %Y %H:%M:%S +0900').strftime(
             '%Y-%m-%d %H:%M:%S')
 
@@ -42,33 +119,254 @@ def save_to_file(results, filename):
             f.write("-" * 50 + "\n")
 
 
-def main():
-    query = input('검색어를 입력하세요: ')
-    results = []
+def load_checkpoint(checkpoint_file):
+    """검색어별 진행 상황 {검색어: {"issue_id", "total", "done": [start...]}}"""
+    try:
+        with open(checkpoint_file, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
 
-    start = 1
-    total_display = 100
-    while True:
-        json_result = get_naver_search(query, start, 100)
-        if not json_result:
-            break
 
+def save_checkpoint(checkpoint, checkpoint_file):
+    with _checkpoint_lock:
+        cache_store.atomic_write_json(os.path.abspath(checkpoint_file), checkpoint, indent=2)
+
+
+def page_starts(total, max_results=MAX_RESULTS):
+    """가져올 페이지 시작 위치 목록 (검색 결과 수와 API 한도 중 작은 쪽까지)"""
+    limit = min(total, max_results)
+    return list(range(1, limit + 1, PAGE_SIZE))
+
+
+def crawl_queries(queries, issue_ids=None, max_results=MAX_RESULTS, workers=CRAWL_WORKERS,
+                  requests_per_second=REQUESTS_PER_SECOND, checkpoint_file=CHECKPOINT_FILE,
+                  base_url=NAVER_NEWS_URL):
+    """여러 검색어 뉴스를 동시에 수집해 DB에 저장 (페이지 단위로 저장 + 진행 상황 기록)
+
+    중단 후 다시 실행하면 checkpoint_file 에 기록된 완료 페이지는 건너뜁니다.
+    검색어를 끝까지 수집하면 진행 상황에서 지웁니다. {검색어: 이번 실행에서 수집한 뉴스 목록} 반환
+    """
+    issue_ids = issue_ids or {}
+    checkpoint = load_checkpoint(checkpoint_file)
+    collected = {query: [] for query in queries}
+
+    for query in queries:
+        state = checkpoint.setdefault(query, {'issue_id': issue_ids.get(query, query), 'total': None, 'done': []})
+        if state['done']:
+            print(f"[INFO] {query}: 이전 진행 상황에서 이어서 수집 ({len(state['done'])}페이지 완료)")
+
+    def fetch_page(query, start):
+        json_result = get_naver_search(query, start, PAGE_SIZE, base_url=base_url,
+                                       requests_per_second=requests_per_second)
+        if json_result is None:
+            return query, start, None, None
+
+        results = []
         extract_article_info(json_result, results)
-        start += 100
-        if start > 100:  # 500건
-            break  # 네이버 API는 1000건까지만 제공
+        data_store.upsert_news(checkpoint[query]['issue_id'], results, query=query, first_rank=start)
+        if SAVE_JSONL:
+            with _checkpoint_lock:
+                data_store.write_jsonl(f"{query}_news.jsonl", results, append=True)
+        return query, start, json_result.get('total', 0), results
+
+    def pending_starts(query):
+        state = checkpoint[query]
+        return [start for start in page_starts(state['total'], max_results) if start not in state['done']]
+
+    failed = set()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = set()
+        for query in queries:
+            # 전체 결과 수를 모르면 첫 페이지부터 (응답의 total 로 나머지 페이지 결정)
+            starts = [1] if checkpoint[query]['total'] is None else pending_starts(query)
+            futures.update(executor.submit(fetch_page, query, start) for start in starts)
+
+        while futures:
+            done, futures = wait(futures, return_when=FIRST_COMPLETED)
+            for future in done:
+                query, start, total, results = future.result()
+                state = checkpoint[query]
+
+                if results is None:
+                    print(f"[ERROR] {query} (start={start}) 수집 실패 - 다음 실행에서 재시도")
+                    failed.add(query)
+                    continue
+
+                collected[query].extend(results)
+                first_page = state['total'] is None
+                state['total'] = total if first_page else state['total']
+                state['done'].append(start)
+
+                if first_page:
+                    futures.update(executor.submit(fetch_page, query, s) for s in pending_starts(query))
+
+                save_checkpoint(checkpoint, checkpoint_file)
+
+    for query in queries:
+        if query not in failed and checkpoint[query]['total'] is not None and not pending_starts(query):
+            del checkpoint[query]
+        print(f"[INFO] {query}: {len(collected[query])}건 수집")
+    save_checkpoint(checkpoint, checkpoint_file)
 
-    print(f'[INFO] 전체 검색 결과: {len(results)}건 수집 완료')
+    return collected
 
+
+def load_watermarks(watermark_file):
+    """검색어별 기준점 {검색어: {"pub_date": 최신 발행 시각, "links": [그 시각의 기사 링크]}}"""
+    try:
+        with open(watermark_file, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def is_known_article(article, watermark):
+    """기준점 이전(또는 같은 시각의 이미 수집한) 기사인지"""
+    if not watermark:
+        return False
+    if article['pub_date'] != watermark['pub_date']:
+        return article['pub_date'] < watermark['pub_date']
+    return article['link'] in watermark['links']
+
+
+def advance_watermark(watermark, new_articles):
+    """새 기사로 기준점 갱신 (같은 최신 시각의 링크는 합침)"""
+    latest = max(article['pub_date'] for article in new_articles)
+    links = {article['link'] for article in new_articles if article['pub_date'] == latest}
+    if watermark and watermark['pub_date'] == latest:
+        links.update(watermark['links'])
+    return {'pub_date': latest, 'links': sorted(links)}
+
+
+def crawl_new_articles(query, watermark, max_results=MAX_RESULTS, base_url=NAVER_NEWS_URL,
+                       requests_per_second=REQUESTS_PER_SECOND):
+    """최신순으로 페이지를 넘기며 기준점에 닿기 전까지의 새 기사만 수집 (실패시 None)"""
+    new_articles = []
+    for start in page_starts(max_results, max_results):
+        json_result = get_naver_search(query, start, PAGE_SIZE, base_url=base_url, sort='date',
+                                       requests_per_second=requests_per_second)
+        if json_result is None:
+            return None
+
+        page = []
+        extract_article_info(json_result, page)
+        for article in page:
+            if is_known_article(article, watermark):
+                return new_articles
+            new_articles.append(article)
+
+        if len(page) < PAGE_SIZE:
+            break
+
+    return new_articles
+
+
+def crawl_incremental(queries, issue_ids=None, max_results=MAX_RESULTS, workers=CRAWL_WORKERS,
+                      requests_per_second=REQUESTS_PER_SECOND, watermark_file=WATERMARK_FILE,
+                      base_url=NAVER_NEWS_URL):
+    """검색어별 기준점 이후의 새 기사만 수집 (검색어끼리는 동시에)
+
+    새 기사는 DB와 {검색어}_news.jsonl 에 추가하고 기준점을 옮깁니다.
+    수집 도중 실패한 검색어는 아무것도 저장하지 않고 기준점도 그대로 둡니다 (다음 실행에서 다시 수집).
+    {검색어: 새 기사 목록} 반환
+    """
+    issue_ids = issue_ids or {}
+    watermarks = load_watermarks(watermark_file)
+
+    def run(query):
+        return query, crawl_new_articles(query, watermarks.get(query), max_results, base_url,
+                                         requests_per_second)
+
+    collected = {}
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for query, new_articles in executor.map(run, queries):
+            if new_articles is None:
+                print(f"[ERROR] {query}: 수집 실패 - 기준점 유지")
+                continue
+
+            collected[query] = new_articles
+            print(f"[INFO] {query}: 새 기사 {len(new_articles)}건")
+            if not new_articles:
+                continue
+
+            data_store.upsert_news(issue_ids.get(query, query), new_articles, query=query)
+            # 오래된 기사부터 이어 쓰기
+            data_store.write_jsonl(f"{query}_news.jsonl", reversed(new_articles), append=True)
+            watermarks[query] = advance_watermark(watermarks.get(query), new_articles)
+            cache_store.atomic_write_json(os.path.abspath(watermark_file), watermarks, indent=2)
+
+    return collected
+
+
+def save_query_files(query, issue_id, results=None):
+    """검색어별 결과 파일 저장 (JSON + 텍스트, SAVE_JSONL 이면 JSON 은 수집 중 이미 저장됨)
+
+    이어서 수집한 실행은 이번 실행분만 가지고 있으므로, 파일은 DB에 저장된 이 검색어의 뉴스 전체로
+    만듭니다 (네이버 정확도순 순위 그대로, 같은 이슈의 다른 검색어 기사는 제외).
+    검색어 기록이 없는 이전 DB 면 results(이번 실행 수집분)를 그대로 씁니다.
+    """
+    results = data_store.query_news(issue_id, query) or results or []
     json_filename = f"{query}_news.json"
     txt_filename = f"{query}_news.txt"
 
-    with open(json_filename, 'w', encoding='utf8') as outfile:
-        json.dump(results, outfile, indent=4, sort_keys=False, ensure_ascii=False)
-    print(f"[INFO] JSON 저장 완료 → {json_filename}")
+    if not SAVE_JSONL:
+        with open(json_filename, 'w', encoding='utf8') as outfile:
+            json.dump(results, outfile, indent=4, sort_keys=False, ensure_ascii=False)
+        print(f"[INFO] JSON 저장 완료 → {json_filename} ({len(results)}건)")
 
     save_to_file(results, txt_filename)
 
 
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="네이버 뉴스 수집 (여러 검색어 동시 수집, 중단 후 이어서 수집)")
+    parser.add_argument('queries', nargs='*', help="검색어 (없으면 입력받음)")
+    parser.add_argument('--queries-file', help="검색어 목록 파일 (한 줄에 하나)")
+    parser.add_argument('--issue', help="저장할 이슈 ID (기본: 검색어)")
+    parser.add_argument('--max-results', type=int, default=MAX_RESULTS, help=f"검색어당 최대 수집 수 (기본 {MAX_RESULTS})")
+    parser.add_argument('--workers', type=int, default=CRAWL_WORKERS, help=f"동시 요청 수 (기본 {CRAWL_WORKERS})")
+    parser.add_argument('--rps', type=float, default=REQUESTS_PER_SECOND, help=f"초당 요청 수 (기본 {REQUESTS_PER_SECOND})")
+    parser.add_argument('--checkpoint', default=CHECKPOINT_FILE, help=f"진행 상황 파일 (기본 {CHECKPOINT_FILE})")
+    parser.add_argument('--base-url', default=NAVER_NEWS_URL, help="검색 API 주소 (테스트용)")
+    parser.add_argument('--no-files', action='store_true', help="결과 파일 없이 DB에만 저장")
+    parser.add_argument('--incremental', action='store_true',
+                        help="최신순으로 지난 수집 이후의 새 기사만 수집 ({검색어}_news.jsonl 에 추가)")
+    parser.add_argument('--watermarks', default=WATERMARK_FILE, help=f"증분 수집 기준점 파일 (기본 {WATERMARK_FILE})")
+    args = parser.parse_args(argv)
+
+    queries = list(args.queries)
+    if args.queries_file:
+        with open(args.queries_file, 'r', encoding='utf-8') as f:
+            queries.extend(line.strip() for line in f if line.strip())
+
+    issue_id = args.issue
+    if not queries:
+        query = input('검색어를 입력하세요: ')
+        issue_id = issue_id or input(f'이슈 ID를 입력하세요 (기본: {query}): ') or query
+        queries = [query]
+
+    issue_ids = {query: issue_id or query for query in queries}
+
+    if args.incremental:
+        collected = crawl_incremental(queries, issue_ids, max_results=min(args.max_results, MAX_RESULTS),
+                                      workers=args.workers, requests_per_second=args.rps,
+                                      watermark_file=args.watermarks, base_url=args.base_url)
+        total = sum(len(results) for results in collected.values())
+        print(f'[INFO] 새 기사 {total}건 수집 완료 → {data_store.DB_FILE}')
+        return
+
+    collected = crawl_queries(queries, issue_ids, max_results=min(args.max_results, MAX_RESULTS),
+                              workers=args.workers, requests_per_second=args.rps,
+                              checkpoint_file=args.checkpoint, base_url=args.base_url)
+
+    total = sum(len(results) for results in collected.values())
+    print(f'[INFO] 전체 검색 결과: {total}건 수집 완료')
+    print(f"[INFO] DB 저장 완료 → {data_store.DB_FILE}")
+
+    if not args.no_files:
+        for query, results in collected.items():
+            save_query_files(query, issue_ids[query], results)
+
+
 if __name__ == '__main__':
     main()
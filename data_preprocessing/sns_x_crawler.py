@@ -1,25 +1,38 @@
 import requests
 import pandas as pd
 import json
-import re
-import html
+import os
+import sys
+import time
+import argparse
 from datetime import datetime, timedelta
 
+# 수집 결과를 웹앱 DB(web_app/data/mirae.db)에도 저장
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'web_app'))
+from utils import cache_store, data_store, text_normalizer
+
 BEARER_TOKEN = 'AAAAAAAAAAAAAAAAAAAAAPiK3AEAAAAAQQbgHy9F0QmH3yIiGIBxcHlsGHo%3DtU20amYMVz9sNCHn53oRZE95b1djcQpKdZXVtMH6SSb3zAS3YW'
 
 
-def collect_tweets(query, max_results=100, start_date=None, end_date=None):
-    """트위터 데이터 수집"""
+X_SEARCH_URL = 'https://api.twitter.com/2/tweets/search/recent'
+
+# 최근 검색 API 한 페이지 최대/최소 결과 수
+PAGE_MAX_RESULTS = 100
+PAGE_MIN_RESULTS = 10
+
+# 요청 실패시 재시도 횟수 (한도 초과 대기는 제외)
+MAX_RETRIES = 3
+
+# 중단된 수집을 이어서 하기 위한 페이지 위치 (next_token) 기록 파일
+CHECKPOINT_FILE = 'x_crawl_checkpoint.json'
+
+
+def build_search_params(query, start_date=None, end_date=None):
+    """검색 요청 파라미터 (리트윗 제외, 기간 설정)"""
 
     # 리트윗만 제외 (인용 트윗은 포함)
     enhanced_query = f'{query} -is:retweet'
 
-    url = 'https://api.twitter.com/2/tweets/search/recent'
-    headers = {
-        'Authorization': f'Bearer {BEARER_TOKEN}',
-        'Content-Type': 'application/json'
-    }
-
     # 날짜 설정
     if start_date:
         start_time_str = start_date + 'T00:00:00Z'
@@ -36,7 +49,6 @@ def collect_tweets(query, max_results=100, start_date=None, end_date=None):
 
     params = {
         'query': enhanced_query,
-        'max_results': min(max_results, 50),  # API 한계
         'tweet.fields': 'text,created_at,public_metrics,lang',
         'expansions': 'author_id',
         'user.fields': 'public_metrics'
@@ -48,92 +60,254 @@ def collect_tweets(query, max_results=100, start_date=None, end_date=None):
     if end_time_str:
         params['end_time'] = end_time_str
 
-    print(f"검색 쿼리: {enhanced_query}")
+    return params
+
+
+def parse_tweet_page(data, seen_texts):
+    """응답 한 페이지를 저장 형식으로 변환 (중복/봇/짧은 트윗 제외, 한국어만)"""
+    users = {user['id']: user for user in data.get('includes', {}).get('users', [])}
+    page = data.get('data', [])
+
+    # 엔티티 디코딩/URL/기호 제거 + 중복, 짧은 글, 링크 도배, 봇 키워드 제외
+    texts, keep = text_normalizer.clean_tweet_texts((tweet['text'] for tweet in page), seen_texts)
+
+    tweets = []
+    for tweet, text, kept in zip(page, texts, keep):
+        if not kept:
+            continue
+
+        # 한국어 트윗만
+        if tweet.get('lang', 'unknown') not in ['ko', 'unknown']:
+            continue
+
+        # 사용자 정보 가져오기
+        user_info = users.get(tweet.get('author_id'), {})
+
+        tweets.append({
+            'id': tweet['id'],
+            'text': text,
+            'created_at': tweet['created_at'],
+            'lang': tweet.get('lang', 'unknown'),
+            'like_count': tweet['public_metrics']['like_count'],
+            'retweet_count': tweet['public_metrics']['retweet_count'],
+            'reply_count': tweet['public_metrics']['reply_count'],
+            'quote_count': tweet['public_metrics']['quote_count'],
+            'author_followers': user_info.get('public_metrics', {}).get('followers_count', 0),
+            'author_following': user_info.get('public_metrics', {}).get('following_count', 0)
+        })
+
+    return tweets
+
+
+def seconds_until_reset(response):
+    """x-rate-limit-reset 헤더 기준 한도 초기화까지 남은 시간 (초, 헤더가 없으면 None)"""
+    reset = response.headers.get('x-rate-limit-reset')
+    if reset is None:
+        return None
+    try:
+        return max(0.0, float(reset) - time.time()) + 1
+    except ValueError:
+        return None
+
+
+def request_page(session, base_url, params, rate_state):
+    """한 페이지 요청 (한도 초과면 초기화 시각까지 기다렸다가 재요청). 실패시 None
+
+    rate_state['resume_at']: 남은 요청이 없을 때 기록한 한도 초기화 시각 (다음 요청 전에 그때까지 대기)
+    """
+    wait_seconds = rate_state.get('resume_at', 0) - time.time()
+    if wait_seconds > 0:
+        print(f"⏳ 남은 요청 없음 - {wait_seconds:.0f}초 후 다음 페이지 요청")
+        time.sleep(wait_seconds)
+
+    failures = 0
+    while failures < MAX_RETRIES:
+        try:
+            response = session.get(base_url, params=params, timeout=30)
+        except requests.RequestException as e:
+            failures += 1
+            print(f"⚠️ 요청 실패: {e} - 재시도 {failures}/{MAX_RETRIES}")
+            time.sleep(failures * 2)
+            continue
+
+        if response.status_code == 429:
+            wait_seconds = seconds_until_reset(response) or 60
+            print(f"⏳ 요청 한도 초과 - {wait_seconds:.0f}초 후 재개")
+            time.sleep(wait_seconds)
+            continue
+
+        if response.status_code != 200:
+            failures += 1
+            print(f"❌ API 오류 {response.status_code}: {response.text[:200]} - 재시도 {failures}/{MAX_RETRIES}")
+            time.sleep(failures * 2)
+            continue
+
+        # 남은 요청이 없으면 다음 요청은 초기화 시각 이후에
+        if response.headers.get('x-rate-limit-remaining') == '0':
+            rate_state['resume_at'] = time.time() + (seconds_until_reset(response) or 0)
+
+        return response.json()
+
+    return None
+
+
+def load_checkpoint(checkpoint_file):
+    try:
+        with open(checkpoint_file, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def iter_tweet_pages(query, max_results=100, start_date=None, end_date=None, base_url=X_SEARCH_URL,
+                     checkpoint_file=None, seen_texts=None):
+    """next_token 을 따라가며 페이지별 트윗 목록 yield (필터 통과한 트윗 기준 max_results 개까지)
+
+    checkpoint_file 을 지정하면 다음 페이지 위치를 기록하고, 같은 검색의 기록이 있으면 그 위치부터 이어서 수집합니다.
+    (기록은 yield 한 페이지를 호출자가 처리한 뒤 갱신되고, 끝까지 수집하면 삭제됩니다)
+    seen_texts 는 이미 수집한 정규화 텍스트 집합 (이어서 수집할 때 중복 제외용, 수집하면서 갱신)
+    """
+    state = load_checkpoint(checkpoint_file) if checkpoint_file else None
+    resumed = bool(state and state.get('query') == query and state.get('max_results') == max_results)
+    if resumed:
+        # 기간(end_time 포함)도 처음 수집할 때 값 그대로 사용
+        params = state['params']
+        print(f"이전 수집 이어서 진행 ({state['pages']}페이지, {state['collected']}개 수집됨)")
+    else:
+        params = build_search_params(query, start_date, end_date)
+        state = {'query': query, 'max_results': max_results, 'params': params,
+                 'next_token': None, 'pages': 0, 'collected': 0}
+
+    print(f"검색 쿼리: {params['query']}")
     if start_date:
         print(f"검색 기간: {start_date} ~ {end_date if end_date else '현재'}")
 
+    session = requests.Session()
+    session.headers.update({
+        'Authorization': f'Bearer {BEARER_TOKEN}',
+        'Content-Type': 'application/json'
+    })
+
+    seen_texts = set() if seen_texts is None else seen_texts  # 중복 텍스트 방지
+    rate_state = {}
+    while state['collected'] < max_results:
+        page_params = dict(params)
+        remaining = max_results - state['collected']
+        page_params['max_results'] = min(max(remaining, PAGE_MIN_RESULTS), PAGE_MAX_RESULTS)
+        if state['next_token']:
+            page_params['next_token'] = state['next_token']
+
+        data = request_page(session, base_url, page_params, rate_state)
+        if data is None:
+            print("❌ 수집 중단 - 같은 명령으로 다시 실행하면 이어서 수집합니다")
+            return
+
+        if resumed:
+            # 저장 직후 진행 기록 전에 중단됐으면 이 페이지는 이미 저장됨 - 저장된 트윗도 수집 수에 포함
+            resumed = False
+            texts = text_normalizer.normalize_batch([tweet['text'] for tweet in data.get('data', [])])
+            state['collected'] += min(sum(text in seen_texts for text in texts), remaining)
+            remaining = max_results - state['collected']
+
+        tweets = parse_tweet_page(data, seen_texts)[:remaining]
+        yield tweets
+
+        state['pages'] += 1
+        state['collected'] += len(tweets)
+        state['next_token'] = data.get('meta', {}).get('next_token')
+        print(f"✅ {state['pages']}페이지: {len(tweets)}개 (누적 {state['collected']}개)")
+
+        if not state['next_token']:
+            break
+        if checkpoint_file:
+            cache_store.atomic_write_json(os.path.abspath(checkpoint_file), state, indent=2)
+
+    if checkpoint_file and os.path.exists(checkpoint_file):
+        os.remove(checkpoint_file)
+
+
+def collect_tweets(query, max_results=100, start_date=None, end_date=None, base_url=X_SEARCH_URL):
+    """트위터 데이터 수집 (전체 결과를 목록으로 반환)"""
     all_tweets = []
-    seen_texts = set()  # 중복 텍스트 방지
-
-    response = requests.get(url, headers=headers, params=params)
-
-    if response.status_code == 200:
-        data = response.json()
-        tweets = data.get('data', [])
-        users = {user['id']: user for user in data.get('includes', {}).get('users', [])}
-
-        print(f"✅ {len(tweets)}개 트윗 수집 완료")
-
-        for tweet in tweets:
-            text = tweet['text'].strip()
-            text = html.unescape(text)  # HTML 엔티티 디코딩 (&quot; 등)
-            text = re.sub(r'http[s]?://[^\s]+', '', text)  # URL 제거
-            text = re.sub(r'[^\w\s가-힣#@]', ' ', text)  # 한글, 영어, 숫자, 공백, #, @ 만 남기기
-            text = re.sub(r'\s+', ' ', text).strip()  # 연속된 공백을 하나로 변경
-
-            # 중복 텍스트 제거
-            if text in seen_texts:
-                continue
-            seen_texts.add(text)
-
-            # 봇 계정이나 링크만 있는 트윗 필터링
-            if (len(text) < 10 or  # 너무 짧은 트윗
-                    text.count('https://') > 1 or  # 링크만 여러 개
-                    any(bot_keyword in text.lower() for bot_keyword in ['bot', '자동', 'automatic'])):
-                continue
-
-            # 사용자 정보 가져오기
-            author_id = tweet['author_id']
-            user_info = users.get(author_id, {})
-
-            tweet_data = {
-                'id': tweet['id'],
-                'text': text,
-                'created_at': tweet['created_at'],
-                'lang': tweet.get('lang', 'unknown'),
-                'like_count': tweet['public_metrics']['like_count'],
-                'retweet_count': tweet['public_metrics']['retweet_count'],
-                'reply_count': tweet['public_metrics']['reply_count'],
-                'quote_count': tweet['public_metrics']['quote_count'],
-                'author_followers': user_info.get('public_metrics', {}).get('followers_count', 0),
-                'author_following': user_info.get('public_metrics', {}).get('following_count', 0)
-            }
-
-            all_tweets.append(tweet_data)
-
-        # 한국어 트윗만 필터링
-        korean_tweets = [t for t in all_tweets if t['lang'] in ['ko', 'unknown']]
-
-        print(f"🇰🇷 한국어 트윗: {len(korean_tweets)}개")
-        print(f"중복 제거 완료")
-
-        return korean_tweets
-
-    else:
-        print(f"❌ API 오류 {response.status_code}: {response.text}")
-        return []
-
-
-def save_tweets(tweets, filename='twitter_data.json'):
-    """트윗 데이터 저장"""
+    for tweets in iter_tweet_pages(query, max_results, start_date, end_date, base_url):
+        all_tweets.extend(tweets)
+
+    print(f"🇰🇷 한국어 트윗: {len(all_tweets)}개")
+    print("중복 제거 완료")
+    return all_tweets
+
+
+def load_saved_tweet_keys(filename):
+    """기존 JSONL 파일에 저장된 (정규화 텍스트 집합, 트윗 ID 집합). 파일이 없으면 빈 집합"""
+    seen_texts, seen_ids = set(), set()
+    try:
+        for tweet in data_store.iter_json_records(filename):
+            seen_texts.add(tweet.get('text', ''))
+            seen_ids.add(tweet.get('id'))
+    except FileNotFoundError:
+        pass
+    return seen_texts, seen_ids
+
+
+def collect_tweets_to_file(query, filename, max_results=100, start_date=None, end_date=None,
+                           base_url=X_SEARCH_URL, checkpoint_file=CHECKPOINT_FILE, issue_id=None):
+    """트위터 데이터 대량 수집 (페이지마다 JSONL 파일에 이어 쓰고 issue_id 가 있으면 DB에도 저장)
+
+    메모리에 전체 결과를 모으지 않습니다. 중단되면 checkpoint_file 의 위치부터 이어서 수집합니다. 수집 수 반환
+    파일에 이미 있는 트윗(같은 텍스트 또는 같은 ID)은 다시 쓰지 않습니다
+    (페이지를 쓴 직후 진행 상황을 기록하기 전에 중단되면, 이어서 수집할 때 같은 페이지를 다시 받기 때문).
+    """
+    seen_texts, seen_ids = load_saved_tweet_keys(filename)
+    if seen_ids:
+        print(f"기존 파일 트윗 {len(seen_ids)}개는 중복 제외")
+
+    total = 0
+    for tweets in iter_tweet_pages(query, max_results, start_date, end_date, base_url, checkpoint_file,
+                                   seen_texts=seen_texts):
+        tweets = [tweet for tweet in tweets if tweet['id'] not in seen_ids]
+        if not tweets:
+            continue
+        seen_ids.update(tweet['id'] for tweet in tweets)
+        data_store.write_jsonl(filename, tweets, append=True)
+        if issue_id:
+            data_store.upsert_tweets(issue_id, tweets)
+        total += len(tweets)
+
+    print(f"JSONL 저장: {filename} (+{total}개)")
+    return total
+
+
+def save_tweets(tweets, filename='twitter_data.json', issue_id=None):
+    """트윗 데이터 저장 (issue_id 를 지정하면 DB에도 저장)
+
+    filename 이 .jsonl 이면 줄 단위 JSON으로 기존 파일에 이어 씁니다 (대용량 수집용, CSV 생략).
+    """
     if not tweets:
         print("❌ 저장할 데이터가 없습니다")
         return
 
-    # JSON 저장 (원본 데이터)
-    with open(filename, 'w', encoding='utf-8') as f:
-        json.dump(tweets, f, indent=2, ensure_ascii=False)
+    if data_store.is_jsonl(filename):
+        # JSONL 이어 쓰기 (원본 데이터)
+        data_store.write_jsonl(filename, tweets, append=True)
+        print(f"JSONL 저장: {filename} (+{len(tweets)}개)")
+    else:
+        # JSON 저장 (원본 데이터)
+        with open(filename, 'w', encoding='utf-8') as f:
+            json.dump(tweets, f, indent=2, ensure_ascii=False)
 
-    # CSV 저장 (분석용)
-    df = pd.DataFrame(tweets)
-    csv_filename = filename.replace('.json', '.csv')
-    df.to_csv(csv_filename, index=False, encoding='utf-8-sig')
+        # CSV 저장 (분석용)
+        df = pd.DataFrame(tweets)
+        csv_filename = filename.replace('.json', '.csv')
+        df.to_csv(csv_filename, index=False, encoding='utf-8-sig')
+        print(f"JSON 저장: {filename}")
+        print(f"CSV 저장: {csv_filename}")
 
-    print(f"JSON 저장: {filename}")
-    print(f"CSV 저장: {csv_filename}")
+    if issue_id:
+        saved = data_store.upsert_tweets(issue_id, tweets)
+        print(f"DB 저장: {data_store.DB_FILE} ({issue_id}, {saved}개)")
 
     # 미리보기
-    print(f"\n수집된 트윗 미리보기:")
+    print("\n수집된 트윗 미리보기:")
     for i, tweet in enumerate(tweets[:3]):
         print(f"[{i + 1}] {tweet['text'][:100]}...")
         print(f"    👍 {tweet['like_count']} | 🔄 {tweet['retweet_count']} | 👥 {tweet['author_followers']}명")
@@ -158,18 +332,36 @@ def analyze_tweets_preview(tweets):
     print(f"수집 시간: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
 
 
-# 사용법
-if __name__ == '__main__':
-    # 데이식스 본인확인 이슈 관련 트윗 수집
-    query = '데이식스 본인확인 -양도 -판매 -구매 -대리 -교환 -팬싸컷 -항공편'
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="트위터(X) 데이터 수집 (페이지 단위 수집, 한도 초과시 대기, 중단 후 이어서 수집)")
+    # 데이식스 본인확인 이슈 관련 트윗 수집 (기본값)
+    parser.add_argument('--query', default='데이식스 본인확인 -양도 -판매 -구매 -대리 -교환 -팬싸컷 -항공편')
+    parser.add_argument('--issue', default='day6-20250718', help="DB에 저장할 이슈 ID")
+    parser.add_argument('--start-date', default='2025-07-22')
+    parser.add_argument('--end-date', default='2025-07-24')
+    parser.add_argument('--max-results', type=int, default=50, help="최대 수집 수")
+    parser.add_argument('--output', default='dayx6_tweets.json', help=".jsonl 이면 페이지마다 이어 쓰기 (대량 수집용)")
+    parser.add_argument('--checkpoint', default=CHECKPOINT_FILE, help=f"진행 상황 파일 (기본 {CHECKPOINT_FILE})")
+    parser.add_argument('--base-url', default=X_SEARCH_URL, help="검색 API 주소 (테스트용)")
+    args = parser.parse_args(argv)
 
     print("트위터 데이터 수집 시작")
     print("=" * 50)
 
-    tweets = collect_tweets(query, max_results=50, start_date='2025-07-22', end_date='2025-07-24')
+    if data_store.is_jsonl(args.output):
+        collect_tweets_to_file(args.query, args.output, args.max_results, args.start_date, args.end_date,
+                               base_url=args.base_url, checkpoint_file=args.checkpoint, issue_id=args.issue)
+        return
+
+    tweets = collect_tweets(args.query, args.max_results, args.start_date, args.end_date, base_url=args.base_url)
 
     if tweets:
-        save_tweets(tweets, 'dayx6_tweets.json')
+        save_tweets(tweets, args.output, issue_id=args.issue)
         analyze_tweets_preview(tweets)
     else:
-        print("❌ 수집된 트윗이 없습니다")
\ No newline at end of file
+        print("❌ 수집된 트윗이 없습니다")
+
+
+# 사용법
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,115 @@
+import argparse
+import json
+import threading
+import time
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs
+
+# sns_x_crawler 의 페이지 이동(next_token) / 한도 초과(429) 대기 / 이어서 수집을 확인하기 위한 로컬 검색 API
+#
+#   python x_api_stub.py --total 250 --rate-limit 2 --window 5
+#   python sns_x_crawler.py --base-url http://127.0.0.1:8765/2/tweets/search/recent --output stub.jsonl --max-results 200
+#
+# --fail-page N 이면 N번째 페이지(응답 순서, 0부터) 요청에 첫 번째만 503 으로 응답 (재시도 확인용),
+# --crash-page N 이면 N번째 페이지까지 응답한 뒤 서버를 종료 (중단 후 이어서 수집 확인용)
+
+# 가짜 작성자 수 (작성자 ID 0 ~ AUTHOR_COUNT-1)
+AUTHOR_COUNT = 7
+
+
+def make_tweet(index):
+    """index 번째 가짜 트윗 (5개 중 1개는 영어, URL/HTML 엔티티 포함)"""
+    return {
+        'id': str(10 ** 6 + index),
+        'text': f'데이식스 본인확인 트윗 번호 {index} &amp; 내용 https://t.co/x{index}',
+        'created_at': '2025-07-22T11:00:00.000Z',
+        'lang': 'ko' if index % 5 else 'en',
+        'author_id': str(index % AUTHOR_COUNT),
+        'public_metrics': {'like_count': index % 13, 'retweet_count': index % 3, 'reply_count': 0, 'quote_count': 0}
+    }
+
+
+def make_page(start, size, total):
+    """start 번째부터 size 개 트윗 응답 (남은 트윗이 있으면 meta.next_token)"""
+    tweets = [make_tweet(index) for index in range(start, min(start + size, total))]
+    users = [
+        {'id': str(author), 'public_metrics': {'followers_count': author * 10, 'following_count': author}}
+        for author in range(AUTHOR_COUNT)
+    ]
+    body = {'data': tweets, 'includes': {'users': users}, 'meta': {'result_count': len(tweets)}}
+    if start + size < total:
+        body['meta']['next_token'] = str(start + size)
+    return body
+
+
+def make_handler(total, rate_limit, window, fail_page=None, crash_page=None):
+    """요청 한도(window 초마다 rate_limit 번)를 지키는 검색 API 핸들러"""
+    state = {'remaining': rate_limit, 'reset': time.time() + window, 'pages': 0, 'failed': False}
+    lock = threading.Lock()
+
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+
+        def send(self, status, headers, body=b''):
+            self.send_response(status)
+            for name, value in headers.items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            params = parse_qs(urlparse(self.path).query)
+            start = int(params.get('next_token', ['0'])[0])
+            size = int(params.get('max_results', ['10'])[0])
+
+            with lock:
+                page = state['pages']
+                now = time.time()
+                if now >= state['reset']:
+                    state['remaining'], state['reset'] = rate_limit, now + window
+                headers = {'Content-Type': 'application/json', 'x-rate-limit-limit': str(rate_limit),
+                           'x-rate-limit-reset': str(int(state['reset']) + 1)}
+
+                if state['remaining'] <= 0:
+                    print(f"429 (페이지 {page}, 한도 초기화까지 {state['reset'] - now:.1f}초)")
+                    self.send(429, {**headers, 'x-rate-limit-remaining': '0'}, b'{"title":"Too Many Requests"}')
+                    return
+                state['remaining'] -= 1
+                headers['x-rate-limit-remaining'] = str(state['remaining'])
+
+                if page == fail_page and not state['failed']:
+                    state['failed'] = True
+                    print(f"503 (페이지 {page})")
+                    self.send(503, headers)
+                    return
+                state['pages'] += 1
+
+            print(f"200 (페이지 {page}, {start}번째부터 {size}개, 남은 요청 {headers['x-rate-limit-remaining']})")
+            self.send(200, headers, json.dumps(make_page(start, size, total)).encode())
+
+            if crash_page is not None and page >= crash_page:
+                print("서버 종료 (중단 확인용)")
+                threading.Thread(target=self.server.shutdown, daemon=True).start()
+
+    return Handler
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="X 최근 검색 API 로컬 대역 서버 (수집기 확인용)")
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--total', type=int, default=250, help="전체 트윗 수")
+    parser.add_argument('--rate-limit', type=int, default=3, help="window 초당 허용 요청 수")
+    parser.add_argument('--window', type=float, default=5, help="요청 한도 초기화 주기 (초)")
+    parser.add_argument('--fail-page', type=int, help="첫 요청에 503 으로 응답할 페이지")
+    parser.add_argument('--crash-page', type=int, help="이 페이지까지 응답하고 서버 종료")
+    args = parser.parse_args(argv)
+
+    handler = make_handler(args.total, args.rate_limit, args.window, args.fail_page, args.crash_page)
+    server = ThreadingHTTPServer(('127.0.0.1', args.port), handler)
+    print(f"검색 API 대역: http://127.0.0.1:{args.port}/2/tweets/search/recent (트윗 {args.total}개)")
+    server.serve_forever()
+
+
+if __name__ == '__main__':
+    main()
@@ -3,8 +3,13 @@
 리포트 메뉴 페이지
 """
 import streamlit as st
+from datetime import datetime
 # from streamlit_extras.switch_page_button import switch_page
 from utils.navigation import switch_page
+from utils import issue_catalog
+
+# 한 페이지에 표시할 이슈 수
+ISSUES_PER_PAGE = 5
 
 # 페이지 설정
 st.set_page_config(
@@ -50,11 +55,28 @@ def show_user_info():
     return True
 
 
-def show_issue_list():
-    """이슈 리스트 표시"""
-    st.markdown("<div style='padding: 2rem 0 1rem 0;'></div>", unsafe_allow_html=True)
+def format_issue_date(issue):
+    """카드 표시용 발생일 (예: 2025년 7월 18일-20일)"""
+    try:
+        start = datetime.strptime(issue['date_start'], '%Y-%m-%d')
+    except (KeyError, TypeError, ValueError):
+        return issue.get('date_start') or '-'
+
+    text = f"{start.year}년 {start.month}월 {start.day}일"
+    try:
+        end = datetime.strptime(issue['date_end'], '%Y-%m-%d')
+    except (KeyError, TypeError, ValueError):
+        return text
+
+    if end.date() == start.date():
+        return text
+    if (end.year, end.month) == (start.year, start.month):
+        return f"{text}-{end.day}일"
+    return f"{text} - {end.year}년 {end.month}월 {end.day}일"
 
-    # 데이식스 이슈 카드 (깔끔하게 개선)
+
+def show_issue_card(issue):
+    """이슈 카드 (인덱스 정보만 사용)"""
     st.markdown("""
     <div style="background-color: #fafbfc; border-radius: 12px; padding: 2rem; border: 1px solid #e9ecef; margin-bottom: 2rem;">
     """, unsafe_allow_html=True)
@@ -62,17 +84,24 @@ def show_issue_list():
     col1, col2 = st.columns([4, 1])
 
     with col1:
-        st.markdown("""
-        <h3 style="color: #333; margin: 0 0 1.5rem 0;">데이식스 본인확인 논란</h3>
+        sentiment = issue.get('headline_sentiment')
+        sentiment_html = ""
+        if sentiment:
+            sentiment_html = (
+                f"<br><strong>SNS 반응</strong>: 긍정 {sentiment.get('긍정', 0)}% · "
+                f"부정 {sentiment.get('부정', 0)}% · 중립 {sentiment.get('중립', 0)}%"
+            )
+
+        st.markdown(f"""
+        <h3 style="color: #333; margin: 0 0 1.5rem 0;">{issue['title']}</h3>
 
         <div style="color: #666; line-height: 1.6; margin-bottom: 1.5rem;">
-        <strong>발생일</strong>: 2025년 7월 18일-20일<br>
-        <strong>관련 종목</strong>: JYP엔터테인먼트 (035900)
+        <strong>발생일</strong>: {format_issue_date(issue)}<br>
+        <strong>관련 종목</strong>: {issue.get('stock_name') or issue.get('stock_symbol')} ({issue.get('stock_code')}){sentiment_html}
         </div>
 
         <div style="color: #555; line-height: 1.7;">
-        데이식스 팬미팅에서 과도한 본인확인 절차(생활기록부, 금융인증서 요구)로 인한 
-        팬들의 강한 반발과 논란이 확산된 사건
+        {issue.get('description', '')}
         </div>
         """, unsafe_allow_html=True)
 
@@ -80,15 +109,13 @@ def show_issue_list():
         st.markdown("<div style='padding: 2rem 0;'></div>", unsafe_allow_html=True)
         if st.button(
                 "리포트 보기",
+                key=f"open_{issue['issue_id']}",
                 use_container_width=True,
                 type="primary"):
-            # 세션에 선택된 이슈 정보 저장
+            # 세션에 선택된 이슈 정보 저장 (트윗/기사 데이터는 리포트 페이지에서 읽음)
             st.session_state.selected_issue = {
-                "title": "데이식스 본인확인 논란",
-                "stock_symbol": "JYP",
-                "stock_code": "035900",
-                "issue_date": "2025-07-18",
-                "query": "데이식스 본인"
+                **issue,
+                "issue_date": issue_catalog.format_issue_period(issue)
             }
 
             switch_page("AI 리포트")
@@ -96,6 +123,49 @@ def show_issue_list():
     st.markdown("</div>", unsafe_allow_html=True)
 
 
+def show_issue_list():
+    """이슈 리스트 표시 (인덱스에서 현재 페이지만 읽음)"""
+    st.markdown("<div style='padding: 2rem 0 1rem 0;'></div>", unsafe_allow_html=True)
+
+    page = st.session_state.get('issue_page', 0)
+    issues, total = issue_catalog.list_issues(page, ISSUES_PER_PAGE)
+    page_count = max((total + ISSUES_PER_PAGE - 1) // ISSUES_PER_PAGE, 1)
+
+    # 이슈가 줄어 현재 페이지가 비었으면 마지막 페이지로
+    if not issues and page > 0:
+        page = page_count - 1
+        st.session_state.issue_page = page
+        issues, total = issue_catalog.list_issues(page, ISSUES_PER_PAGE)
+
+    if not issues:
+        if issue_catalog.is_index_building():
+            st.info("이슈 목록을 준비하고 있습니다. 잠시 후 새로고침해 주세요.")
+        else:
+            st.info("등록된 이슈가 없습니다.")
+        return
+
+    for issue in issues:
+        show_issue_card(issue)
+
+    if page_count > 1:
+        col1, col2, col3 = st.columns([1, 2, 1])
+
+        with col1:
+            if st.button("◀ 이전", disabled=page == 0, use_container_width=True):
+                st.session_state.issue_page = page - 1
+                st.rerun()
+
+        with col2:
+            st.markdown(
+                f"<div style='text-align: center; padding-top: 0.5rem; color: #666;'>{page + 1} / {page_count} 페이지 (총 {total}개 이슈)</div>",
+                unsafe_allow_html=True)
+
+        with col3:
+            if st.button("다음 ▶", disabled=page >= page_count - 1, use_container_width=True):
+                st.session_state.issue_page = page + 1
+                st.rerun()
+
+
 def show_coming_soon():
     """추후 예정 이슈들"""
     st.markdown("---")
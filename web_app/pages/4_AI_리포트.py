@@ -6,16 +6,31 @@ import streamlit as st
 from datetime import datetime
 import sys
 import os
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
 # from streamlit_extras.switch_page_button import switch_page
 from utils.navigation import switch_page
 
 # utils 모듈 import를 위한 경로 추가
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from utils.news_analyzer import get_day6_news_summary
-from utils.sns_analyzer import get_day6_sns_analysis
-from utils.dart_analyzer import get_jyp_financial_insight
+from utils.news_analyzer import get_news_summary, get_news_summary_stream
+from utils.sns_analyzer import get_sns_analysis
+from utils.dart_analyzer import get_financial_insight
 from utils.vote_system import show_investor_vote_section
+from utils import report_cache
+
+# 뉴스 요약을 생성되는 대로 화면에 표시 (False면 완성된 요약을 한 번에 표시)
+STREAM_NEWS_SUMMARY = True
+
+# 리포트 섹션 (제목, 로딩 문구)
+REPORT_SECTIONS = {
+    "news": ("📰 뉴스 요약", "뉴스 분석 중..."),
+    "sns": ("💬 SNS 반응 분석", "SNS 감정분석 중..."),
+    "financial": ("📊 공시자료 AI 인사이트", "재무 분석 중...")
+}
+
+MIRAE_SECTION_ORDER = ["news", "sns", "financial"]
+ASAP_SECTION_ORDER = ["sns", "news", "financial"]
 
 # 페이지 설정
 st.set_page_config(
@@ -62,29 +77,115 @@ def show_report_header():
     # 이슈 설명 (헤더 하단에 추가)
     st.markdown(f"""
     <div style="font-size: 14px; color: #555; font-style: italic; margin-bottom: 20px; padding: 10px; background-color: #f8f9fa; border-radius: 8px;">
-        💡 {create_issue_summary()}
+        💡 {create_issue_summary(issue_info)}
     </div>
     """, unsafe_allow_html=True)
 
 
-# 기존 캐시 함수들 모두 삭제하고 이것으로 교체:
+# 분석 결과는 프로세스 공용 캐시(utils.report_cache)에 (섹션, 이슈, 투자자 유형) 키로 보관
+# 같은 이슈를 여러 사용자가 동시에 열어도 분석은 한 번만 실행됩니다.
 
-def load_news_analysis(investor_type):
-    """뉴스 분석 로드 (캐시 없음)"""
-    return get_day6_news_summary(investor_type)
+def is_successful_result(result):
+    """캐시에 저장할 만한 결과인지 (실패 결과는 저장하지 않음)"""
+    return bool(result) and result.get('success', True)
 
-def load_sns_analysis(investor_type):
-    """SNS 분석 로드 (캐시 없음)"""
-    news_context = "데이식스 팬미팅에서 과도한 본인확인 절차로 인한 팬들의 반발"
-    return get_day6_sns_analysis(news_context, investor_type)
+def load_news_analysis(investor_type, issue_info=None, refresh=False):
+    """뉴스 분석 로드 (프로세스 공용 캐시, refresh=True 면 분석기 캐시도 무시하고 새로 계산)"""
+    key = report_cache.make_key("news", issue_info, investor_type)
+    return report_cache.get_or_compute(
+        key, lambda: get_news_summary(investor_type, issue_info, refresh=refresh), cacheable=is_successful_result
+    )
 
-def load_financial_insight():
-    """재무 인사이트 로드 (캐시 없음)"""
-    return get_jyp_financial_insight()
+def load_news_analysis_stream(investor_type, issue_info=None, refresh=False):
+    """뉴스 분석 스트리밍 로드 (결과, 요약 텍스트 조각 iterator)
 
-
-def create_issue_summary():
-    """이슈 요약 생성 (1-2줄)"""
+    계산 슬롯을 잡은 경우 조각 iterator 를 끝까지 받거나 close() 하면 슬롯이 해제됩니다.
+    """
+    key = report_cache.make_key("news", issue_info, investor_type)
+
+    # 캐시에 있거나 다른 세션이 같은 요약을 만드는 중이면 그 결과를 한 번에 표시
+    while True:
+        cached = report_cache.get(key)
+        if cached is not None:
+            return cached, iter([cached.get('summary', '')])
+        started = report_cache.begin(key)
+        if started:
+            break
+
+        # 기다린 계산이 실패했으면 다시 슬롯 요청, 시간 초과면 캐시 없이 직접 계산
+        cached = report_cache.get(key)
+        if cached is not None:
+            return cached, iter([cached.get('summary', '')])
+        if started is False:
+            continue
+        return get_news_summary_stream(investor_type, issue_info)
+
+    try:
+        news_result, summary_chunks = get_news_summary_stream(investor_type, issue_info, refresh=refresh)
+    except Exception:
+        report_cache.finish(key)
+        raise
+
+    # 표시할 요약이 없는 결과(뉴스 데이터 없음 등)는 스트림을 기다리지 않고 바로 슬롯 해제
+    if not (news_result and news_result.get('success')):
+        report_cache.finish(key)
+        return news_result, iter([])
+
+    def cache_when_done():
+        completed = False
+        try:
+            yield ''
+            yield from summary_chunks
+            completed = True
+        finally:
+            # 스트림을 끝까지 받은 경우에만 요약이 완성된 결과를 저장
+            done = completed and is_successful_result(news_result) and news_result.get('summary')
+            report_cache.finish(key, news_result if done else None)
+
+    # 첫 yield 까지 진행해 두면 화면에 표시되지 않은 채 버려져도 close()/GC 시 finally 가 실행됨
+    stream = cache_when_done()
+    next(stream)
+    return news_result, stream
+
+def close_section_result(result):
+    """스트리밍 결과의 조각 iterator 닫기 (끝까지 받지 않은 계산 슬롯 해제)"""
+    if isinstance(result, tuple) and hasattr(result[1], 'close'):
+        result[1].close()
+
+def load_sns_analysis(investor_type, issue_info=None, refresh=False):
+    """SNS 분석 로드 (프로세스 공용 캐시)"""
+    key = report_cache.make_key("sns", issue_info, investor_type)
+    return report_cache.get_or_compute(
+        key, lambda: get_sns_analysis(investor_type, issue_info, refresh=refresh), cacheable=is_successful_result
+    )
+
+def load_financial_insight(issue_info=None, refresh=False):
+    """재무 인사이트 로드 (이슈 관련 종목 기준, 프로세스 공용 캐시, 투자자 유형 무관)"""
+    key = report_cache.make_key("financial", issue_info)
+    return report_cache.get_or_compute(
+        key, lambda: get_financial_insight(issue_info, refresh=refresh), cacheable=is_successful_result
+    )
+
+
+def load_section(name, investor_type=None, issue_info=None, refresh=False):
+    """섹션 이름별 로더 (워커 스레드에서 호출되므로 st.session_state 대신 issue_info 를 전달받음)
+
+    refresh=True 면 분석기 캐시(utils.cache_store)도 무시하고 새로 계산합니다 (새로고침 버튼).
+    """
+    if name == "news":
+        if STREAM_NEWS_SUMMARY:
+            return load_news_analysis_stream(investor_type, issue_info, refresh)
+        return load_news_analysis(investor_type, issue_info, refresh)
+    if name == "sns":
+        return load_sns_analysis(investor_type, issue_info, refresh)
+    return load_financial_insight(issue_info, refresh)
+
+
+def create_issue_summary(issue_info=None):
+    """이슈 요약 생성 (1-2줄, 카탈로그의 이슈 요약 우선)"""
+    issue_info = issue_info or {}
+    if issue_info.get('summary') or issue_info.get('description'):
+        return issue_info.get('summary') or issue_info['description']
     return "데이식스 팬미팅에서 생활기록부, 금융인증서 등을 요구하는 과도한 본인확인 절차로 인해 팬들의 강한 반발이 일어난 사건입니다."
 
 
@@ -144,32 +245,81 @@ def create_horizontal_sentiment_chart(percentages):
     return chart_html
 
 
+def strip_numbering(text):
+    """요약의 번호 매기기(1. ~ 8.) 제거"""
+    for number in range(1, 9):
+        text = text.replace(f'{number}. ', '')
+    return text
+
+
+def stream_without_numbering(chunks):
+    """스트리밍 요약에서 번호 매기기 제거 (조각 경계에 걸친 '1. '을 위해 마지막 2자는 보류)"""
+    pending = ''
+    for chunk in chunks:
+        pending = strip_numbering(pending + chunk)
+        if len(pending) > 2:
+            yield pending[:-2]
+            pending = pending[-2:]
+
+    if pending:
+        yield pending
+
+
+def show_news_header(news_result):
+    """뉴스 제목, 날짜, 원문 링크"""
+    # 뉴스 제목 (전체 표시)
+    st.markdown(f"**📰 {news_result['title']}**")
+
+    # 스토리 단위 기사 수 (같은 내용 전재/재작성 기사 묶음)
+    if news_result.get('story_count'):
+        st.caption(f"🗞️ 같은 내용 기사 {news_result.get('story_size', 1)}건 · 관련 스토리 {news_result['story_count']}개")
+
+    # 날짜와 원문 링크
+    col1, col2 = st.columns([2, 1])
+    with col1:
+        st.markdown(f"**📅 {news_result['date']}**")
+    with col2:
+        if news_result.get('url') and news_result['url'] != '#':
+            st.markdown(
+                f'<a href="{news_result["url"]}" target="_blank" style="background-color:#007bff; color:white; padding:5px 15px; border-radius:20px; text-decoration:none; font-size:12px;">📄 원문보기</a>',
+                unsafe_allow_html=True)
+
+
 def show_news_section(investor_type):
     """뉴스 요약 섹션 (개선됨)"""
     st.subheader("📰 뉴스 요약")
 
     with st.spinner("뉴스 분석 중..."):
-        news_result = load_news_analysis(investor_type)
+        news_result = load_section("news", investor_type, st.session_state.get('selected_issue'))
 
-    if news_result and news_result.get('success'):
-        # 뉴스 제목 (전체 표시)
-        st.markdown(f"**📰 {news_result['title']}**")
+    try:
+        render_news_section(news_result)
+    finally:
+        close_section_result(news_result)
 
-        # 날짜와 원문 링크
-        col1, col2 = st.columns([2, 1])
-        with col1:
-            st.markdown(f"**📅 {news_result['date']}**")
-        with col2:
-            if news_result.get('url') and news_result['url'] != '#':
-                st.markdown(
-                    f'<a href="{news_result["url"]}" target="_blank" style="background-color:#007bff; color:white; padding:5px 15px; border-radius:20px; text-decoration:none; font-size:12px;">📄 원문보기</a>',
-                    unsafe_allow_html=True)
+
+def render_news_section(news_result, stream_inline=True):
+    """뉴스 요약 본문 (스트리밍 모드면 (결과, 요약 조각) 튜플)
+
+    stream_inline=False 면 요약 조각을 여기서 그리지 않고 (요약 자리, 조각 iterator) 를 반환합니다
+    (호출자가 다른 섹션을 확인하면서 조각 단위로 그림).
+    """
+    summary_chunks = None
+    if isinstance(news_result, tuple):
+        news_result, summary_chunks = news_result
+
+    if news_result and news_result.get('success'):
+        show_news_header(news_result)
 
         # AI 요약 (문장 형식)
         st.markdown("### 📋 AI 요약")
         # 숫자 정렬 제거하고 문장으로 연결
-        summary_text = news_result['summary'].replace('1. ', '').replace('2. ', '').replace('3. ', '').replace('4. ', '').replace('5. ', '').replace('6. ', '').replace('7. ', '').replace('8. ', '')
-        st.markdown(summary_text)
+        if summary_chunks is not None:
+            if not stream_inline:
+                return st.empty(), stream_without_numbering(summary_chunks)
+            st.write_stream(stream_without_numbering(summary_chunks))
+        else:
+            st.markdown(strip_numbering(news_result['summary']))
 
     else:
         st.error("뉴스 요약을 불러올 수 없습니다.")
@@ -180,13 +330,26 @@ def show_sns_section(investor_type):
     st.subheader("💬 SNS 반응 분석")
 
     with st.spinner("SNS 감정분석 중..."):
-        sns_result = load_sns_analysis(investor_type)
+        sns_result = load_section("sns", investor_type, st.session_state.get('selected_issue'))
+
+    render_sns_section(sns_result)
 
+
+def render_sns_section(sns_result):
+    """SNS 반응 분석 본문"""
     if sns_result and sns_result.get('success'):
         # 가로 바 혼합 차트
         percentages = sns_result['percentages']
         st.markdown(create_horizontal_sentiment_chart(percentages), unsafe_allow_html=True)
 
+        # 반응(좋아요+리트윗) 가중 비율
+        weighted = sns_result.get('weighted_percentages')
+        if weighted:
+            st.caption(
+                f"🔁 반응 가중 비율: 긍정 {weighted.get('긍정', 0):.1f}% · "
+                f"부정 {weighted.get('부정', 0):.1f}% · 중립 {weighted.get('중립', 0):.1f}%"
+            )
+
         # 반응 요약
         st.markdown("### 📝 반응 요약")
         if sns_result.get('reaction_summary'):
@@ -209,8 +372,13 @@ def show_financial_section():
     st.subheader("📊 공시자료 AI 인사이트")
 
     with st.spinner("재무 분석 중..."):
-        financial_result = load_financial_insight()
+        financial_result = load_section("financial", issue_info=st.session_state.get('selected_issue'))
+
+    render_financial_section(financial_result)
 
+
+def render_financial_section(financial_result):
+    """공시자료 AI 인사이트 본문"""
     if financial_result and financial_result.get('success'):
         # 재무지표 (2x2 배치)
         st.markdown("### 💰 주요 재무지표")
@@ -251,9 +419,16 @@ def show_financial_section():
         st.markdown("### 🤖 AI 분석")
         st.markdown(financial_result.get("AI_인사이트", "AI 분석 내용이 없습니다."))
 
+    # 관련 상장사가 없거나 재무 데이터가 없는 이슈 (다른 종목 데이터로 채우지 않음)
+    elif financial_result and financial_result.get('no_data'):
+        st.info(financial_result['message'])
+
     else:
         st.error("재무 인사이트를 불러올 수 없습니다.")
-        # 임시 데이터
+
+        # 임시 데이터 (JYP 이슈에서만 표시)
+        if (st.session_state.get('selected_issue') or {}).get('stock_code', '035900') != '035900':
+            return
         st.markdown("### 💰 주요 재무지표")
         col1, col2 = st.columns(2)
         with col1:
@@ -269,22 +444,85 @@ def show_financial_section():
         """)
 
 
+SECTION_RENDERERS = {
+    "news": render_news_section,
+    "sns": render_sns_section,
+    "financial": render_financial_section
+}
+
+
+def show_report_sections(section_order, investor_type):
+    """세 섹션을 동시에 불러오고, 완료되는 대로 각 자리에 표시 (표시 순서는 section_order 유지)
+
+    뉴스 요약 스트림은 조각 하나씩 그리면서 그 사이에 다른 섹션이 끝났는지 확인합니다
+    (스트리밍 중에 끝난 SNS/재무 섹션도 바로 표시).
+    """
+    placeholders = {}
+    issue_info = st.session_state.get('selected_issue')
+    refresh = st.session_state.pop('refresh_report', False)
+
+    for i, name in enumerate(section_order):
+        if i > 0:
+            st.markdown("---")
+        title, loading_message = REPORT_SECTIONS[name]
+        st.subheader(title)
+        placeholders[name] = st.empty()
+        placeholders[name].info(f"⏳ {loading_message}")
+
+    # 분석기는 st.* 를 호출하지 않으므로 워커 스레드에서 실행하고, 화면 갱신은 메인 스레드에서만 처리
+    futures = {}
+    streams = {}  # 섹션 이름 → [요약 자리, 조각 iterator, 지금까지 받은 텍스트]
+    try:
+        with ThreadPoolExecutor(max_workers=len(section_order)) as executor:
+            futures = {
+                executor.submit(load_section, name, investor_type, issue_info, refresh): name
+                for name in section_order
+            }
+
+            pending = set(futures)
+            while pending or streams:
+                # 그리는 스트림이 있으면 기다리지 않고 끝난 섹션만 확인
+                done, pending = wait(pending, timeout=0 if streams else None, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = futures[future]
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        print(f"{name} 섹션 로드 실패: {e}")
+                        result = None
+
+                    with placeholders[name].container():
+                        if name == "news":
+                            live = render_news_section(result, stream_inline=False)
+                            if live:
+                                streams[name] = [live[0], live[1], '']
+                        else:
+                            SECTION_RENDERERS[name](result)
+
+                for name in list(streams):
+                    slot, chunks, text = streams[name]
+                    chunk = next(chunks, None)
+                    if chunk is None:
+                        slot.markdown(text)
+                        del streams[name]
+                        continue
+                    streams[name][2] = text + chunk
+                    slot.markdown(streams[name][2] + "▌")
+    finally:
+        # 재실행/다른 섹션 예외로 표시가 중단돼도 스트리밍 계산 슬롯은 해제
+        for future in futures:
+            if future.done() and not future.cancelled() and future.exception() is None:
+                close_section_result(future.result())
+
+
 def show_mirae_report():
     """MIRAE형 리포트 (뉴스 → SNS 순서)"""
-    show_news_section("MIRAE")
-    st.markdown("---")
-    show_sns_section("MIRAE")
-    st.markdown("---")
-    show_financial_section()
+    show_report_sections(MIRAE_SECTION_ORDER, "MIRAE")
 
 
 def show_asap_report():
     """ASAP형 리포트 (SNS → 뉴스 순서)"""
-    show_sns_section("ASAP")
-    st.markdown("---")
-    show_news_section("ASAP")
-    st.markdown("---")
-    show_financial_section()
+    show_report_sections(ASAP_SECTION_ORDER, "ASAP")
 
 
 def show_navigation():
@@ -304,6 +542,9 @@ def show_navigation():
     with col3:
         if st.button("🔄 새로고침", use_container_width=True):
             st.cache_data.clear()
+            report_cache.clear()
+            # 다음 실행에서 분석기 캐시도 무시하고 새로 계산
+            st.session_state.refresh_report = True
             st.rerun()
 
 
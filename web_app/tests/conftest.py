@@ -0,0 +1,10 @@
+# -*- coding: utf-8 -*-
+"""
+테스트 공통 설정 (web_app 디렉토리를 import 경로에 추가해 utils 패키지를 그대로 사용,
+수집기 테스트용으로 data_preprocessing 디렉토리도 추가)
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+sys.path.insert(1, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'data_preprocessing'))
@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+"""
+분석 결과 캐시 저장소(TTL, 원자적 쓰기, 오래된 항목 정리) 테스트
+
+    python -m pytest tests   # web_app 디렉토리에서 실행
+"""
+import json
+import os
+import threading
+from datetime import datetime, timedelta
+
+import pytest
+
+from utils import cache_store
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(cache_store, 'CACHE_DIR', str(tmp_path))
+    return tmp_path
+
+
+def write_entry(cache_dir, name, data, age_seconds):
+    timestamp = (datetime.now() - timedelta(seconds=age_seconds)).isoformat()
+    (cache_dir / f"{name}.json").write_text(json.dumps({'timestamp': timestamp, 'data': data}))
+
+
+def test_put_get_roundtrip(cache_dir):
+    cache_store.put('news_cache_a', {'summary': '요약'})
+    assert cache_store.get('news_cache_a', ttl=60) == {'summary': '요약'}
+    assert cache_store.get('missing', ttl=60) is None
+
+
+@pytest.mark.parametrize('age_seconds, ttl, expected', [
+    (10, 60, 1),
+    (59, 60, 1),
+    (61, 60, None),
+    # 하루 넘게 지난 항목도 경과 시간 전체로 만료 판단
+    (86400 + 10, 60, None),
+    (86400 + 10, None, 1),
+])
+def test_get_ttl(cache_dir, age_seconds, ttl, expected):
+    write_entry(cache_dir, 'entry', 1, age_seconds)
+    assert cache_store.get('entry', ttl) == expected
+
+
+def test_get_with_age_returns_stale(cache_dir):
+    write_entry(cache_dir, 'entry', 'old', 120)
+    data, age, fresh = cache_store.get_with_age('entry', ttl=60)
+    assert data == 'old' and not fresh and age >= 120
+    assert cache_store.get_with_age('missing', ttl=60) == (None, None, False)
+
+
+@pytest.mark.parametrize('content', ['', '{"timestamp": ', '{"data": 1}', '{"timestamp": "x", "data": 1}'])
+def test_broken_entry_is_miss(cache_dir, content):
+    (cache_dir / 'broken.json').write_text(content)
+    assert cache_store.get('broken', ttl=None) is None
+
+
+def test_atomic_write_keeps_old_file_on_failure(cache_dir):
+    path = str(cache_dir / 'entry.json')
+    cache_store.atomic_write_json(path, {'v': 1})
+
+    with pytest.raises(TypeError):
+        cache_store.atomic_write_json(path, {'v': object()})
+
+    with open(path, encoding='utf-8') as f:
+        assert json.load(f) == {'v': 1}
+    assert os.listdir(cache_dir) == ['entry.json']
+
+
+def test_concurrent_puts_leave_valid_file(cache_dir):
+    threads = [
+        threading.Thread(target=cache_store.put, args=('shared', {'writer': i, 'rows': list(range(2000))}))
+        for i in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert cache_store.get('shared', ttl=None)['rows'] == list(range(2000))
+    # 디렉토리 잠금 파일 하나 외에 임시 파일/항목별 잠금 파일이 남지 않음
+    assert sorted(os.listdir(cache_dir)) == ['.lock', 'shared.json']
+
+
+def test_delete_removes_entry(cache_dir):
+    cache_store.put('entry', 1)
+    cache_store.delete('entry')
+    assert cache_store.get('entry', ttl=None) is None
+    assert cache_store.list_entries() == []
+
+
+def test_evicts_oldest_entries(cache_dir, monkeypatch):
+    monkeypatch.setattr(cache_store, 'MAX_ENTRIES', 3)
+    for i in range(5):
+        cache_store.put(f"entry_{i}", i)
+        path = cache_store.entry_path(f"entry_{i}")
+        os.utime(path, (1_000_000 + i, 1_000_000 + i))
+
+    cache_store.put('entry_5', 5)
+    assert cache_store.list_entries() == ['entry_3', 'entry_4', 'entry_5']
+
+
+def test_evicts_by_total_bytes(cache_dir, monkeypatch):
+    monkeypatch.setattr(cache_store, 'MAX_TOTAL_BYTES', 3000)
+    for i in range(4):
+        cache_store.put(f"entry_{i}", 'x' * 1000)
+        os.utime(cache_store.entry_path(f"entry_{i}"), (1_000_000 + i, 1_000_000 + i))
+
+    cache_store.put('entry_4', 'x' * 1000)
+    assert cache_store.list_entries() == ['entry_3', 'entry_4']
@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+"""
+뉴스/트윗 SQLite 저장소 테스트 (DB 상위 트윗 조회와 JSON 파일 힙 선택 비교, 검색어별 뉴스)
+
+    python -m pytest tests   # web_app 디렉토리에서 실행
+"""
+import json
+import random
+
+import pytest
+
+from utils import data_store
+
+
+@pytest.fixture
+def db_file(tmp_path):
+    return str(tmp_path / 'test.db')
+
+
+def make_tweets(count, seed=0):
+    rng = random.Random(seed)
+    return [
+        {
+            'id': str(1000 + i),
+            'text': f'트윗 {i}',
+            'created_at': f'2025-07-{18 + i % 5:02d}T{i % 24:02d}:00:00.000Z',
+            'lang': 'ko',
+            'like_count': rng.randrange(0, 500),
+            'retweet_count': rng.randrange(0, 50),
+            'author_followers': rng.randrange(0, 10000),
+        }
+        for i in range(count)
+    ]
+
+
+def write_tweet_file(path, tweets):
+    if str(path).endswith('.jsonl'):
+        data_store.write_jsonl(str(path), tweets)
+    else:
+        path.write_text(json.dumps(tweets, ensure_ascii=False), encoding='utf-8')
+    return str(path)
+
+
+@pytest.mark.parametrize('file_name', ['tweets.json', 'tweets.jsonl'])
+@pytest.mark.parametrize('limit, since, until', [
+    (10, None, None),
+    (25, '2025-07-19', None),
+    (5, '2025-07-19', '2025-07-21'),
+    (500, None, None),
+])
+def test_top_tweets_match_file_loader(tmp_path, db_file, file_name, limit, since, until):
+    tweets = make_tweets(300)
+    data_store.upsert_tweets('issue', tweets, db_file)
+    path = write_tweet_file(tmp_path / file_name, tweets)
+
+    records = (
+        tweet for tweet in data_store.iter_json_records(path)
+        if (not since or tweet['created_at'] >= since) and (not until or tweet['created_at'] < until)
+    )
+    from_file = data_store.top_records(records, limit)
+    from_db = data_store.top_tweets('issue', limit, since=since, until=until, db_file=db_file)
+
+    # 반응 수가 같은 트윗의 순서는 다를 수 있어 반응 수 순서와 트윗 집합으로 비교
+    assert [data_store.engagement(t) for t in from_db] == [data_store.engagement(t) for t in from_file]
+    boundary = data_store.engagement(from_file[-1]) if from_file else None
+    assert ({t['id'] for t in from_db if data_store.engagement(t) != boundary}
+            == {t['id'] for t in from_file if data_store.engagement(t) != boundary})
+
+
+def test_top_records_matches_sort():
+    tweets = make_tweets(200, seed=1)
+    expected = sorted(tweets, key=data_store.engagement, reverse=True)[:15]
+    assert data_store.top_records(iter(tweets), 15) == expected
+
+
+def test_upsert_tweets_updates_counts(db_file):
+    tweet = {'id': '1', 'text': '트윗', 'like_count': 1, 'retweet_count': 0}
+    data_store.upsert_tweets('issue', [tweet], db_file)
+    data_store.upsert_tweets('issue', [{**tweet, 'like_count': 10}], db_file)
+
+    assert data_store.count_rows('tweets', 'issue', db_file) == 1
+    assert data_store.top_tweets('issue', 5, db_file=db_file)[0]['like_count'] == 10
+    assert data_store.top_tweets('other', 5, db_file=db_file) == []
+
+
+def test_has_rows_does_not_create_db(tmp_path):
+    db_file = str(tmp_path / 'missing.db')
+    assert not data_store.has_rows('tweets', 'issue', db_file)
+    assert not (tmp_path / 'missing.db').exists()
+    with pytest.raises(ValueError):
+        data_store.has_rows('users', 'issue', db_file)
+
+
+def test_iter_json_records_skips_broken_lines(tmp_path):
+    path = tmp_path / 'tweets.jsonl'
+    path.write_text('{"id": "1"}\n{"id": \n\n{"id": "2"}\n', encoding='utf-8')
+    assert [record['id'] for record in data_store.iter_json_records(str(path))] == ['1', '2']
+
+
+def news(link, pub_date):
+    return {'link': link, 'title': link, 'description': '', 'pub_date': pub_date}
+
+
+def test_query_news_keeps_each_query_in_relevance_order(db_file):
+    data_store.upsert_news('issue', [news('a', '2025-07-18'), news('b', '2025-07-20')], db_file,
+                           query='데이식스', first_rank=1)
+    data_store.upsert_news('issue', [news('c', '2025-07-21')], db_file, query='데이식스', first_rank=3)
+    data_store.upsert_news('issue', [news('b', '2025-07-20'), news('d', '2025-07-22')], db_file,
+                           query='JYP', first_rank=1)
+    # 최신순(증분) 수집 기사는 순위 없이 뒤에, 기존 순위는 유지
+    data_store.upsert_news('issue', [news('e', '2025-07-23'), news('a', '2025-07-18')], db_file,
+                           query='데이식스')
+
+    assert [n['link'] for n in data_store.query_news('issue', '데이식스', db_file)] == ['a', 'b', 'c', 'e']
+    assert [n['link'] for n in data_store.query_news('issue', 'JYP', db_file)] == ['b', 'd']
+    assert data_store.query_news('issue', '없는 검색어', db_file) == []
+    assert [n['link'] for n in data_store.recent_news('issue', 10, db_file=db_file)] == ['e', 'd', 'c', 'b', 'a']
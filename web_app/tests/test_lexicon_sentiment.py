@@ -0,0 +1,22 @@
+# -*- coding: utf-8 -*-
+"""
+사전 기반 감정분석 부정어 처리 테스트
+
+    python -m pytest tests   # web_app 디렉토리에서 실행
+"""
+import pytest
+
+from utils.lexicon_sentiment import classify_texts
+
+
+@pytest.mark.parametrize('text, label', [
+    ('응원 못 하겠다', '부정'),
+    ('응원 못하겠다', '부정'),
+    ('지지는 안 해', '부정'),
+    ('실망 안 해', '긍정'),
+    ('못 믿겠다', '부정'),
+    ('좋지 않다', '부정'),
+    ('그래도 데식이들 응원해 항상 사랑해', '긍정'),
+])
+def test_negation(text, label):
+    assert classify_texts([text]) == [label]
@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+"""
+LLM 응답 캐시 (키 구성, 메모리 LRU, 디스크 용량 제한) 테스트
+
+    python -m pytest tests   # web_app 디렉토리에서 실행
+"""
+import glob
+import os
+from collections import OrderedDict
+
+import pytest
+
+from utils import llm_cache
+
+MESSAGES = [{'role': 'system', 'content': '감정 분류'}, {'role': 'user', 'content': '트윗'}]
+PARAMS = {'temperature': 0.1, 'maxTokens': 10}
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(llm_cache, 'CACHE_DIR', str(tmp_path))
+    monkeypatch.setattr(llm_cache, '_memory', OrderedDict())
+    monkeypatch.setattr(llm_cache, '_puts_since_evict', [0])
+    return tmp_path
+
+
+def disk_keys(cache_dir):
+    return sorted(os.path.basename(path)[:-len('.json')] for path in glob.glob(str(cache_dir / '*' / '*.json')))
+
+
+def test_key_is_stable_and_ignores_dict_order():
+    key = llm_cache.make_key('HCX-005', MESSAGES, PARAMS, 'v1')
+    assert key == llm_cache.make_key('HCX-005', MESSAGES, dict(reversed(list(PARAMS.items()))), 'v1')
+    assert len(key) == 64
+
+
+@pytest.mark.parametrize('model, messages, params, prompt_version', [
+    ('HCX-DASH-002', MESSAGES, PARAMS, 'v1'),
+    ('HCX-005', MESSAGES[:1], PARAMS, 'v1'),
+    ('HCX-005', [MESSAGES[0], {'role': 'user', 'content': '다른 트윗'}], PARAMS, 'v1'),
+    ('HCX-005', MESSAGES, {**PARAMS, 'temperature': 0.5}, 'v1'),
+    ('HCX-005', MESSAGES, PARAMS, 'v2'),
+])
+def test_key_changes_with_request(model, messages, params, prompt_version):
+    assert llm_cache.make_key(model, messages, params, prompt_version) != llm_cache.make_key(
+        'HCX-005', MESSAGES, PARAMS, 'v1'
+    )
+
+
+def test_put_get_memory_then_disk(cache_dir):
+    key = llm_cache.make_key('HCX-005', MESSAGES, PARAMS, 'v1')
+    assert llm_cache.get(key) is None
+
+    llm_cache.put(key, '부정', 'v1')
+    assert llm_cache.get(key) == '부정'
+    assert disk_keys(cache_dir) == [key]
+
+    # 메모리를 비워도 디스크에서 읽음
+    llm_cache.clear_memory()
+    assert llm_cache.get(key) == '부정'
+
+
+def test_none_is_not_cached(cache_dir):
+    llm_cache.put('a' * 64, None)
+    assert llm_cache.get('a' * 64) is None
+    assert disk_keys(cache_dir) == []
+
+
+def test_memory_lru_bound(cache_dir, monkeypatch):
+    monkeypatch.setattr(llm_cache, 'MEMORY_MAX_ENTRIES', 2)
+    for key in ('a1', 'b1', 'c1'):
+        llm_cache.put(key * 32, key)
+    assert list(llm_cache._memory) == ['b1' * 32, 'c1' * 32]
+
+
+def test_disk_bound_removes_least_recently_used(cache_dir, monkeypatch):
+    monkeypatch.setattr(llm_cache, 'DISK_EVICT_INTERVAL', 1)
+    monkeypatch.setattr(llm_cache, 'DISK_MAX_ENTRIES', 3)
+    keys = [f"{i:02d}" * 32 for i in range(3)]
+    for i, key in enumerate(keys):
+        llm_cache.put(key, f"응답 {i}")
+        os.utime(llm_cache._disk_path(key), (1_000_000 + i, 1_000_000 + i))
+
+    # 가장 오래된 항목을 읽으면 마지막 사용 시각이 갱신되어 정리 대상에서 빠짐
+    llm_cache.clear_memory()
+    assert llm_cache.get(keys[0]) == '응답 0'
+
+    llm_cache.put('99' * 32, '응답 3')
+    assert disk_keys(cache_dir) == sorted([keys[0], keys[2], '99' * 32])
+
+
+def test_disk_bound_by_bytes(cache_dir, monkeypatch):
+    monkeypatch.setattr(llm_cache, 'DISK_EVICT_INTERVAL', 1)
+    monkeypatch.setattr(llm_cache, 'DISK_MAX_BYTES', 3000)
+    for i in range(5):
+        key = f"{i:02d}" * 32
+        llm_cache.put(key, 'x' * 1000)
+        os.utime(llm_cache._disk_path(key), (1_000_000 + i, 1_000_000 + i))
+
+    assert disk_keys(cache_dir) == ['03' * 32, '04' * 32]
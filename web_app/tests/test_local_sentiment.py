@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+"""
+로컬 감정 모델 (LLM 라벨 기록, 저장, 재학습 시점) 테스트
+
+    python -m pytest tests   # web_app 디렉토리에서 실행
+"""
+import json
+import os
+
+import numpy as np
+import pytest
+
+from utils import local_sentiment
+
+
+@pytest.fixture
+def label_log(tmp_path, monkeypatch):
+    path = tmp_path / 'sentiment_labels.jsonl'
+    monkeypatch.setattr(local_sentiment, 'LABEL_LOG_FILE', str(path))
+    monkeypatch.setattr(local_sentiment, '_training', {'running': False, 'last_attempt': None, 'new_labels': 0})
+    return path
+
+
+def logged_labels(path):
+    if not path.exists():
+        return []
+    return [(row['text'], row['sentiment']) for row in map(json.loads, path.read_text(encoding='utf-8').splitlines())]
+
+
+def test_record_llm_labels_skips_failed_calls(label_log):
+    local_sentiment.record_llm_labels(['좋아요', '실패한 트윗', '', '별로'], ['긍정', None, '부정', '부정'])
+    assert logged_labels(label_log) == [('좋아요', '긍정'), ('별로', '부정')]
+    assert local_sentiment._training['new_labels'] == 2
+
+
+def test_escalation_without_model_keeps_failed_labels_none(label_log, monkeypatch):
+    monkeypatch.setattr(local_sentiment, 'get_model', lambda: None)
+    labels, confidences, stats = local_sentiment.classify_with_escalation(
+        ['좋아요', '실패'], lambda texts: (['긍정', None], len(texts))
+    )
+    assert labels == ['긍정', None]
+    assert confidences == [None, None]
+    assert stats['escalated'] == 2 and stats['llm_requests'] == 2
+    assert logged_labels(label_log) == [('좋아요', '긍정')]
+
+
+def test_escalation_sends_only_low_confidence_texts(label_log, monkeypatch):
+    texts = ['정말 좋아요 최고', '너무 별로 실망', '그냥 그래요'] * 10
+    labels = ['긍정', '부정', '중립'] * 10
+    model = local_sentiment.train_model(texts, labels)
+    monkeypatch.setattr(local_sentiment, 'get_model', lambda: model)
+
+    sent = []
+
+    def llm_classify(batch):
+        sent.extend(batch)
+        return [None] * len(batch), len(batch)
+
+    result, confidences, stats = local_sentiment.classify_with_escalation(
+        ['정말 좋아요 최고', '처음 보는 문장'], llm_classify, threshold=0.9
+    )
+    assert sent == ['처음 보는 문장']
+    assert result == ['긍정', None]
+    assert confidences[0] >= 0.9 and confidences[1] is None
+    assert stats == {'local_model': True, 'local_labeled': 1, 'escalated': 1, 'llm_requests': 1,
+                     'llm_calls_saved': 1}
+    assert logged_labels(label_log) == []
+
+
+def test_save_model_roundtrip_without_temp_files(tmp_path):
+    model = local_sentiment.train_model(['좋아요', '별로'] * 5, ['긍정', '부정'] * 5, epochs=5)
+    path = str(tmp_path / 'model.npz')
+
+    local_sentiment.save_model(model, path)
+    local_sentiment.save_model(model, path)
+
+    loaded = local_sentiment.load_model(path)
+    assert np.allclose(loaded['weights'], model['weights'], atol=1e-6)
+    assert loaded['n_samples'] == model['n_samples']
+    assert os.listdir(tmp_path) == ['model.npz']
+
+
+@pytest.mark.parametrize('training, has_model, now, expected', [
+    ({'running': False, 'last_attempt': None, 'new_labels': 0}, False, 1000, True),
+    ({'running': True, 'last_attempt': None, 'new_labels': 0}, False, 1000, False),
+    # 라벨 부족으로 실패한 뒤 RETRAIN_RETRY_SECONDS 가 지나야 다시 시도
+    ({'running': False, 'last_attempt': 1000, 'new_labels': 0}, False, 1000 + 10, False),
+    ({'running': False, 'last_attempt': 1000, 'new_labels': 0}, False,
+     1000 + local_sentiment.RETRAIN_RETRY_SECONDS, True),
+    # 모델이 있으면 새 라벨이 충분히 쌓였을 때만
+    ({'running': False, 'last_attempt': 0, 'new_labels': 10}, True, 10 ** 6, False),
+    ({'running': False, 'last_attempt': 0, 'new_labels': local_sentiment.RETRAIN_NEW_LABELS}, True, 10, True),
+])
+def test_should_retrain(monkeypatch, training, has_model, now, expected):
+    monkeypatch.setattr(local_sentiment, '_training', training)
+    monkeypatch.setattr(local_sentiment, '_model', {} if has_model else None)
+    assert local_sentiment._should_retrain(now) == expected
@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+"""
+유사 중복 트윗 묶기 (MinHash + LSH) 테스트
+
+    python -m pytest tests   # web_app 디렉토리에서 실행
+"""
+import pytest
+
+from utils.near_duplicates import dedupe_stats, group_near_duplicates, jaccard, shingle_hashes
+
+BASE = "데이식스 팬미팅 본인확인 너무 과하다 팬들만 힘들게 하는 정책"
+
+
+@pytest.mark.parametrize('variant', [
+    BASE,
+    BASE + " https://t.co/abc123",
+    BASE + " 😡😡",
+    "  " + BASE.replace(' ', '  ') + "!!",
+    BASE + " 진짜",
+])
+def test_variants_join_first_text(variant):
+    representatives, similarities = group_near_duplicates([BASE, variant])
+    assert representatives.tolist() == [0, 0]
+    assert similarities[0] == 1.0 and similarities[1] >= 0.8
+
+
+def test_different_texts_stay_separate():
+    texts = [BASE, "JYP 주가 오늘 많이 올랐네 실적 기대된다", "공연 너무 좋았어요 다음에도 갈게요"]
+    representatives, similarities = group_near_duplicates(texts)
+    assert representatives.tolist() == [0, 1, 2]
+    assert similarities.tolist() == [1.0, 1.0, 1.0]
+
+
+def test_members_attach_to_earliest_representative():
+    other = "JYP 주가 오늘 많이 올랐네 실적 기대된다"
+    texts = [other, BASE, other + " ㅋㅋ", BASE + " https://t.co/x", BASE]
+    representatives, _ = group_near_duplicates(texts)
+    assert representatives.tolist() == [0, 1, 0, 1, 1]
+    assert dedupe_stats(representatives) == {'total': 5, 'representatives': 2, 'duplicates': 3}
+
+
+def test_threshold_controls_grouping():
+    texts = [BASE, BASE + " 그래도 공연은 좋았음"]
+    similarity = jaccard(set(shingle_hashes(texts[0]).tolist()), set(shingle_hashes(texts[1]).tolist()))
+    assert group_near_duplicates(texts, threshold=similarity - 0.05, bands=32)[0].tolist() == [0, 0]
+    assert group_near_duplicates(texts, threshold=similarity + 0.05)[0].tolist() == [0, 1]
+
+
+def test_symbol_only_texts_use_raw_text():
+    representatives, _ = group_near_duplicates(["😡😡😡", "😡😡😡", "👍👍👍"])
+    assert representatives.tolist() == [0, 0, 2]
+
+
+def test_empty_input():
+    representatives, similarities = group_near_duplicates([])
+    assert len(representatives) == 0 and len(similarities) == 0
+    assert dedupe_stats(representatives) == {'total': 0, 'representatives': 0, 'duplicates': 0}
@@ -0,0 +1,168 @@
+# -*- coding: utf-8 -*-
+"""
+캐시 백그라운드 갱신 (stale-while-revalidate) 테스트
+
+    python -m pytest tests   # web_app 디렉토리에서 실행
+"""
+import json
+import threading
+import time
+from datetime import datetime, timedelta
+
+import pytest
+
+from utils import cache_store, refresh_scheduler
+
+TTL = 60
+
+
+@pytest.fixture(autouse=True)
+def isolated_scheduler(tmp_path, monkeypatch):
+    monkeypatch.setattr(cache_store, 'CACHE_DIR', str(tmp_path))
+    monkeypatch.setattr(refresh_scheduler, 'ensure_started', lambda: None)
+    monkeypatch.setattr(refresh_scheduler, '_keys', {})
+    return tmp_path
+
+
+def write_entry(name, data, age_seconds):
+    timestamp = (datetime.now() - timedelta(seconds=age_seconds)).isoformat()
+    with open(cache_store.entry_path(name), 'w', encoding='utf-8') as f:
+        json.dump({'timestamp': timestamp, 'data': data}, f)
+
+
+class Counter:
+    """호출 횟수를 세고 값을 반환하는 compute (started/release 로 갱신 진행 제어)"""
+
+    def __init__(self, value='new', block=False):
+        self.value = value
+        self.calls = 0
+        self.started = threading.Event()
+        self.release = threading.Event()
+        if not block:
+            self.release.set()
+
+    def __call__(self):
+        self.calls += 1
+        self.started.set()
+        self.release.wait(5)
+        return self.value
+
+
+def wait_for_refresh(name, timeout=5):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        status = refresh_scheduler.get_status(name)
+        if status and status['refresh_count'] and not status['refreshing']:
+            return status
+        time.sleep(0.01)
+    raise AssertionError(f"갱신이 끝나지 않음: {name}")
+
+
+def test_fresh_entry_is_served_without_refresh():
+    write_entry('key', 'cached', 10)
+    compute = Counter()
+    assert refresh_scheduler.serve('key', TTL, compute) == 'cached'
+    assert compute.calls == 0
+
+
+def test_stale_entry_is_served_then_refreshed_in_background():
+    write_entry('key', 'old', TTL + 10)
+    compute = Counter(block=True)
+
+    assert refresh_scheduler.serve('key', TTL, compute) == 'old'
+    assert compute.started.wait(5)
+    # 갱신 중에 다시 조회해도 이전 결과를 반환하고 갱신은 한 번만
+    assert refresh_scheduler.serve('key', TTL, compute) == 'old'
+    compute.release.set()
+
+    status = wait_for_refresh('key')
+    assert status['status'] == 'ok' and compute.calls == 1
+    assert cache_store.get('key', TTL) == 'new'
+
+
+@pytest.mark.parametrize('age_seconds', [None, TTL + refresh_scheduler.MAX_STALE_AGE + 10])
+def test_missing_or_too_old_entry_is_computed_inline(age_seconds):
+    if age_seconds is not None:
+        write_entry('key', 'ancient', age_seconds)
+    compute = Counter()
+
+    assert refresh_scheduler.serve('key', TTL, compute) == 'new'
+    assert compute.calls == 1
+    assert cache_store.get('key', TTL) == 'new'
+
+
+def test_uncacheable_result_is_returned_but_not_stored():
+    compute = Counter(value={'success': False})
+    result = refresh_scheduler.serve('key', TTL, compute, cacheable=lambda r: r['success'])
+
+    assert result == {'success': False}
+    assert cache_store.get('key', None) is None
+    assert refresh_scheduler.get_status('key')['status'] == 'failed'
+
+
+@pytest.mark.parametrize('age_seconds, due', [
+    (TTL * 0.5, False),
+    (TTL * refresh_scheduler.REFRESH_AHEAD_RATIO + 1, True),
+])
+def test_hot_keys_refresh_ahead(age_seconds, due):
+    write_entry('key', 'cached', age_seconds)
+    compute = Counter()
+    refresh_scheduler.lookup('key', TTL, compute)
+
+    refresh_scheduler._refresh_due_keys()
+    if due:
+        wait_for_refresh('key')
+    else:
+        time.sleep(0.05)
+    assert compute.calls == (1 if due else 0)
+
+
+def test_refresh_ahead_skips_keys_without_entry():
+    compute = Counter()
+    refresh_scheduler.track('key', TTL, compute)
+    refresh_scheduler._refresh_due_keys()
+    time.sleep(0.05)
+    assert compute.calls == 0
+
+
+def test_refresh_ahead_skips_keys_being_streamed():
+    write_entry('key', 'cached', TTL)
+    compute = Counter()
+    refresh_scheduler.track('key', TTL, compute)
+    assert refresh_scheduler.mark_refreshing('key')
+    assert not refresh_scheduler.mark_refreshing('key')
+
+    stream = refresh_scheduler.refreshing_until_done('key', iter(['a', 'b']))
+    refresh_scheduler._refresh_due_keys()
+    time.sleep(0.05)
+    assert compute.calls == 0
+
+    # 스트림을 끝까지 받으면 표시가 해제되어 다시 갱신 대상이 됨
+    assert list(stream) == ['a', 'b']
+    assert not refresh_scheduler.get_status('key')['refreshing']
+
+
+def test_closing_stream_clears_refreshing():
+    refresh_scheduler.track('key', TTL, Counter())
+    refresh_scheduler.mark_refreshing('key')
+    refresh_scheduler.refreshing_until_done('key', iter(['a'])).close()
+    assert not refresh_scheduler.get_status('key')['refreshing']
+
+
+def test_failed_key_backs_off():
+    # 만료 전이지만 미리 갱신할 시점인 항목
+    write_entry('key', 'cached', TTL * 0.9)
+
+    def fail():
+        raise RuntimeError('실패')
+
+    refresh_scheduler.lookup('key', TTL, fail)
+    refresh_scheduler._refresh_due_keys()
+    wait_for_refresh('key')
+    assert refresh_scheduler.get_status('key')['status'] == 'failed'
+
+    compute = Counter()
+    refresh_scheduler.lookup('key', TTL, compute)
+    refresh_scheduler._refresh_due_keys()
+    time.sleep(0.05)
+    assert compute.calls == 0
@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+"""
+리포트 공용 캐시 (같은 키 동시 계산은 한 번만) 테스트
+
+    python -m pytest tests   # web_app 디렉토리에서 실행
+"""
+import threading
+import time
+
+import pytest
+
+from utils import report_cache
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    report_cache.clear()
+    yield
+    report_cache.clear()
+
+
+def run_concurrently(count, target):
+    results = [None] * count
+    start = threading.Barrier(count)
+
+    def worker(i):
+        start.wait()
+        results[i] = target()
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(10)
+    return results
+
+
+@pytest.mark.parametrize('section, issue_info, investor_type, expected', [
+    ('news', None, 'MIRAE', ('news', 'default', 'MIRAE')),
+    ('news', {'issue_id': 'day6', 'title': '제목'}, 'MIRAE', ('news', 'day6', 'MIRAE')),
+    ('sns', {'query': '데이식스'}, 'SAFE', ('sns', '데이식스', 'SAFE')),
+    ('financial', {'title': '제목'}, None, ('financial', '제목', None)),
+])
+def test_make_key(section, issue_info, investor_type, expected):
+    assert report_cache.make_key(section, issue_info, investor_type) == expected
+
+
+def test_concurrent_requests_compute_once():
+    calls = []
+
+    def compute():
+        calls.append(1)
+        time.sleep(0.2)
+        return {'success': True}
+
+    key = report_cache.make_key('news', {'issue_id': 'single-flight'}, 'MIRAE')
+    results = run_concurrently(8, lambda: report_cache.get_or_compute(key, compute))
+
+    assert len(calls) == 1
+    assert results == [{'success': True}] * 8
+    assert not report_cache.is_inflight(key)
+
+
+def test_failed_result_is_not_cached_and_waiters_recompute():
+    calls = []
+
+    def compute():
+        calls.append(1)
+        time.sleep(0.1)
+        return {'success': len(calls) > 1}
+
+    key = report_cache.make_key('sns', {'issue_id': 'retry'}, 'MIRAE')
+    results = run_concurrently(3, lambda: report_cache.get_or_compute(
+        key, compute, cacheable=lambda result: result['success']
+    ))
+
+    # 첫 계산 실패는 저장하지 않고, 기다리던 요청 중 하나가 다시 계산한 성공 결과를 공유
+    assert len(calls) == 2
+    assert results.count({'success': False}) == 1
+    assert report_cache.get(key) == {'success': True}
+
+
+def test_exception_releases_inflight_slot():
+    key = report_cache.make_key('financial', {'issue_id': 'error'})
+
+    def fail():
+        raise RuntimeError('실패')
+
+    with pytest.raises(RuntimeError):
+        report_cache.get_or_compute(key, fail)
+
+    assert not report_cache.is_inflight(key)
+    assert report_cache.get_or_compute(key, lambda: 'ok') == 'ok'
+
+
+def test_expired_entry_is_recomputed():
+    key = report_cache.make_key('news', {'issue_id': 'ttl'}, 'MIRAE')
+    report_cache.put(key, 'old', ttl=-1)
+    assert report_cache.get(key) is None
+    assert report_cache.get_or_compute(key, lambda: 'new') == 'new'
+    assert report_cache.get(key) == 'new'
+
+
+def test_wait_timeout_computes_without_cache(monkeypatch):
+    monkeypatch.setattr(report_cache, 'INFLIGHT_WAIT_TIMEOUT', 0.05)
+    key = report_cache.make_key('news', {'issue_id': 'stuck'}, 'MIRAE')
+    assert report_cache.begin(key)
+    try:
+        assert report_cache.begin(key) is None
+        assert report_cache.get_or_compute(key, lambda: 'direct') == 'direct'
+        assert report_cache.get(key) is None
+    finally:
+        report_cache.finish(key)
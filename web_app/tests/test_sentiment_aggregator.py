@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+"""
+감정 라벨 집계 (비율, 가중 비율, 클래스별 상위 k개) 테스트
+
+    python -m pytest tests   # web_app 디렉토리에서 실행
+"""
+import numpy as np
+import pytest
+
+from utils import sentiment_aggregator
+from utils.sentiment_aggregator import aggregate, class_shares, encode_labels, top_k_indices
+
+
+def test_encode_labels_maps_unknown_to_neutral():
+    assert encode_labels(['긍정', '부정', '중립', '모름', None]).tolist() == [0, 1, 2, 2, 2]
+
+
+@pytest.mark.parametrize('keys, candidates, k, expected', [
+    ([5, 9, 1, 9, 3], [0, 1, 2, 3, 4], 2, [1, 3]),
+    # 경계값이 같으면 인덱스가 작은 것 먼저
+    ([5, 7, 5, 5, 1], [0, 1, 2, 3, 4], 3, [1, 0, 2]),
+    ([4, 4, 4, 4], [1, 2, 3], 2, [1, 2]),
+    ([1, 2, 3], [0, 2], 5, [2, 0]),
+    ([1, 2, 3], [0, 1, 2], 0, []),
+    ([1, 2, 3], [], 2, []),
+])
+def test_top_k_indices_ties(keys, candidates, k, expected):
+    result = top_k_indices(np.array(keys, dtype=np.float64), np.array(candidates, dtype=np.int64), k)
+    assert result.tolist() == expected
+
+
+def test_shares_match_counts():
+    result = aggregate(encode_labels(['긍정', '부정', '부정', '중립']))
+    assert result['total'] == 4
+    assert result['counts'] == {'긍정': 1, '부정': 2, '중립': 1}
+    assert result['percentages'] == pytest.approx({'긍정': 25.0, '부정': 50.0, '중립': 25.0})
+    # 반응/팔로워 정보가 없으면 가중 비율도 같음
+    assert result['weighted_percentages'] == pytest.approx(result['percentages'])
+    assert result['follower_percentages'] == pytest.approx(result['percentages'])
+
+
+def test_weighted_shares():
+    codes = encode_labels(['긍정', '부정', '부정'])
+    result = aggregate(codes, like_counts=[7, 0, 1], retweet_counts=[2, 0, 0], weights=[1.0, 1.0, 0.5])
+    # 트윗 수 × 유사도: 1, 1, 0.5
+    assert result['percentages'] == pytest.approx({'긍정': 40.0, '부정': 60.0, '중립': 0.0})
+    # (1 + 반응) × 유사도: 10, 1, 1
+    assert result['weighted_percentages'] == pytest.approx({'긍정': 10 / 12 * 100, '부정': 2 / 12 * 100, '중립': 0.0})
+    assert result['counts'] == {'긍정': 1, '부정': 2, '중립': 0}
+
+
+def test_follower_shares_use_log_scale():
+    result = aggregate(encode_labels(['긍정', '부정']), followers=[10 ** 6, 0])
+    positive = 1 + np.log1p(10 ** 6)
+    assert result['follower_percentages']['긍정'] == pytest.approx(positive / (positive + 1) * 100)
+
+
+def test_empty_input():
+    result = aggregate(np.array([], dtype=np.int64))
+    assert result['total'] == 0
+    assert result['percentages'] == {'긍정': 0.0, '부정': 0.0, '중립': 0.0}
+    assert all(len(samples) == 0 for samples in result['samples'].values())
+    assert class_shares(np.array([], dtype=np.int64)).tolist() == [0.0, 0.0, 0.0]
+
+
+def test_sample_mask_excludes_candidates():
+    codes = encode_labels(['부정', '부정', '부정'])
+    result = aggregate(codes, like_counts=[9, 5, 1], sample_mask=[False, True, True])
+    assert result['samples']['부정'].tolist() == [1, 2]
+
+
+@pytest.mark.parametrize('dispersion_input, expected', [
+    ([1.0, 0.0, 0.0], {'net_score': 1.0, 'std': 0.0, 'entropy': 0.0}),
+    ([0.5, 0.5, 0.0], {'net_score': 0.0, 'std': 1.0, 'entropy': round(np.log(2) / np.log(3), 4)}),
+    ([1 / 3, 1 / 3, 1 / 3], {'net_score': 0.0, 'std': round((2 / 3) ** 0.5, 4), 'entropy': 1.0}),
+])
+def test_dispersion(dispersion_input, expected):
+    assert sentiment_aggregator.dispersion(np.array(dispersion_input)) == expected
+
+
+@pytest.mark.parametrize('seed', [0, 1, 2])
+def test_matches_previous_aggregation(seed):
+    data = sentiment_aggregator.make_benchmark_data(2000, seed=seed)
+    engagement = data['like_counts'] + data['retweet_counts']
+    # 이전 방식은 반응 내림차순(같으면 원래 순서)으로 정렬된 입력을 가정
+    order = np.argsort(-engagement, kind='stable')
+    results = [{'index': int(i), 'sentiment': sentiment_aggregator.LABELS[data['codes'][i]]} for i in order]
+
+    percentages, samples = sentiment_aggregator._baseline_aggregate(results)
+    result = aggregate(data['codes'], data['like_counts'], data['retweet_counts'])
+
+    assert result['percentages'] == pytest.approx(percentages)
+    assert {label: indices.tolist() for label, indices in result['samples'].items()} == samples
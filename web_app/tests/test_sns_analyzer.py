@@ -0,0 +1,144 @@
+# -*- coding: utf-8 -*-
+"""
+배치 감정분석 응답 파싱 / 유사 트윗 묶음 선택 / 배치-단일 일치도 비교 테스트
+
+    python -m pytest tests   # web_app 디렉토리에서 실행
+"""
+import json
+
+import pytest
+
+from utils import sns_analyzer
+from utils.sns_analyzer import parse_batch_labels, parse_sentiment_label, select_top_groups
+
+
+@pytest.mark.parametrize('response_text', [
+    "1: 부정\n2: 긍정\n3: 중립",
+    "1. 부정\n2. 긍정\n3. 중립",
+    "1) 부정\n2) 긍정\n3) 중립",
+    "1번: 부정\n2번: 긍정\n3번: 중립",
+    "1번 부정\n2번. 긍정\n3번) 중립",
+    "1번 트윗: 부정\n2번 트윗: 긍정\n3번 트윗: 중립",
+    "[1] 부정\n[2] 긍정\n[3] 중립",
+    '{"1": "부정", "2": "긍정", "3": "중립"}',
+    "1：부정 2：긍정 3：중립",
+])
+def test_parse_batch_labels_formats(response_text):
+    assert parse_batch_labels(response_text, 3) == {0: '부정', 1: '긍정', 2: '중립'}
+
+
+def test_parse_batch_labels_ignores_out_of_range_and_repeats():
+    assert parse_batch_labels("0: 긍정\n1번: 부정\n1번: 긍정\n4번: 중립", 3) == {0: '부정'}
+
+
+def test_parse_batch_labels_missing_items():
+    assert parse_batch_labels("2번: 긍정", 3) == {1: '긍정'}
+    assert parse_batch_labels("", 3) == {}
+    assert parse_batch_labels(None, 3) == {}
+
+
+@pytest.mark.parametrize('response_text, label', [
+    ('부정', '부정'),
+    ('결과: 긍정', '긍정'),
+    ('중립입니다', '중립'),
+    ('잘 모르겠습니다', '중립'),
+    # 호출 실패(빈 응답)는 중립이 아니라 None - 학습 라벨/LLM 출처에서 제외
+    ('', None),
+    (None, None),
+])
+def test_parse_sentiment_label(response_text, label):
+    assert parse_sentiment_label(response_text) == label
+
+
+@pytest.mark.parametrize('representatives, limit, max_members, expected', [
+    # 반응 순 후보의 대표 인덱스: 앞선 묶음 2개(0, 1)만 선택
+    ([0, 1, 0, 3, 1, 5], 2, 3, [0, 1, 2, 4]),
+    # 바이럴 묶음은 max_members 개까지만
+    ([0, 0, 0, 0, 0, 5, 6], 3, 2, [0, 1, 5, 6]),
+    ([0, 1, 2], 5, 3, [0, 1, 2]),
+    ([], 3, 3, []),
+])
+def test_select_top_groups(representatives, limit, max_members, expected):
+    assert select_top_groups(representatives, limit, max_members) == expected
+
+
+def test_select_top_groups_bounds_total():
+    representatives = [0] * 100 + list(range(100, 120))
+    selected = select_top_groups(representatives, limit=15, max_members=3)
+    assert len(selected) <= 15 * 3
+    assert selected[:3] == [0, 1, 2]
+
+
+def fake_label(text):
+    if '응원' in text:
+        return '긍정'
+    if '실망' in text:
+        return '부정'
+    return '중립'
+
+
+def make_fake_chat(omit_once='누락'):
+    """단일/배치 프롬프트에 답하는 가짜 chat (배치는 '애매' 트윗을 부정으로, omit_once 트윗은 처음 한 번 누락)"""
+    calls = {'single': 0, 'batch': 0}
+    omitted = set()
+
+    def fake_chat(messages, params, api_key=None, timeout=30, prompt_version=None):
+        content = messages[-1]['content']
+        if not content.startswith('트윗 목록'):
+            calls['single'] += 1
+            return fake_label(content)
+
+        calls['batch'] += 1
+        lines = []
+        for line in content.splitlines()[1:]:
+            number, text = line.split('. ', 1)
+            if omit_once in text and text not in omitted:
+                omitted.add(text)
+                continue
+            lines.append(f"{number}: {'부정' if '애매' in text else fake_label(text)}")
+        return '\n'.join(lines)
+
+    return fake_chat, calls
+
+
+def test_compare_batch_accuracy(tmp_path, monkeypatch):
+    texts = ['데이식스 계속 응원합니다', '정말 실망스러운 대응', '애매한 공지 내용이네요',
+             '누락될 응원 트윗입니다', '공연 일정 공지 확인', '이번 대응 실망했어요']
+    tweets_file = tmp_path / 'tweets.json'
+    tweets_file.write_text(json.dumps(
+        [{'id': str(i), 'text': text, 'like_count': 10 - i} for i, text in enumerate(texts)], ensure_ascii=False
+    ), encoding='utf-8')
+
+    fake_chat, calls = make_fake_chat()
+    monkeypatch.setattr(sns_analyzer, 'chat', fake_chat)
+    monkeypatch.setattr(sns_analyzer, 'get_api_key', lambda: 'test-key')
+
+    result = sns_analyzer.compare_batch_accuracy(str(tweets_file), '이슈', 'JYP', max_tweets=10, batch_size=4)
+
+    # 6개 → 배치 2회 + 누락 1개 재요청 1회
+    assert result == {
+        'agreement': pytest.approx(5 / 6 * 100),
+        'total': 6,
+        'single_requests': 6,
+        'batch_requests': 3,
+        'mismatches': {'중립→부정': 1}
+    }
+    assert calls == {'single': 6, 'batch': 3}
+
+
+def test_compare_batch_accuracy_without_api_key(monkeypatch):
+    monkeypatch.setattr(sns_analyzer, 'get_api_key', lambda: None)
+    assert sns_analyzer.compare_batch_accuracy('missing.json', '이슈', 'JYP') is None
+
+
+@pytest.mark.parametrize('news_context, same_as_default', [
+    (None, True),
+    ('기본 설명', True),
+    ('다른 설명', False),
+])
+def test_sns_cache_name_includes_overridden_context(news_context, same_as_default):
+    issue = {'issue_id': 'day6', 'news_context': '기본 설명'}
+    name = sns_analyzer.sns_cache_name('MIRAE', issue, news_context)
+    assert name.startswith('sns_cache_day6_mirae')
+    assert (name == 'sns_cache_day6_mirae') == same_as_default
+    assert name == sns_analyzer.sns_cache_name('MIRAE', issue, news_context)
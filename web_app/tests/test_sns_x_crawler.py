@@ -0,0 +1,148 @@
+# -*- coding: utf-8 -*-
+"""
+X 수집기 테스트 (x_api_stub 로컬 검색 API 대역 사용: 페이지 이동, 429 대기, 중단 후 이어서 수집)
+
+    python -m pytest tests   # web_app 디렉토리에서 실행
+"""
+import json
+import threading
+import time
+from http.server import ThreadingHTTPServer
+
+import pytest
+
+import sns_x_crawler
+import x_api_stub
+
+SEARCH_PATH = '/2/tweets/search/recent'
+REAL_SLEEP = time.sleep
+
+
+@pytest.fixture
+def start_stub():
+    """x_api_stub 서버를 빈 포트에 띄우고 검색 URL 반환 (테스트가 끝나면 종료)"""
+    servers = []
+
+    def start(total=100, rate_limit=100, window=60, fail_page=None):
+        handler = x_api_stub.make_handler(total, rate_limit, window, fail_page=fail_page)
+        server = ThreadingHTTPServer(('127.0.0.1', 0), handler)
+        threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True).start()
+        servers.append(server)
+        return f"http://127.0.0.1:{server.server_address[1]}{SEARCH_PATH}"
+
+    yield start
+
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    """수집기의 대기 시간 기록 (실제로는 짧게만 대기)"""
+    recorded = []
+
+    def fake_sleep(seconds):
+        recorded.append(seconds)
+        REAL_SLEEP(min(seconds, 0.05))
+
+    monkeypatch.setattr(sns_x_crawler.time, 'sleep', fake_sleep)
+    # 페이지를 작게 나눠 여러 번 요청
+    monkeypatch.setattr(sns_x_crawler, 'PAGE_MAX_RESULTS', 20)
+    return recorded
+
+
+def read_ids(path):
+    with open(path, encoding='utf-8') as f:
+        return [json.loads(line)['id'] for line in f]
+
+
+def expected_ids(total, max_results):
+    """대역 API 가 주는 한국어 트윗(5개 중 4개) 앞에서부터 max_results 개"""
+    return [str(10 ** 6 + i) for i in range(total) if i % 5][:max_results]
+
+
+def test_collects_all_pages(start_stub, sleeps):
+    url = start_stub(total=100)
+    tweets = sns_x_crawler.collect_tweets('데이식스', max_results=50, base_url=url)
+
+    assert [tweet['id'] for tweet in tweets] == expected_ids(100, 50)
+    assert tweets[0]['text'] == '데이식스 본인확인 트윗 번호 1 내용'
+    assert tweets[0]['author_followers'] == 10
+    assert sleeps == []
+
+
+def test_stops_when_results_run_out(start_stub, sleeps):
+    url = start_stub(total=30)
+    tweets = sns_x_crawler.collect_tweets('데이식스', max_results=100, base_url=url)
+    assert [tweet['id'] for tweet in tweets] == expected_ids(30, 100)
+
+
+def test_waits_for_rate_limit_reset(start_stub, sleeps, capsys):
+    url = start_stub(total=100, rate_limit=2, window=0.3)
+    tweets = sns_x_crawler.collect_tweets('데이식스', max_results=60, base_url=url)
+
+    assert [tweet['id'] for tweet in tweets] == expected_ids(100, 60)
+    # 남은 요청이 0 이거나 429 를 받으면 한도 초기화 시각(x-rate-limit-reset)까지 대기
+    assert sleeps and all(seconds > 0 for seconds in sleeps)
+    assert '남은 요청 없음' in capsys.readouterr().out
+
+
+def test_request_page_retries_after_429(start_stub, sleeps, capsys):
+    url = start_stub(total=100, rate_limit=1, window=0.3)
+    session = sns_x_crawler.requests.Session()
+    params = {'max_results': 10}
+
+    assert sns_x_crawler.request_page(session, url, params, {})['meta']['result_count'] == 10
+    # 새 rate_state 로 바로 요청하면 429 → 초기화까지 기다린 뒤 재요청
+    assert sns_x_crawler.request_page(session, url, params, {})['meta']['result_count'] == 10
+    assert '요청 한도 초과' in capsys.readouterr().out
+    assert sleeps
+
+
+def test_retries_server_error(start_stub, sleeps):
+    url = start_stub(total=60, fail_page=1)
+    tweets = sns_x_crawler.collect_tweets('데이식스', max_results=40, base_url=url)
+    assert [tweet['id'] for tweet in tweets] == expected_ids(60, 40)
+    assert sleeps == [2]
+
+
+class Interrupted(Exception):
+    pass
+
+
+@pytest.mark.parametrize('interrupt_after_write', [False, True])
+def test_resumes_from_checkpoint(start_stub, sleeps, monkeypatch, tmp_path, capsys, interrupt_after_write):
+    url = start_stub(total=200)
+    output = str(tmp_path / 'tweets.jsonl')
+    checkpoint = str(tmp_path / 'checkpoint.json')
+
+    # 세 번째 페이지를 저장하는 중(전/후)에 중단
+    write_jsonl = sns_x_crawler.data_store.write_jsonl
+    calls = []
+
+    def interrupting_write(path, records, append=False):
+        calls.append(len(records))
+        if len(calls) == 3 and not interrupt_after_write:
+            raise Interrupted()
+        count = write_jsonl(path, records, append)
+        if len(calls) == 3:
+            raise Interrupted()
+        return count
+
+    monkeypatch.setattr(sns_x_crawler.data_store, 'write_jsonl', interrupting_write)
+    with pytest.raises(Interrupted):
+        sns_x_crawler.collect_tweets_to_file('데이식스', output, max_results=100, base_url=url,
+                                             checkpoint_file=checkpoint)
+    with open(checkpoint, encoding='utf-8') as f:
+        assert json.load(f)['pages'] == 2
+    capsys.readouterr()
+
+    monkeypatch.setattr(sns_x_crawler.data_store, 'write_jsonl', write_jsonl)
+    sns_x_crawler.collect_tweets_to_file('데이식스', output, max_results=100, base_url=url,
+                                         checkpoint_file=checkpoint)
+
+    # 처음부터가 아니라 세 번째 페이지(40번째 트윗)부터 다시 요청하고, 이미 쓴 트윗은 다시 쓰지 않음
+    assert '이전 수집 이어서 진행 (2페이지, 32개 수집됨)' in capsys.readouterr().out
+    assert read_ids(output) == expected_ids(200, 100)
+    assert not (tmp_path / 'checkpoint.json').exists()
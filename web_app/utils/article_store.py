@@ -0,0 +1,136 @@
+# -*- coding: utf-8 -*-
+"""
+기사 본문 저장소 모듈
+
+URL별로 추출한 본문, 원문 해시, ETag, Last-Modified 를 저장합니다.
+- REVALIDATE_AFTER 이내에 다시 요청되면 네트워크 없이 저장본 사용
+- 그 이후에는 조건부 GET (304면 파싱 생략, 원문 해시가 같아도 파싱 생략)
+- 저장 개수가 MAX_ENTRIES 를 넘으면 가장 오래 사용되지 않은 기사부터 삭제
+"""
+import glob
+import hashlib
+import json
+import os
+import threading
+import time
+
+from utils import cache_store
+
+STORE_DIR = cache_store.data_path('article_store')
+
+MAX_ENTRIES = 1000
+
+# 이 시간(초) 안에 검증된 기사는 재검증 없이 사용
+REVALIDATE_AFTER = 600
+
+_lock = threading.Lock()
+_entry_count = None
+
+
+def _entry_path(url):
+    key = hashlib.sha256(url.encode('utf-8')).hexdigest()
+    return os.path.join(STORE_DIR, key[:2], f"{key}.json")
+
+
+def content_hash(raw):
+    """원문(bytes) 해시"""
+    return hashlib.sha256(raw).hexdigest()
+
+
+def get(url):
+    """저장된 기사 (없으면 None), 조회시 사용 시각 갱신"""
+    path = _entry_path(url)
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            entry = json.load(f)
+        os.utime(path)  # 파일 수정 시각을 LRU 기준으로 사용
+        return entry
+    except (OSError, ValueError):
+        return None
+
+
+def is_fresh(entry):
+    """재검증 없이 사용해도 되는지"""
+    return bool(entry) and time.time() - entry.get('validated_at', 0) < REVALIDATE_AFTER
+
+
+def conditional_headers(entry):
+    """조건부 GET 헤더 (If-None-Match / If-Modified-Since)"""
+    headers = {}
+    if entry:
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+    return headers
+
+
+def _write(path, entry):
+    cache_store.atomic_write_json(path, entry)
+
+
+def put(url, text, raw_hash=None, etag=None, last_modified=None):
+    """기사 저장 (추출 본문 + 검증 정보)"""
+    global _entry_count
+
+    path = _entry_path(url)
+    now = time.time()
+    entry = {
+        'url': url,
+        'text': text,
+        'text_hash': hashlib.sha256(text.encode('utf-8')).hexdigest() if text else None,
+        'content_hash': raw_hash,
+        'etag': etag,
+        'last_modified': last_modified,
+        'fetched_at': now,
+        'validated_at': now
+    }
+
+    try:
+        with _lock:
+            is_new = not os.path.exists(path)
+            _write(path, entry)
+            if _entry_count is not None and is_new:
+                _entry_count += 1
+            _evict_if_needed()
+    except OSError as e:
+        print(f"기사 저장 실패: {e}")
+
+
+def mark_validated(url, entry):
+    """304 등으로 변경 없음이 확인된 기사의 검증 시각 갱신"""
+    entry = {**entry, 'validated_at': time.time()}
+    try:
+        with _lock:
+            _write(_entry_path(url), entry)
+    except OSError as e:
+        print(f"기사 검증 시각 저장 실패: {e}")
+    return entry
+
+
+def _evict_if_needed():
+    """최대 개수 초과시 오래 사용되지 않은 기사부터 삭제 (_lock 보유 상태에서 호출)"""
+    global _entry_count
+
+    if _entry_count is None:
+        _entry_count = len(glob.glob(os.path.join(STORE_DIR, '*', '*.json')))
+
+    if _entry_count <= MAX_ENTRIES:
+        return
+
+    files = glob.glob(os.path.join(STORE_DIR, '*', '*.json'))
+    files.sort(key=lambda f: os.path.getmtime(f))
+
+    for path in files[:len(files) - MAX_ENTRIES]:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    _entry_count = min(len(files), MAX_ENTRIES)
+    print(f"기사 저장소 정리: {len(files) - _entry_count}개 삭제")
+
+
+def get_stats():
+    """저장된 기사 수"""
+    return {'entries': len(glob.glob(os.path.join(STORE_DIR, '*', '*.json'))), 'max_entries': MAX_ENTRIES}
@@ -0,0 +1,207 @@
+# -*- coding: utf-8 -*-
+"""
+분석 결과 캐시 저장소 모듈
+
+뉴스/SNS/재무 분석기가 공통으로 사용하는 TTL 캐시입니다.
+- 위치: <데이터 루트>/cache/<이름>.json (데이터 루트는 MIRAE_DATA_ROOT 환경변수로 변경 가능)
+- 형식: {"timestamp": ISO 시각, "data": 결과}
+- 만료: 경과 시간 전체(total_seconds) 기준
+- 쓰기: 임시 파일에 쓴 뒤 교체 + 디렉토리 잠금 파일 하나 (여러 세션이 동시에 써도 파일이 깨지지 않음)
+- 크기: MAX_ENTRIES / MAX_TOTAL_BYTES 초과시 오래된 항목부터 삭제
+"""
+import glob
+import json
+import os
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+DATA_ROOT = os.getenv('MIRAE_DATA_ROOT') or os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data'
+)
+CACHE_DIR = os.path.join(DATA_ROOT, 'cache')
+
+MAX_ENTRIES = 256
+MAX_TOTAL_BYTES = 50 * 1024 * 1024
+
+_lock = threading.Lock()
+_stats = {'hits': 0, 'stale_hits': 0, 'misses': 0, 'expired': 0, 'writes': 0, 'evictions': 0}
+
+
+def data_path(*parts):
+    """데이터 루트 기준 경로 (실행 위치와 무관)"""
+    return os.path.join(DATA_ROOT, *parts)
+
+
+def entry_path(name):
+    """캐시 항목 파일 경로"""
+    return os.path.join(CACHE_DIR, f"{name}.json")
+
+
+@contextmanager
+def file_lock(path):
+    """프로세스 간 배타적 파일 잠금
+
+    path 가 있는 디렉토리의 .lock 파일 하나를 사용합니다 (항목마다 잠금 파일을 만들면
+    항목이 삭제된 뒤에도 잠금 파일이 계속 쌓임. 쓰기는 짧아서 디렉토리 단위로 잠가도 충분).
+    """
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    with open(os.path.join(directory, '.lock'), 'a+') as lock_file:
+        if fcntl:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+        else:
+            lock_file.seek(0)
+            msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+            else:
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def atomic_write_json(path, payload, indent=None):
+    """임시 파일에 쓴 뒤 교체 (중간에 끊겨도 기존 파일 유지)"""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temp_file = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(temp_file, 'w', encoding='utf-8') as f:
+            json.dump(payload, f, ensure_ascii=False, indent=indent)
+        os.replace(temp_file, path)
+    finally:
+        if os.path.exists(temp_file):
+            os.remove(temp_file)
+
+
+def _count(name):
+    with _lock:
+        _stats[name] += 1
+
+
+def read_entry(name):
+    """저장된 항목 {"timestamp", "data"} (없거나 깨졌으면 None)"""
+    try:
+        with open(entry_path(name), 'r', encoding='utf-8') as f:
+            entry = json.load(f)
+        datetime.fromisoformat(entry['timestamp'])
+        return entry
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+
+def entry_age(entry):
+    """항목 경과 시간 (초)"""
+    return (datetime.now() - datetime.fromisoformat(entry['timestamp'])).total_seconds()
+
+
+def get(name, ttl):
+    """캐시 조회 (ttl 초 이내 항목만, ttl=None 이면 만료 무시). 없으면 None"""
+    entry = read_entry(name)
+
+    if entry is None:
+        _count('misses')
+        return None
+
+    if ttl is not None and entry_age(entry) >= ttl:
+        _count('expired')
+        return None
+
+    _count('hits')
+    return entry['data']
+
+
+def get_with_age(name, ttl):
+    """만료 여부와 관계없이 조회 (데이터, 경과 초, 유효 여부). 없으면 (None, None, False)"""
+    entry = read_entry(name)
+
+    if entry is None:
+        _count('misses')
+        return None, None, False
+
+    age = entry_age(entry)
+    fresh = ttl is None or age < ttl
+    _count('hits' if fresh else 'stale_hits')
+    return entry['data'], age, fresh
+
+
+def put(name, data):
+    """캐시 저장 (잠금 + 원자적 쓰기)"""
+    path = entry_path(name)
+    entry = {'timestamp': datetime.now().isoformat(), 'data': data}
+
+    try:
+        with file_lock(path):
+            atomic_write_json(path, entry, indent=2)
+        _count('writes')
+        _evict_if_needed()
+    except (OSError, TypeError, ValueError) as e:
+        print(f"캐시 저장 실패 ({name}): {e}")
+
+
+def delete(name):
+    """캐시 항목 삭제"""
+    path = entry_path(name)
+    try:
+        with file_lock(path):
+            if os.path.exists(path):
+                os.remove(path)
+    except OSError as e:
+        print(f"캐시 삭제 실패 ({name}): {e}")
+
+
+def list_entries(prefix=''):
+    """저장된 항목 이름 목록"""
+    files = glob.glob(os.path.join(CACHE_DIR, f"{glob.escape(prefix)}*.json"))
+    return sorted(os.path.basename(f)[:-len('.json')] for f in files)
+
+
+def _evict_if_needed():
+    """개수/용량 초과시 오래된 항목부터 삭제"""
+    files = glob.glob(os.path.join(CACHE_DIR, '*.json'))
+    sizes = {}
+    for path in files:
+        try:
+            sizes[path] = os.path.getsize(path)
+        except OSError:
+            continue
+
+    total_bytes = sum(sizes.values())
+    if len(sizes) <= MAX_ENTRIES and total_bytes <= MAX_TOTAL_BYTES:
+        return
+
+    removed = 0
+    remaining = len(sizes)
+    for path in sorted(sizes, key=lambda p: os.path.getmtime(p) if os.path.exists(p) else 0):
+        if remaining <= MAX_ENTRIES and total_bytes <= MAX_TOTAL_BYTES:
+            break
+        try:
+            os.remove(path)
+        except OSError:
+            continue
+        remaining -= 1
+        total_bytes -= sizes[path]
+        removed += 1
+
+    with _lock:
+        _stats['evictions'] += removed
+    print(f"캐시 정리: {removed}개 삭제")
+
+
+def get_stats():
+    """캐시 적중 통계"""
+    with _lock:
+        stats = dict(_stats)
+
+    lookups = stats['hits'] + stats['stale_hits'] + stats['misses'] + stats['expired']
+    stats['hit_rate'] = stats['hits'] / lookups if lookups else None
+    stats['entries'] = len(list_entries())
+    return stats
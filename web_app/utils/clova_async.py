@@ -0,0 +1,184 @@
+# -*- coding: utf-8 -*-
+"""
+HyperCLOVA X 비동기 클라이언트 모듈
+
+모든 Streamlit 세션이 하나의 백그라운드 이벤트 루프와 aiohttp 세션을 공유합니다.
+"""
+import asyncio
+import atexit
+import threading
+
+import aiohttp
+
+from utils import llm_cache
+from utils.clova_client import (
+    CLOVA_API_URL, CLOVA_MODEL, build_headers, extract_final_content, get_api_key,
+    get_auth_scheme, parse_sse_line, remember_scheme, scheme_order
+)
+
+DEFAULT_CONCURRENCY = 8
+
+_loop = None
+_loop_lock = threading.Lock()
+_http_session = None
+
+
+def get_event_loop():
+    """프로세스 공용 백그라운드 이벤트 루프 (최초 호출시 시작)"""
+    global _loop
+
+    if _loop is None:
+        with _loop_lock:
+            if _loop is None:
+                loop = asyncio.new_event_loop()
+                thread = threading.Thread(
+                    target=loop.run_forever, name='clova-event-loop', daemon=True
+                )
+                thread.start()
+                _loop = loop
+                atexit.register(_shutdown)
+
+    return _loop
+
+
+def run_coroutine(coro, timeout=None):
+    """공용 루프에서 코루틴을 실행하고 결과를 기다림 (어느 스레드에서든 호출 가능)"""
+    future = asyncio.run_coroutine_threadsafe(coro, get_event_loop())
+    return future.result(timeout)
+
+
+async def _get_http_session():
+    """공용 루프에 묶인 aiohttp 세션 (keep-alive 커넥션 풀)"""
+    global _http_session
+
+    if _http_session is None or _http_session.closed:
+        connector = aiohttp.TCPConnector(limit=64, limit_per_host=32)
+        _http_session = aiohttp.ClientSession(connector=connector)
+
+    return _http_session
+
+
+async def _close_http_session():
+    if _http_session is not None and not _http_session.closed:
+        await _http_session.close()
+
+
+def _shutdown():
+    """프로세스 종료시 aiohttp 세션 정리"""
+    try:
+        run_coroutine(_close_http_session(), timeout=5)
+    except Exception:
+        pass
+
+
+async def achat(messages, params, api_key=None, timeout=30, prompt_version=None):
+    """HyperCLOVA X 비동기 채팅 호출 (최종 응답 텍스트 반환, 실패시 None)
+
+    prompt_version 을 지정하면 LLM 응답 캐시를 사용합니다.
+    """
+    api_key = api_key or get_api_key()
+    if not api_key:
+        return None
+
+    cache_key = None
+    if prompt_version:
+        cache_key = llm_cache.make_key(CLOVA_MODEL, messages, params, prompt_version)
+        cached = llm_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+    content = await _arequest_chat(messages, params, api_key, timeout)
+
+    if cache_key and content:
+        llm_cache.put(cache_key, content, prompt_version)
+
+    return content
+
+
+async def _iter_sse_lines(stream, chunk_size=64 * 1024):
+    """응답 스트림을 줄 단위로 반환
+
+    aiohttp 의 줄 단위 읽기(async for line in r.content)는 64KB 를 넘는 한 줄에서 예외를 내고
+    그 예외가 achat_many 의 gather 전체를 끝내므로, 조각으로 읽어 직접 나눕니다.
+    """
+    buffer = b''
+    async for chunk in stream.iter_chunked(chunk_size):
+        buffer += chunk
+        *lines, buffer = buffer.split(b'\n')
+        for line in lines:
+            yield line
+    if buffer:
+        yield buffer
+
+
+async def _arequest_chat(messages, params, api_key, timeout):
+    """실제 HTTP 요청 (인증 방식 자동 선택)"""
+    request_data = {'messages': messages, **params}
+    session = await _get_http_session()
+
+    for scheme in scheme_order():
+        try:
+            async with session.post(
+                    CLOVA_API_URL,
+                    headers=build_headers(api_key, scheme),
+                    json=request_data,
+                    timeout=aiohttp.ClientTimeout(total=timeout)
+            ) as r:
+
+                if r.status in (401, 403):
+                    print(f"CLOVA 인증 실패 ({scheme}): {r.status}")
+                    continue
+                elif r.status != 200:
+                    print(f"CLOVA HTTP 오류: {r.status}")
+                    return None
+
+                remember_scheme(scheme)
+
+                async for line in _iter_sse_lines(r.content):
+                    content = extract_final_content(parse_sse_line(line.strip()))
+                    if content:
+                        return content
+
+                print("CLOVA 응답에 완료 신호 없음")
+                return None
+
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            print(f"CLOVA 비동기 호출 실패: {e!r}")
+            return None
+
+    return None
+
+
+async def achat_many(requests_list, concurrency=DEFAULT_CONCURRENCY, api_key=None, timeout=30,
+                     prompt_version=None):
+    """(messages, params) 목록을 동시성 제한 하에 병렬 호출 (입력 순서대로 결과 반환)"""
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def _limited(messages, params):
+        async with semaphore:
+            return await achat(messages, params, api_key=api_key, timeout=timeout,
+                               prompt_version=prompt_version)
+
+    results = []
+    pending = list(requests_list)
+
+    # 인증 방식을 아직 모르면 첫 요청으로 먼저 확인 (401 재시도가 N배로 늘지 않도록)
+    if get_auth_scheme() is None and pending:
+        results.append(await _limited(*pending.pop(0)))
+
+    results.extend(await asyncio.gather(
+        *(_limited(messages, params) for messages, params in pending)
+    ))
+    return results
+
+
+def chat_many(requests_list, concurrency=DEFAULT_CONCURRENCY, api_key=None, timeout=30,
+              prompt_version=None):
+    """achat_many의 동기 래퍼 (Streamlit 스크립트 스레드에서 호출)"""
+    if not requests_list:
+        return []
+
+    return run_coroutine(
+        achat_many(requests_list, concurrency=concurrency, api_key=api_key, timeout=timeout,
+                   prompt_version=prompt_version)
+    )
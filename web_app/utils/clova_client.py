@@ -0,0 +1,239 @@
+# -*- coding: utf-8 -*-
+"""
+HyperCLOVA X 공용 클라이언트 모듈
+"""
+import json
+import os
+import threading
+import uuid
+
+import requests
+from requests.adapters import HTTPAdapter
+from dotenv import load_dotenv
+
+from utils import llm_cache
+
+load_dotenv()
+
+CLOVA_MODEL = 'HCX-005'
+CLOVA_API_URL = f'https://clovastudio.stream.ntruss.com/v3/chat-completions/{CLOVA_MODEL}'
+
+# 인증 헤더 형식 (기본 / Bearer)
+AUTH_SCHEMES = ['raw', 'bearer']
+
+_session = None
+_session_lock = threading.Lock()
+
+# 프로세스 내에서 성공한 인증 방식 기억
+_auth_scheme = None
+_auth_lock = threading.Lock()
+
+
+def get_api_key():
+    """API 키 획득 (환경변수 또는 Streamlit secrets)"""
+    api_key = os.getenv('CLOVA_API_KEY')
+
+    # Streamlit secrets 확인 (조용히)
+    try:
+        import streamlit as st
+        if hasattr(st, 'secrets') and hasattr(st.secrets, 'get'):
+            secrets_key = st.secrets.get('CLOVA_API_KEY')
+            if secrets_key and not api_key:
+                api_key = secrets_key
+    except:
+        pass  # 에러 메시지 출력하지 않음
+
+    return api_key
+
+
+def get_session():
+    """keep-alive 커넥션 풀을 가진 공용 세션"""
+    global _session
+
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=4, pool_maxsize=32)
+                session.mount('https://', adapter)
+                session.mount('http://', adapter)
+                _session = session
+
+    return _session
+
+
+def get_auth_scheme():
+    """현재 프로세스에서 사용 중인 인증 방식"""
+    return _auth_scheme
+
+
+def build_headers(api_key, scheme):
+    """인증 방식별 요청 헤더 생성"""
+    return {
+        'Authorization': f'Bearer {api_key}' if scheme == 'bearer' else api_key,
+        'X-NCP-CLOVASTUDIO-REQUEST-ID': str(uuid.uuid4()).replace('-', ''),
+        'Content-Type': 'application/json; charset=utf-8',
+        'Accept': 'text/event-stream'
+    }
+
+
+def scheme_order():
+    """기억된 인증 방식을 먼저 시도하는 순서"""
+    if _auth_scheme is None:
+        return list(AUTH_SCHEMES)
+    return [_auth_scheme] + [s for s in AUTH_SCHEMES if s != _auth_scheme]
+
+
+def remember_scheme(scheme):
+    """성공한 인증 방식을 프로세스 전체에 기억"""
+    global _auth_scheme
+
+    with _auth_lock:
+        if _auth_scheme != scheme:
+            print(f"CLOVA 인증 방식 설정: {scheme}")
+            _auth_scheme = scheme
+
+
+def parse_sse_line(line):
+    """SSE 한 줄을 파싱해 data 이벤트의 JSON을 반환"""
+    if not line:
+        return None
+
+    if isinstance(line, bytes):
+        line = line.decode('utf-8')
+
+    if not line.startswith('data:'):
+        return None
+
+    try:
+        return json.loads(line[5:])
+    except json.JSONDecodeError:
+        return None
+
+
+def extract_final_content(data):
+    """완료(stop) 이벤트이면 최종 응답 텍스트 반환"""
+    if not data or not isinstance(data, dict):
+        return None
+
+    message = data.get('message') or {}
+    if message.get('content') and data.get('finishReason') == 'stop':
+        return message['content']
+
+    return None
+
+
+def chat(messages, params, api_key=None, timeout=30, prompt_version=None):
+    """HyperCLOVA X 채팅 호출 (최종 응답 텍스트 반환, 실패시 None)
+
+    prompt_version 을 지정하면 LLM 응답 캐시를 사용합니다.
+    """
+    api_key = api_key or get_api_key()
+    if not api_key:
+        return None
+
+    cache_key = None
+    if prompt_version:
+        cache_key = llm_cache.make_key(CLOVA_MODEL, messages, params, prompt_version)
+        cached = llm_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+    content = None
+    for data in _iter_chat_events(messages, params, api_key, timeout):
+        content = extract_final_content(data)
+        if content:
+            break
+
+    if cache_key and content:
+        llm_cache.put(cache_key, content, prompt_version)
+
+    return content
+
+
+def chat_stream(messages, params, api_key=None, timeout=30, prompt_version=None, completion=None):
+    """HyperCLOVA X 스트리밍 호출 (생성되는 텍스트 조각을 순서대로 yield)
+
+    스트림이 끝까지 완료되면 최종 응답을 LLM 캐시에 저장합니다.
+    캐시 적중시 저장된 응답 전체를 한 번에 yield 합니다.
+    completion dict 를 넘기면 완료(stop) 신호를 받았을 때 completion['completed'] = True 로 표시합니다
+    (HTTP 오류나 중간에 끊긴 스트림은 False 로 남으므로 호출자는 부분 응답을 저장하면 안 됩니다).
+    """
+    completion = {} if completion is None else completion
+    completion['completed'] = False
+
+    api_key = api_key or get_api_key()
+    if not api_key:
+        return
+
+    cache_key = None
+    if prompt_version:
+        cache_key = llm_cache.make_key(CLOVA_MODEL, messages, params, prompt_version)
+        cached = llm_cache.get(cache_key)
+        if cached is not None:
+            completion['completed'] = True
+            yield cached
+            return
+
+    streamed = []
+    for data in _iter_chat_events(messages, params, api_key, timeout):
+        final_content = extract_final_content(data)
+        if final_content:
+            completion['completed'] = True
+            if cache_key:
+                llm_cache.put(cache_key, final_content, prompt_version)
+            # 토큰 이벤트 없이 최종 결과만 온 경우
+            if not streamed:
+                yield final_content
+            return
+
+        delta = extract_delta_content(data)
+        if delta:
+            streamed.append(delta)
+            yield delta
+
+    print("CLOVA 스트림에 완료 신호 없음")
+
+
+def extract_delta_content(data):
+    """토큰 이벤트의 부분 텍스트 (완료 이벤트는 제외)"""
+    if not data or not isinstance(data, dict) or data.get('finishReason'):
+        return None
+
+    return (data.get('message') or {}).get('content')
+
+
+def _iter_chat_events(messages, params, api_key, timeout):
+    """실제 HTTP 요청 후 SSE data 이벤트를 순서대로 yield (인증 방식 자동 선택)"""
+    request_data = {'messages': messages, **params}
+    session = get_session()
+
+    for scheme in scheme_order():
+        try:
+            with session.post(
+                    CLOVA_API_URL,
+                    headers=build_headers(api_key, scheme),
+                    json=request_data,
+                    stream=True,
+                    timeout=timeout
+            ) as r:
+
+                if r.status_code in (401, 403):
+                    print(f"CLOVA 인증 실패 ({scheme}): {r.status_code}")
+                    continue
+                elif r.status_code != 200:
+                    # 인증 문제가 아니므로 다른 헤더로 재시도하지 않음
+                    print(f"CLOVA HTTP 오류: {r.status_code}")
+                    return
+
+                remember_scheme(scheme)
+
+                for line in r.iter_lines():
+                    data = parse_sse_line(line)
+                    if data is not None:
+                        yield data
+                return
+
+        except requests.exceptions.RequestException as e:
+            print(f"CLOVA 호출 실패: {e}")
+            return
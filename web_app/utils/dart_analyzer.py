@@ -1,16 +1,48 @@
 # -*- coding: utf-8 -*-
 """
 DART 공시자료 분석 모듈 (디버깅 버전)
+
+이슈의 관련 종목(stock_code / corp_code)별로 재무 데이터를 찾아 AI 인사이트를 만들고 종목별로 캐시합니다.
+재무 데이터는 DART 단일회사 주요계정 API(DART_API_KEY, corp_code 필요) → data/financials/{종목코드}.json
+→ 내장 데이터 순으로 찾고, 관련 종목이 없거나 데이터가 없으면 재무 데이터 없음 결과를 반환합니다.
 """
 import json
-import requests
-import uuid
 from datetime import datetime
 import os
+import requests
 from dotenv import load_dotenv
+from utils.clova_client import chat, get_auth_scheme
+from utils import cache_store, issue_catalog
 
 load_dotenv()
 
+# 재무 인사이트 프롬프트 템플릿 버전 (프롬프트 수정시 올려서 LLM 캐시 무효화)
+INSIGHT_PROMPT_VERSION = 'jyp-insight-v1'
+
+# 재무 인사이트 캐시 (종목별, 재무제표는 분기 단위로 바뀌므로 길게 유지)
+FINANCIAL_CACHE_PREFIX = 'financial_'
+FINANCIAL_CACHE_TTL = 7 * 24 * 3600
+
+# DART 단일회사 주요계정 API (사업보고서 기준)
+DART_API_URL = 'https://opendart.fss.or.kr/api/fnlttSinglAcnt.json'
+DART_REPORT_CODE = '11011'
+
+# 수집해 둔 종목별 재무 데이터 (data/financials/{종목코드}.json)
+FINANCIAL_DATA_DIR = cache_store.data_path('financials')
+
+# 내장 재무 데이터 (DART/파일이 없을 때, 단위: 억원/%)
+BUILTIN_FINANCIAL_DATA = {
+    '035900': {
+        "매출액_억원": 1245.3,
+        "영업이익_억원": 187.2,
+        "ROE": 15.2,
+        "영업이익률": 15.0
+    }
+}
+
+# 저장소에 포함된 기본 분석 결과 (캐시 저장소에 항목이 없을 때 옮겨 와서 사용, API 실패시 대체)
+SEED_FINANCIAL_FILE = 'jyp_financial_cache.json'
+
 
 def debug_api_connection():
     """API 연결 상태 디버깅"""
@@ -30,21 +62,107 @@ def debug_api_connection():
     return True
 
 
-def generate_jyp_ai_insight():
-    """JYP 공시자료 AI 인사이트 생성 (디버깅 버전)"""
+def financial_cache_name(stock_code):
+    """종목별 재무 인사이트 캐시 이름"""
+    return f"{FINANCIAL_CACHE_PREFIX}{stock_code}"
 
-    # API 연결 상태 먼저 체크
-    if not debug_api_connection():
+
+def _parse_amount(value):
+    """DART 금액 문자열('1,234') → 숫자 (없으면 None)"""
+    try:
+        return float(str(value).replace(',', ''))
+    except (TypeError, ValueError):
         return None
 
-    # JYP 재무 데이터
-    jyp_financial_data = {
-        "매출액_억원": 1245.3,
-        "영업이익_억원": 187.2,
-        "ROE": 15.2,
-        "영업이익률": 15.0
+
+def fetch_dart_financials(corp_code, year=None, api_key=None):
+    """DART 주요계정으로 재무지표 계산 (연결재무제표 우선, 실패시 None)"""
+    api_key = api_key or os.getenv('DART_API_KEY')
+    if not api_key or not corp_code:
+        return None
+
+    year = year or datetime.now().year - 1
+    params = {'crtfc_key': api_key, 'corp_code': corp_code, 'bsns_year': str(year), 'reprt_code': DART_REPORT_CODE}
+
+    try:
+        response = requests.get(DART_API_URL, params=params, timeout=10)
+        data = response.json()
+    except (requests.exceptions.RequestException, ValueError) as e:
+        print(f"DART 조회 실패: {e}")
+        return None
+
+    if data.get('status') != '000':
+        print(f"DART 조회 실패: {data.get('status')} {data.get('message')}")
+        return None
+
+    accounts = {}
+    for fs_div in ('OFS', 'CFS'):  # 연결(CFS)이 있으면 덮어씀
+        for row in data.get('list', []):
+            if row.get('fs_div') == fs_div:
+                accounts[row.get('account_nm')] = _parse_amount(row.get('thstrm_amount'))
+
+    revenue, operating_profit = accounts.get('매출액'), accounts.get('영업이익')
+    net_income, equity = accounts.get('당기순이익'), accounts.get('자본총계')
+    if not revenue or operating_profit is None:
+        return None
+
+    return {
+        "매출액_억원": round(revenue / 1e8, 1),
+        "영업이익_억원": round(operating_profit / 1e8, 1),
+        "ROE": round(net_income / equity * 100, 1) if net_income is not None and equity else 0,
+        "영업이익률": round(operating_profit / revenue * 100, 1)
     }
 
+
+def load_financial_file(stock_code):
+    """수집해 둔 종목 재무 데이터 파일 (없으면 None)"""
+    try:
+        with open(os.path.join(FINANCIAL_DATA_DIR, f"{stock_code}.json"), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        print(f"⚠️ 재무 데이터 파일 읽기 실패 ({stock_code}): {e}")
+        return None
+
+
+def get_company_financials(company):
+    """종목 재무지표 (DART → 데이터 파일 → 내장 데이터, 모두 없으면 None)"""
+    return (fetch_dart_financials(company.get('corp_code'))
+            or load_financial_file(company['stock_code'])
+            or BUILTIN_FINANCIAL_DATA.get(company['stock_code']))
+
+
+def issue_company(issue=None):
+    """이슈의 관련 종목 정보 (stock_code 가 없으면 None)"""
+    issue = issue_catalog.resolve_issue(issue)
+    if not issue.get('stock_code'):
+        return None
+
+    return {
+        'stock_code': issue['stock_code'],
+        'corp_code': issue.get('corp_code'),
+        'stock_name': issue.get('stock_name') or issue.get('stock_symbol') or issue['stock_code']
+    }
+
+
+def build_no_financial_result(company=None):
+    """재무 데이터 없음 결과 (캐시하지 않음)"""
+    if company is None:
+        message = "이 이슈에는 관련 상장사가 없어 재무 데이터가 없습니다."
+    else:
+        message = f"{company['stock_name']}({company['stock_code']})의 재무 데이터가 없습니다."
+
+    return {'success': False, 'no_data': True, 'message': message}
+
+
+def generate_ai_insight(company, financial_data):
+    """종목 공시자료 AI 인사이트 생성 (디버깅 버전)"""
+
+    # API 연결 상태 먼저 체크
+    if not debug_api_connection():
+        return None
+
     api_key = os.getenv('CLOVA_API_KEY')
 
     system_prompt = """당신은 엔터테인먼트 투자 전문가입니다.
@@ -58,40 +176,21 @@ def generate_jyp_ai_insight():
 간결하고 전문적으로 작성해주세요."""
 
     user_content = f"""
-JYP엔터테인먼트 재무현황:
-- 매출액: {jyp_financial_data['매출액_억원']}억원
-- 영업이익: {jyp_financial_data['영업이익_억원']}억원
-- ROE: {jyp_financial_data['ROE']}%
-- 영업이익률: {jyp_financial_data['영업이익률']}%
+{company['stock_name']} 재무현황:
+- 매출액: {financial_data['매출액_억원']}억원
+- 영업이익: {financial_data['영업이익_억원']}억원
+- ROE: {financial_data['ROE']}%
+- 영업이익률: {financial_data['영업이익률']}%
 
 위 정보로 투자 분석을 해주세요.
 """
 
-    request_id = str(uuid.uuid4()).replace('-', '')
-
-    # 다양한 헤더 형식 시도
-    headers_options = [
-        {
-            'Authorization': f'Bearer {api_key}',
-            'X-NCP-CLOVASTUDIO-REQUEST-ID': request_id,
-            'Content-Type': 'application/json; charset=utf-8',
-            'Accept': 'text/event-stream'
-        },
-        {
-            'Authorization': api_key,
-            'X-NCP-CLOVASTUDIO-REQUEST-ID': request_id,
-            'Content-Type': 'application/json; charset=utf-8',
-            'Accept': 'text/event-stream'
-        }
-    ]
-
     messages = [
         {"role": "system", "content": system_prompt},
         {"role": "user", "content": user_content}
     ]
 
-    request_data = {
-        'messages': messages,
+    params = {
         'topP': 0.8,
         'topK': 0,
         'maxTokens': 500,
@@ -102,122 +201,129 @@ JYP엔터테인먼트 재무현황:
         'seed': 0
     }
 
-    # 두 가지 헤더 형식으로 시도
-    for i, headers in enumerate(headers_options, 1):
-        try:
-            print(f"\n🤖 시도 {i}: {'Bearer' if 'Bearer' in headers['Authorization'] else '기본'} 인증 방식")
-
-            with requests.post('https://clovastudio.stream.ntruss.com/v3/chat-completions/HCX-005',
-                               headers=headers, json=request_data, stream=True, timeout=30) as response:
-
-                print(f"   응답 상태: {response.status_code}")
-
-                if response.status_code == 401:
-                    print("   ❌ 인증 실패 (401)")
-                    continue
-                elif response.status_code == 403:
-                    print("   ❌ 권한 없음 (403)")
-                    continue
-                elif response.status_code != 200:
-                    print(f"   ❌ HTTP 오류: {response.status_code}")
-                    print(f"   응답 내용: {response.text[:200]}")
-                    continue
-
-                print("   ✅ 연결 성공, 응답 대기 중...")
-
-                response_count = 0
-                for line in response.iter_lines():
-                    if line:
-                        response_count += 1
-                        line_text = line.decode("utf-8")
-
-                        if response_count <= 3:  # 처음 3개 라인 로그
-                            print(f"   응답 라인 {response_count}: {line_text[:100]}")
-
-                        if line_text.startswith('data:'):
-                            try:
-                                data = json.loads(line_text[5:])
-                                if 'message' in data and data['message'].get('content'):
-                                    if data.get('finishReason') == 'stop':
-                                        ai_insight = data['message']['content']
-                                        print("   ✅ AI 인사이트 생성 완료!")
-
-                                        return {
-                                            'success': True,
-                                            'financial_data': jyp_financial_data,
-                                            'ai_insight': ai_insight,
-                                            'analysis_date': datetime.now().strftime('%Y-%m-%d'),
-                                            'auth_method': f"시도 {i}"
-                                        }
-                            except json.JSONDecodeError as e:
-                                print(f"   JSON 파싱 오류: {e}")
-                                continue
-
-                print(f"   ⚠️ {response_count}개 응답 라인 처리했지만 완료 신호 없음")
-
-        except requests.exceptions.Timeout:
-            print(f"   ❌ 시도 {i} 타임아웃")
-        except requests.exceptions.ConnectionError:
-            print(f"   ❌ 시도 {i} 연결 오류")
-        except Exception as e:
-            print(f"   ❌ 시도 {i} 기타 오류: {e}")
-
-    print("\n❌ 모든 시도 실패")
+    print("\n🤖 AI 인사이트 생성 요청 중...")
+    ai_insight = chat(messages, params, api_key=api_key, timeout=30,
+                      prompt_version=INSIGHT_PROMPT_VERSION)
+
+    if ai_insight:
+        print("   ✅ AI 인사이트 생성 완료!")
+        return {
+            'success': True,
+            'stock_code': company['stock_code'],
+            'stock_name': company['stock_name'],
+            'financial_data': financial_data,
+            'ai_insight': ai_insight,
+            'analysis_date': datetime.now().strftime('%Y-%m-%d'),
+            'auth_method': get_auth_scheme()
+        }
+
+    print("\n❌ AI 인사이트 생성 실패")
     return None
 
 
-def get_jyp_financial_insight():
-    """JYP 재무 인사이트 조회 (디버깅 버전)"""
+def build_fallback_financial_result(company, financial_data):
+    """API 실패시 재무지표와 기본 문구"""
+    if company['stock_code'] == '035900':
+        ai_insight = """**재무현황 요약**: JYP엔터테인먼트는 안정적인 매출 구조와 양호한 수익성을 보이고 있습니다. **주요 강점**: 글로벌 아티스트 포트폴리오를 통한 다각화된 수익원을 확보하고 있습니다. **주요 리스크**: 엔터테인먼트 산업 특성상 아티스트 이슈에 따른 변동성이 존재합니다. **투자관점**: 전반적으로 안정적이나 단기 이슈에 대한 신중한 접근이 필요합니다."""
+    else:
+        ai_insight = f"""**재무현황 요약**: {company['stock_name']}의 영업이익률은 {financial_data['영업이익률']}%, ROE는 {financial_data['ROE']}%입니다. AI 분석을 생성하지 못해 주요 지표만 표시합니다."""
+
+    return {
+        'success': True,
+        'stock_code': company['stock_code'],
+        'stock_name': company['stock_name'],
+        'financial_data': financial_data,
+        'ai_insight': ai_insight,
+        'analysis_date': datetime.now().strftime('%Y-%m-%d'),
+        'source': 'fallback_data'
+    }
+
+
+def load_seed_financial_insight():
+    """저장소에 포함된 기본 재무 분석 파일 (data/jyp_financial_cache.json, 없으면 None)"""
+    try:
+        with open(cache_store.data_path(SEED_FINANCIAL_FILE), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"⚠️ 기본 재무 분석 파일 읽기 실패: {e}")
+        return None
+
+
+def migrate_seed_financial_insight(company):
+    """기본 분석 파일을 캐시 저장소로 옮김 (같은 종목이고 캐시 항목이 아예 없을 때만, 옮긴 데이터 반환)
+
+    처음 실행한 환경에서도 이전처럼 저장소의 분석 결과를 바로 쓰고 API 를 호출하지 않습니다.
+    만료된 캐시 항목이 있으면 옮기지 않아 정상적으로 갱신됩니다.
+    """
+    cache_name = financial_cache_name(company['stock_code'])
+    if cache_store.read_entry(cache_name) is not None:
+        return None
+
+    seed = load_seed_financial_insight()
+    if not seed or seed.get('주식코드') != company['stock_code']:
+        return None
+
+    cache_store.put(cache_name, seed)
+    print(f"📁 기본 재무 분석 파일을 캐시로 이전: {SEED_FINANCIAL_FILE}")
+    return seed
+
+
+def get_financial_insight(issue=None, refresh=False):
+    """이슈 관련 종목의 재무 인사이트 조회 (디버깅 버전, refresh=True 면 캐시를 무시하고 새로 생성)"""
+    company = issue_company(issue)
+    if company is None:
+        print("관련 종목 없음 - 재무 데이터 없음")
+        return build_no_financial_result()
+
+    cache_name = financial_cache_name(company['stock_code'])
 
     print("\n" + "=" * 50)
-    print("🔍 JYP 재무 인사이트 생성 시작")
+    print(f"🔍 {company['stock_name']} 재무 인사이트 생성 시작")
     print("=" * 50)
 
-    # 캐시 파일 체크
-    cache_file = "data/jyp_financial_cache.json"
+    # 캐시 확인 (캐시 항목이 없으면 저장소의 기본 분석 파일 사용)
+    cached = None
+    if not refresh:
+        cached = cache_store.get(cache_name, FINANCIAL_CACHE_TTL) or migrate_seed_financial_insight(company)
+    if cached:
+        print("✅ 캐시된 데이터 사용")
+        return cached
 
-    try:
-        if os.path.exists(cache_file):
-            print("📁 캐시 파일 발견")
-            with open(cache_file, 'r', encoding='utf-8') as f:
-                cached_data = json.load(f)
-                print("✅ 캐시된 데이터 사용")
-                return cached_data
-    except Exception as e:
-        print(f"⚠️ 캐시 읽기 실패: {e}")
+    financial_data = get_company_financials(company)
+    if not financial_data:
+        print("❌ 재무 데이터 없음")
+        return build_no_financial_result(company)
 
     print("🚀 새로운 API 호출 시작...")
 
     # 새로 생성
-    result = generate_jyp_ai_insight()
+    result = generate_ai_insight(company, financial_data)
 
     if result and result.get('success'):
         print(f"✅ API 성공! ({result.get('auth_method', '알 수 없음')})")
 
         # 캐시 저장
-        try:
-            os.makedirs('data', exist_ok=True)
-            with open(cache_file, 'w', encoding='utf-8') as f:
-                json.dump(result, f, ensure_ascii=False, indent=2)
-            print("💾 캐시 저장 완료")
-        except Exception as e:
-            print(f"⚠️ 캐시 저장 실패: {e}")
+        cache_store.put(cache_name, result)
+        print("💾 캐시 저장 완료")
 
         return result
     else:
+        # 만료된 캐시 → 저장소에 포함된 기본 분석 파일(같은 종목만) 순으로 사용
+        previous = cache_store.get(cache_name, None)
+        seed = load_seed_financial_insight()
+        if not previous and seed and seed.get('주식코드') == company['stock_code']:
+            previous = seed
+        if previous:
+            print("⚠️ API 호출 실패 - 이전 분석 결과 사용")
+            return previous
+
         print("❌ API 호출 실패 - 임시 데이터 사용")
-        return {
-            'success': True,
-            'financial_data': {
-                "매출액_억원": 1245.3,
-                "영업이익_억원": 187.2,
-                "ROE": 15.2,
-                "영업이익률": 15.0
-            },
-            'ai_insight': """**재무현황 요약**: JYP엔터테인먼트는 안정적인 매출 구조와 양호한 수익성을 보이고 있습니다. **주요 강점**: 글로벌 아티스트 포트폴리오를 통한 다각화된 수익원을 확보하고 있습니다. **주요 리스크**: 엔터테인먼트 산업 특성상 아티스트 이슈에 따른 변동성이 존재합니다. **투자관점**: 전반적으로 안정적이나 단기 이슈에 대한 신중한 접근이 필요합니다.""",
-            'analysis_date': datetime.now().strftime('%Y-%m-%d'),
-            'source': 'fallback_data'
-        }
+        return build_fallback_financial_result(company, financial_data)
+
+
+def get_jyp_financial_insight(refresh=False):
+    """JYP 재무 인사이트 조회 (기본 이슈)"""
+    return get_financial_insight(refresh=refresh)
 
 
 # 테스트 함수
@@ -226,7 +332,7 @@ def test_jyp_analysis():
     print("🧪 JYP 분석 테스트 시작")
     result = get_jyp_financial_insight()
 
-    if result:
+    if result and result.get('financial_data'):
         print("\n📊 결과:")
         print(f"성공 여부: {result.get('success')}")
         print(f"데이터 소스: {result.get('source', 'API')}")
@@ -238,4 +344,4 @@ def test_jyp_analysis():
 
 
 if __name__ == "__main__":
-    test_jyp_analysis()
\ No newline at end of file
+    test_jyp_analysis()
@@ -0,0 +1,348 @@
+# -*- coding: utf-8 -*-
+"""
+뉴스/트윗 SQLite 저장소 모듈
+
+수집기가 <데이터 루트>/mirae.db 에 뉴스와 트윗을 저장하고, 분석기는 필요한 만큼만 조회합니다.
+- WAL 모드 (수집기가 쓰는 동안에도 앱에서 읽기 가능)
+- 인덱스: (이슈, 발행/작성 시각), (이슈, 인게이지먼트)
+- "기간 내 인게이지먼트 상위 N개" 같은 조회를 전체 로드/정렬 없이 처리
+- 수집 파일은 JSON 배열과 줄 단위 JSON(.jsonl) 모두 지원 (.jsonl 은 한 줄씩 읽어 메모리 사용량 일정)
+
+    python -m utils.data_store migrate             # web_app 디렉토리에서 실행, 카탈로그 이슈의 JSON 파일 가져오기
+    python -m utils.data_store migrate --issue day6-20250718 --tweets data/day6_tweets.json
+"""
+import argparse
+import heapq
+import itertools
+import json
+import os
+import sqlite3
+import threading
+from datetime import datetime
+
+from utils import cache_store
+
+DB_FILE = cache_store.data_path('mirae.db')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS news (
+    issue_id     TEXT NOT NULL,
+    link         TEXT NOT NULL,
+    title        TEXT,
+    description  TEXT,
+    pub_date     TEXT,
+    collected_at TEXT,
+    PRIMARY KEY (issue_id, link)
+);
+CREATE INDEX IF NOT EXISTS idx_news_issue_pub_date ON news (issue_id, pub_date);
+
+CREATE TABLE IF NOT EXISTS news_queries (
+    issue_id     TEXT NOT NULL,
+    query        TEXT NOT NULL,
+    link         TEXT NOT NULL,
+    rank         INTEGER,
+    PRIMARY KEY (issue_id, query, link)
+);
+
+CREATE TABLE IF NOT EXISTS tweets (
+    issue_id         TEXT NOT NULL,
+    tweet_id         TEXT NOT NULL,
+    text             TEXT,
+    created_at       TEXT,
+    lang             TEXT,
+    like_count       INTEGER DEFAULT 0,
+    retweet_count    INTEGER DEFAULT 0,
+    reply_count      INTEGER DEFAULT 0,
+    quote_count      INTEGER DEFAULT 0,
+    author_followers INTEGER DEFAULT 0,
+    author_following INTEGER DEFAULT 0,
+    engagement       INTEGER DEFAULT 0,
+    collected_at     TEXT,
+    PRIMARY KEY (issue_id, tweet_id)
+);
+CREATE INDEX IF NOT EXISTS idx_tweets_issue_created_at ON tweets (issue_id, created_at);
+CREATE INDEX IF NOT EXISTS idx_tweets_issue_engagement ON tweets (issue_id, engagement DESC);
+"""
+
+TWEET_FIELDS = [
+    'text', 'created_at', 'lang', 'like_count', 'retweet_count', 'reply_count', 'quote_count',
+    'author_followers', 'author_following'
+]
+
+# JSON 가져오기/저장시 한 번에 처리하는 행 수
+INGEST_CHUNK_SIZE = 1000
+
+_local = threading.local()
+_schema_lock = threading.Lock()
+_schema_ready = set()
+
+
+def get_connection(db_file=None):
+    """스레드별 연결 (처음 연결시 WAL 설정 + 스키마 생성)"""
+    db_file = db_file or DB_FILE
+    connections = getattr(_local, 'connections', None)
+    if connections is None:
+        connections = _local.connections = {}
+
+    conn = connections.get(db_file)
+    if conn is None:
+        os.makedirs(os.path.dirname(db_file), exist_ok=True)
+        conn = sqlite3.connect(db_file, timeout=30)
+        conn.row_factory = sqlite3.Row
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+
+        with _schema_lock:
+            if db_file not in _schema_ready:
+                conn.executescript(SCHEMA)
+                _schema_ready.add(db_file)
+
+        connections[db_file] = conn
+
+    return conn
+
+
+def engagement(tweet):
+    """인게이지먼트 점수 (좋아요 + 리트윗)"""
+    return int(tweet.get('like_count') or 0) + int(tweet.get('retweet_count') or 0)
+
+
+def upsert_news(issue_id, news_items, db_file=None, query=None, first_rank=None):
+    """뉴스 저장 (같은 링크는 최신 정보로 갱신). 저장한 행 수 반환
+
+    query 를 지정하면 어느 검색어로 수집한 기사인지도 기록합니다.
+    first_rank 는 news_items 첫 기사의 검색 결과 순위 (정확도순 수집, 최신순 수집이면 None).
+    """
+    now = datetime.now().isoformat()
+    rows = [
+        (issue_id, item['link'], item.get('title'), item.get('description'), item.get('pub_date'), now)
+        for item in news_items if item.get('link')
+    ]
+
+    conn = get_connection(db_file)
+    with conn:
+        conn.executemany("""
+            INSERT INTO news (issue_id, link, title, description, pub_date, collected_at)
+            VALUES (?, ?, ?, ?, ?, ?)
+            ON CONFLICT (issue_id, link) DO UPDATE SET
+                title = excluded.title,
+                description = excluded.description,
+                pub_date = excluded.pub_date,
+                collected_at = excluded.collected_at
+        """, rows)
+
+        if query is not None:
+            conn.executemany("""
+                INSERT INTO news_queries (issue_id, query, link, rank)
+                VALUES (?, ?, ?, ?)
+                ON CONFLICT (issue_id, query, link) DO UPDATE SET
+                    rank = COALESCE(excluded.rank, news_queries.rank)
+            """, [
+                (issue_id, query, item['link'], None if first_rank is None else first_rank + position)
+                for position, item in enumerate(news_items) if item.get('link')
+            ])
+
+    return len(rows)
+
+
+def upsert_tweets(issue_id, tweets, db_file=None):
+    """트윗 저장 (같은 트윗은 반응 수 등 최신 정보로 갱신). 저장한 행 수 반환"""
+    now = datetime.now().isoformat()
+    rows = [
+        (issue_id, str(tweet['id'])) + tuple(tweet.get(field) for field in TWEET_FIELDS)
+        + (engagement(tweet), now)
+        for tweet in tweets if tweet.get('id')
+    ]
+
+    columns = ', '.join(TWEET_FIELDS)
+    updates = ', '.join(f"{field} = excluded.{field}" for field in TWEET_FIELDS + ['engagement', 'collected_at'])
+
+    conn = get_connection(db_file)
+    with conn:
+        conn.executemany(f"""
+            INSERT INTO tweets (issue_id, tweet_id, {columns}, engagement, collected_at)
+            VALUES ({', '.join('?' * (len(TWEET_FIELDS) + 4))})
+            ON CONFLICT (issue_id, tweet_id) DO UPDATE SET {updates}
+        """, rows)
+
+    return len(rows)
+
+
+def _window_clause(column, since, until):
+    clause, params = '', []
+    if since:
+        clause += f" AND {column} >= ?"
+        params.append(since)
+    if until:
+        clause += f" AND {column} < ?"
+        params.append(until)
+    return clause, params
+
+
+def top_tweets(issue_id, limit, since=None, until=None, db_file=None):
+    """인게이지먼트 상위 트윗 (created_at 기준 [since, until) 기간, 인덱스 순서대로 limit 개만 읽음)"""
+    window, params = _window_clause('created_at', since, until)
+    rows = get_connection(db_file).execute(f"""
+        SELECT tweet_id AS id, {', '.join(TWEET_FIELDS)}
+        FROM tweets
+        WHERE issue_id = ?{window}
+        ORDER BY engagement DESC, created_at DESC
+        LIMIT ?
+    """, [issue_id] + params + [limit])
+    return [dict(row) for row in rows]
+
+
+def recent_news(issue_id, limit, since=None, until=None, db_file=None):
+    """최신순 뉴스 (pub_date 기준 [since, until) 기간)"""
+    window, params = _window_clause('pub_date', since, until)
+    rows = get_connection(db_file).execute(f"""
+        SELECT title, description, link, pub_date
+        FROM news
+        WHERE issue_id = ?{window}
+        ORDER BY pub_date DESC
+        LIMIT ?
+    """, [issue_id] + params + [limit])
+    return [dict(row) for row in rows]
+
+
+def query_news(issue_id, query, db_file=None):
+    """검색어로 수집한 뉴스 (검색 결과 순위순, 순위가 없는 최신순 수집 기사는 뒤에 최신순)"""
+    rows = get_connection(db_file).execute("""
+        SELECT n.title, n.description, n.link, n.pub_date
+        FROM news_queries q
+        JOIN news n ON n.issue_id = q.issue_id AND n.link = q.link
+        WHERE q.issue_id = ? AND q.query = ?
+        ORDER BY q.rank IS NULL, q.rank, n.pub_date DESC
+    """, (issue_id, query))
+    return [dict(row) for row in rows]
+
+
+def count_rows(table, issue_id, db_file=None):
+    """이슈별 저장된 뉴스/트윗 수 (table: 'news' 또는 'tweets')"""
+    if table not in ('news', 'tweets'):
+        raise ValueError(f"알 수 없는 테이블: {table}")
+
+    row = get_connection(db_file).execute(
+        f"SELECT COUNT(*) FROM {table} WHERE issue_id = ?", (issue_id,)
+    ).fetchone()
+    return row[0]
+
+
+def has_rows(table, issue_id, db_file=None):
+    """이슈 데이터가 DB에 있는지 (DB 파일이 없으면 만들지 않고 False)"""
+    if table not in ('news', 'tweets'):
+        raise ValueError(f"알 수 없는 테이블: {table}")
+
+    if not os.path.exists(db_file or DB_FILE):
+        return False
+
+    row = get_connection(db_file).execute(
+        f"SELECT 1 FROM {table} WHERE issue_id = ? LIMIT 1", (issue_id,)
+    ).fetchone()
+    return row is not None
+
+
+def is_jsonl(path):
+    """줄 단위 JSON 파일인지 (확장자 기준)"""
+    return path.endswith('.jsonl')
+
+
+def iter_json_records(path):
+    """JSON 배열 / 줄 단위 JSON 파일의 항목을 하나씩 yield
+
+    .jsonl 은 한 줄씩 읽고 (깨진 줄은 건너뜀), JSON 배열은 파일 전체를 읽습니다.
+    파일이 없으면 FileNotFoundError.
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        if not is_jsonl(path):
+            data = json.load(f)
+            yield from (data if isinstance(data, list) else [])
+            return
+
+        for line_number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except ValueError:
+                print(f"잘못된 JSON 줄 건너뜀 ({path}:{line_number})")
+
+
+def write_jsonl(path, records, append=False):
+    """줄 단위 JSON 저장 (append=True 면 이어 쓰기). 쓴 항목 수 반환"""
+    count = 0
+    with open(path, 'a' if append else 'w', encoding='utf-8') as f:
+        for record in records:
+            f.write(json.dumps(record, ensure_ascii=False) + '\n')
+            count += 1
+    return count
+
+
+def top_records(records, limit, key=engagement):
+    """항목 중 key 상위 limit 개 (크기 limit 힙으로 선택, 정렬 결과와 같은 순서)"""
+    return heapq.nlargest(limit, records, key=key)
+
+
+def _chunked(records, size=INGEST_CHUNK_SIZE):
+    iterator = iter(records)
+    while True:
+        chunk = list(itertools.islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def migrate_json(issue_id, news_file=None, tweets_file=None, db_file=None):
+    """기존 JSON/JSONL 파일을 DB로 가져오기 (INGEST_CHUNK_SIZE 개씩). (뉴스 수, 트윗 수) 반환"""
+    news_count = tweet_count = 0
+
+    if news_file and os.path.exists(news_file):
+        for chunk in _chunked(iter_json_records(news_file)):
+            news_count += upsert_news(issue_id, chunk, db_file)
+    if tweets_file and os.path.exists(tweets_file):
+        for chunk in _chunked(iter_json_records(tweets_file)):
+            tweet_count += upsert_tweets(issue_id, chunk, db_file)
+
+    print(f"[{issue_id}] 뉴스 {news_count}건, 트윗 {tweet_count}건 가져오기 완료")
+    return news_count, tweet_count
+
+
+def migrate_catalog(db_file=None):
+    """이슈 카탈로그에 등록된 모든 이슈의 JSON 파일 가져오기"""
+    from utils import issue_catalog
+
+    totals = [0, 0]
+    for item in issue_catalog.iter_issues():
+        issue = issue_catalog.get_issue(item['issue_id']) or item
+        news_file = issue_catalog.issue_data_path(issue, 'news_file') if issue.get('news_file') else None
+        tweets_file = issue_catalog.issue_data_path(issue, 'tweets_file') if issue.get('tweets_file') else None
+        news_count, tweet_count = migrate_json(issue['issue_id'], news_file, tweets_file, db_file)
+        totals[0] += news_count
+        totals[1] += tweet_count
+
+    print(f"전체: 뉴스 {totals[0]}건, 트윗 {totals[1]}건")
+    return tuple(totals)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="뉴스/트윗 SQLite 저장소 관리")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    migrate = subparsers.add_parser('migrate', help="JSON 파일 가져오기 (옵션 없으면 카탈로그 전체)")
+    migrate.add_argument('--issue', help="이슈 ID")
+    migrate.add_argument('--news', help="뉴스 JSON/JSONL 파일")
+    migrate.add_argument('--tweets', help="트윗 JSON/JSONL 파일")
+    migrate.add_argument('--db', help=f"DB 파일 (기본: {DB_FILE})")
+
+    args = parser.parse_args(argv)
+
+    if args.command == 'migrate':
+        if args.issue:
+            migrate_json(args.issue, args.news, args.tweets, args.db)
+        else:
+            migrate_catalog(args.db)
+
+
+if __name__ == "__main__":
+    main()
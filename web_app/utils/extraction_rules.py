@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+"""
+도메인별 본문 추출 규칙 캐시 모듈
+
+도메인마다 본문 추출에 성공한 CSS 선택자와 성공/실패 횟수를
+data/extraction_rules.json 에 기록합니다.
+- 다음 추출 때 성공했던 선택자를 먼저 시도
+- 늘 실패하는 도메인은 후보 목록에서 뒤로 보냄
+"""
+import json
+import threading
+from datetime import datetime
+from urllib.parse import urlparse
+
+from utils import cache_store
+
+RULES_FILE = cache_store.data_path('extraction_rules.json')
+
+# 선택자 대신 <p> 태그를 모두 이어붙여 성공한 경우
+PARAGRAPH_SELECTOR = 'p'
+
+_rules = None
+_lock = threading.Lock()
+
+
+def get_domain(url):
+    """URL의 도메인 (www. 제외)"""
+    host = urlparse(url).netloc.lower()
+    return host[4:] if host.startswith('www.') else host
+
+
+def _load():
+    global _rules
+
+    if _rules is None:
+        try:
+            with open(RULES_FILE, 'r', encoding='utf-8') as f:
+                _rules = json.load(f)
+        except (OSError, ValueError):
+            _rules = {}
+
+    return _rules
+
+
+def _save():
+    """임시 파일에 쓴 뒤 교체 (중간에 끊겨도 파일이 깨지지 않도록)"""
+    try:
+        cache_store.atomic_write_json(RULES_FILE, _rules, indent=2)
+    except OSError as e:
+        print(f"추출 규칙 저장 실패: {e}")
+
+
+def get_selector(url):
+    """해당 도메인에서 성공했던 선택자 (없으면 None)"""
+    with _lock:
+        return _load().get(get_domain(url), {}).get('selector')
+
+
+def record_result(url, selector, success):
+    """추출 결과 기록 (성공시 선택자 갱신)"""
+    domain = get_domain(url)
+
+    with _lock:
+        rule = _load().setdefault(domain, {'selector': None, 'success': 0, 'failure': 0})
+
+        if success:
+            rule['success'] += 1
+            rule['selector'] = selector
+        else:
+            rule['failure'] += 1
+
+        rule['updated_at'] = datetime.now().isoformat()
+        _save()
+
+
+def success_rate(url):
+    """도메인 추출 성공률 (라플라스 보정, 기록 없으면 0.5)"""
+    with _lock:
+        rule = _load().get(get_domain(url), {})
+
+    success = rule.get('success', 0)
+    failure = rule.get('failure', 0)
+    return (success + 1) / (success + failure + 2)
+
+
+def rank_candidates(news_items, link_key='link'):
+    """성공률 높은 도메인 순으로 정렬 (같은 성공률이면 원래 순서 유지)"""
+    return sorted(news_items, key=lambda item: -success_rate(item.get(link_key, '')))
+
+
+def get_stats():
+    """도메인별 규칙과 성공률"""
+    with _lock:
+        rules = json.loads(json.dumps(_load()))
+
+    for rule in rules.values():
+        total = rule.get('success', 0) + rule.get('failure', 0)
+        rule['success_rate'] = rule.get('success', 0) / total if total else None
+
+    return rules
@@ -0,0 +1,268 @@
+# -*- coding: utf-8 -*-
+"""
+이슈 카탈로그 모듈
+
+이슈별 정보는 data/issues/<이슈 ID>.json 에 두고, 메뉴용 인덱스를 따로 만들어 둡니다.
+- data/issues/index.json: 전체 이슈 수, 샤드 크기, 갱신 시각
+- data/issues/index_<번호>.json: 최신순 INDEX_SHARD_SIZE 개씩 나눈 요약 목록
+  (이슈 ID, 종목, 기간, 데이터 파일 위치, 미리 계산한 SNS 감정 비율)
+메뉴는 필요한 샤드만 읽고, 트윗/기사 파일은 리포트를 열 때 분석기가 읽습니다.
+인덱스는 이슈를 등록할 때(register_issue)와 사전 계산(utils.precompute) 때 만들어지고,
+메뉴 화면에서는 만들지 않습니다 (인덱스가 없으면 백그라운드에서 만들고 빈 목록 표시).
+
+    python -m utils.issue_catalog   # web_app 디렉토리에서 실행, 인덱스 재생성
+"""
+import glob
+import json
+import os
+import threading
+from collections import Counter
+from datetime import datetime
+
+from utils import cache_store, data_store, lexicon_sentiment
+from utils.sentiment_labels import LABELS
+
+ISSUES_DIR = cache_store.data_path('issues')
+INDEX_FILE = os.path.join(ISSUES_DIR, 'index.json')
+
+INDEX_SHARD_SIZE = 50
+
+# 이슈를 지정하지 않았을 때 사용하는 이슈
+DEFAULT_ISSUE_ID = 'day6-20250718'
+
+# 인덱스에 복사하는 필드 (메뉴 표시용)
+INDEX_FIELDS = [
+    'issue_id', 'title', 'description', 'summary', 'query', 'stock_symbol', 'stock_code', 'stock_name',
+    'date_start', 'date_end', 'news_file', 'tweets_file'
+]
+
+EMPTY_INDEX_META = {'count': 0, 'shard_size': INDEX_SHARD_SIZE, 'shards': 0}
+
+_lock = threading.Lock()
+_index_meta = None
+_index_mtime = None
+_shards = {}
+_rebuild_thread = None
+
+
+def _record_path(issue_id):
+    return os.path.join(ISSUES_DIR, f"{issue_id}.json")
+
+
+def _shard_path(number):
+    return os.path.join(ISSUES_DIR, f"index_{number:04d}.json")
+
+
+def get_issue(issue_id):
+    """이슈 정보 (없으면 None)"""
+    try:
+        with open(_record_path(issue_id), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def get_default_issue():
+    """기본 이슈 (데이식스 본인확인 논란)"""
+    return get_issue(DEFAULT_ISSUE_ID)
+
+
+def resolve_issue(issue=None):
+    """이슈 dict / 이슈 ID / None(기본 이슈) 을 이슈 정보로 변환 (등록되지 않은 이슈 ID 는 KeyError)"""
+    if isinstance(issue, dict) and issue.get('issue_id'):
+        # 메뉴 인덱스 항목이면 전체 이슈 정보로 교체
+        return get_issue(issue['issue_id']) or issue
+
+    issue_id = issue if isinstance(issue, str) else DEFAULT_ISSUE_ID
+    record = get_issue(issue_id)
+    if record is None:
+        raise KeyError(f"등록되지 않은 이슈: {issue_id}")
+    return record
+
+
+def issue_data_path(issue, file_key):
+    """이슈 데이터 파일 경로 (news_file / tweets_file, 데이터 루트 기준)"""
+    return cache_store.data_path(issue[file_key])
+
+
+def format_issue_period(issue):
+    """이슈 기간 표시 문자열 (예: 2025-07-18~20)"""
+    start, end = issue.get('date_start', ''), issue.get('date_end', '')
+    if not end or end == start:
+        return start
+    if start[:8] == end[:8]:
+        return f"{start}~{end[8:]}"
+    return f"{start}~{end}"
+
+
+def _start_background_rebuild():
+    """인덱스 생성을 백그라운드에서 시작 (이미 진행 중이면 무시)"""
+    global _rebuild_thread
+
+    with _lock:
+        if _rebuild_thread is not None and _rebuild_thread.is_alive():
+            return
+        _rebuild_thread = threading.Thread(target=rebuild_index, name='issue-index-rebuild', daemon=True)
+        _rebuild_thread.start()
+
+
+def is_index_building():
+    """백그라운드 인덱스 생성 중인지"""
+    with _lock:
+        return _rebuild_thread is not None and _rebuild_thread.is_alive()
+
+
+def _load_index_meta():
+    """인덱스 메타 정보 (파일이 바뀌었을 때만 다시 읽음)
+
+    인덱스가 아직 없으면 (새로 배포한 경우 등) 백그라운드에서 만들기 시작하고 빈 인덱스를 반환합니다.
+    """
+    global _index_meta, _index_mtime
+
+    try:
+        mtime = os.path.getmtime(INDEX_FILE)
+    except OSError:
+        _start_background_rebuild()
+        return EMPTY_INDEX_META
+
+    with _lock:
+        if _index_meta is None or mtime != _index_mtime:
+            try:
+                with open(INDEX_FILE, 'r', encoding='utf-8') as f:
+                    _index_meta = json.load(f)
+            except (OSError, ValueError) as e:
+                print(f"이슈 인덱스 읽기 실패: {e}")
+                return _index_meta or EMPTY_INDEX_META
+            _index_mtime = mtime
+            _shards.clear()
+        return _index_meta
+
+
+def _load_shard(number):
+    with _lock:
+        if number in _shards:
+            return _shards[number]
+
+    try:
+        with open(_shard_path(number), 'r', encoding='utf-8') as f:
+            entries = json.load(f)
+    except (OSError, ValueError):
+        entries = []
+
+    with _lock:
+        _shards[number] = entries
+    return entries
+
+
+def count_issues():
+    """전체 이슈 수"""
+    return _load_index_meta().get('count', 0)
+
+
+def list_issues(page=0, page_size=10):
+    """최신순 이슈 목록 한 페이지 (필요한 인덱스 샤드만 읽음). (목록, 전체 수) 반환"""
+    meta = _load_index_meta()
+    total = meta.get('count', 0)
+    shard_size = meta.get('shard_size', INDEX_SHARD_SIZE)
+
+    start = max(page, 0) * page_size
+    end = min(start + page_size, total)
+    if start >= end:
+        return [], total
+
+    entries = []
+    for number in range(start // shard_size, (end - 1) // shard_size + 1):
+        shard = _load_shard(number)
+        offset = number * shard_size
+        entries.extend(shard[max(start - offset, 0):end - offset])
+
+    return entries, total
+
+
+def iter_issues():
+    """전체 이슈 인덱스 항목 (샤드 순서대로)"""
+    meta = _load_index_meta()
+    for number in range(meta.get('shards', 0)):
+        yield from _load_shard(number)
+
+
+def compute_headline_sentiment(issue):
+    """이슈 트윗의 감정 비율 (사전 기반, 인덱스 생성시 미리 계산)"""
+    try:
+        texts = [tweet.get('text', '') for tweet in data_store.iter_json_records(issue_data_path(issue, 'tweets_file'))]
+    except (OSError, ValueError, KeyError):
+        return None, 0
+
+    labels = lexicon_sentiment.classify_texts(texts)
+    if not labels:
+        return None, 0
+
+    counts = Counter(labels)
+    return {
+        label: round(counts.get(label, 0) / len(labels) * 100, 1)
+        for label in LABELS
+    }, len(labels)
+
+
+def build_index_entry(issue):
+    """인덱스 항목 (메뉴에 필요한 필드 + 미리 계산한 감정 비율)"""
+    entry = {field: issue.get(field) for field in INDEX_FIELDS}
+    entry['headline_sentiment'], entry['tweet_count'] = compute_headline_sentiment(issue)
+    return entry
+
+
+def rebuild_index():
+    """이슈 파일들로 인덱스 재생성 (최신순, 샤드 먼저 쓰고 메타 정보는 마지막에 교체)"""
+    records = []
+    for path in glob.glob(os.path.join(ISSUES_DIR, '*.json')):
+        if os.path.basename(path).startswith('index'):
+            continue
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                record = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"이슈 파일 읽기 실패 ({path}): {e}")
+            continue
+        if record.get('issue_id'):
+            records.append(record)
+
+    records.sort(key=lambda r: (r.get('date_start') or '', r['issue_id']), reverse=True)
+    entries = [build_index_entry(record) for record in records]
+
+    shard_count = (len(entries) + INDEX_SHARD_SIZE - 1) // INDEX_SHARD_SIZE
+    for number in range(shard_count):
+        shard = entries[number * INDEX_SHARD_SIZE:(number + 1) * INDEX_SHARD_SIZE]
+        cache_store.atomic_write_json(_shard_path(number), shard, indent=2)
+
+    cache_store.atomic_write_json(INDEX_FILE, {
+        'count': len(entries),
+        'shard_size': INDEX_SHARD_SIZE,
+        'shards': shard_count,
+        'updated_at': datetime.now().isoformat()
+    }, indent=2)
+
+    # 이전보다 줄어든 샤드 삭제
+    for path in glob.glob(os.path.join(ISSUES_DIR, 'index_*.json')):
+        try:
+            if int(os.path.basename(path)[6:10]) >= shard_count:
+                os.remove(path)
+        except (ValueError, OSError):
+            continue
+
+    print(f"이슈 인덱스 생성 완료: {len(entries)}개 ({shard_count}개 샤드)")
+    return len(entries)
+
+
+def register_issue(issue):
+    """이슈 추가/수정 후 인덱스 재생성"""
+    if not issue.get('issue_id'):
+        raise ValueError("issue_id 가 필요합니다")
+
+    cache_store.atomic_write_json(_record_path(issue['issue_id']), issue, indent=2)
+    rebuild_index()
+
+
+if __name__ == "__main__":
+    rebuild_index()
+    for item in iter_issues():
+        print(f"- {item['issue_id']}: {item['title']} ({format_issue_period(item)}) {item['headline_sentiment']}")
@@ -0,0 +1,243 @@
+# -*- coding: utf-8 -*-
+"""
+사전(lexicon) 기반 감정분석 모듈 (API 키 없을 때 / 대체 경로)
+
+가중치가 있는 한국어 감정 사전과 부정어를 하나의 트라이(trie) 정규식으로 컴파일하고,
+트윗 묶음 전체를 이어붙인 문자열을 한 번만 훑어 NumPy 배열로 점수를 계산합니다.
+트라이 정규식은 접두사를 공유하는 분기 구조라 사전 크기가 커져도 위치당 비교 비용이
+사전 크기가 아닌 최장 단어 길이에 비례합니다.
+"""
+import re
+import threading
+
+import numpy as np
+
+from utils.sentiment_labels import LABELS
+
+# 긍정 표현 (어간/어근 중심, 값은 가중치)
+POSITIVE_TERMS = {
+    '좋': 1.0, '좋아': 1.0, '좋다': 1.0, '좋았': 1.0, '좋겠': 0.6, '좋은': 0.8,
+    '응원': 1.5, '지지': 1.0, '옹호': 1.0, '편들': 0.8, '믿': 0.8, '믿어': 1.0, '믿는다': 1.2,
+    '사랑': 1.5, '사랑해': 2.0, '최고': 1.5, '대박': 1.2, '감사': 1.2, '고마': 1.2, '고맙': 1.2,
+    '화이팅': 1.5, '파이팅': 1.5, '힘내': 1.5, '힘내요': 1.5, '멋지': 1.2, '멋있': 1.2, '멋져': 1.2,
+    '훌륭': 1.2, '기대': 0.8, '기대돼': 1.2, '행복': 1.2, '축하': 1.2, '존경': 1.2, '다행': 0.8,
+    '든든': 1.0, '자랑': 1.0, '감동': 1.2, '벅차': 1.0, '설레': 1.0, '귀엽': 1.0, '귀여': 1.0,
+    '예쁘': 1.0, '이쁘': 1.0, '잘생': 0.8, '완벽': 1.2, '레전드': 1.2, '명곡': 1.2, '갓': 0.6,
+    '만족': 1.2, '잘했': 1.0, '잘해': 0.8, '수고': 0.8, '칭찬': 1.0, '인정': 0.6, '찬성': 1.0,
+    '환영': 1.0, '신뢰': 1.0, '안심': 0.8, '재밌': 1.0, '재미있': 1.0, '즐거': 1.0, '즐겁': 1.0,
+    '신나': 1.0, '감격': 1.2, '눈물나게 좋': 1.5, '성공': 0.8, '호평': 1.2, '개선': 0.6,
+    '진심으로 사과': 0.6, '빠른 대응': 0.8, '책임감 있': 0.8, '보상': 0.4, '극복': 0.8,
+    '함께해': 1.0, '함께 하': 0.6, '곁에': 0.6, '지켜줄': 1.0, '보고싶': 0.8, '보고 싶': 0.8,
+    '덕분': 0.8, '천재': 1.0, '찢었': 1.2, '미쳤다 진짜 좋': 1.5, '고생했': 1.0, '고생 많': 1.0,
+    '♥': 1.0, '❤': 1.0, '💕': 1.0, '😍': 1.0, '👍': 1.0, '🥰': 1.0,
+    'good': 1.0, 'love': 1.5, 'best': 1.2, 'great': 1.2, 'amazing': 1.2, 'thank': 1.0,
+}
+
+# 부정 표현
+NEGATIVE_TERMS = {
+    '싫': 1.2, '싫다': 1.2, '싫어': 1.2, '실망': 1.5, '실망스럽': 1.5, '최악': 2.0, '문제': 0.8,
+    '문제있': 1.0, '비판': 1.2, '반대': 1.0, '화나': 1.5, '화난': 1.5, '화가': 1.2, '열받': 1.5,
+    '빡치': 1.5, '빡쳐': 1.5, '짜증': 1.5, '어이없': 1.5, '어이가 없': 1.5, '어처구니': 1.5,
+    '황당': 1.5, '불쾌': 1.5, '불편': 1.0, '논란': 0.8, '침해': 1.5, '과도': 1.2, '과하': 1.2,
+    '지나치': 1.2, '무리한': 1.0, '요구하': 0.4, '보이콧': 2.0, '탈덕': 2.0, '환불': 0.8, '환멸': 2.0,
+    '분노': 1.8, '억울': 1.2, '피해': 1.0, '불매': 2.0, '엉망': 1.5, '개판': 1.8, '역겹': 2.0,
+    '한심': 1.5, '무책임': 1.8, '책임져': 1.2, '우려': 1.0, '걱정': 0.8, '불안': 1.0, '갑질': 2.0,
+    '횡포': 1.8, '답답': 1.2, '망했': 1.5, '망함': 1.5, '망하': 1.2, '쓰레기': 2.0, '노답': 1.5,
+    '선넘': 1.5, '선 넘': 1.5, '소름': 0.8, '무섭': 0.8, '끔찍': 1.5, '충격': 1.0, '실화': 0.6,
+    '말이 되': 0.8, '말도 안': 1.5, '말이 안': 1.5, '미친': 1.0, '미쳤': 0.8, '개인정보': 0.6,
+    '생기부': 0.6, '생활기록부': 0.6, '금융인증서': 0.6, '신분증 공유': 1.0, '유출': 1.5,
+    '모욕': 1.8, '굴욕': 1.8, '수치': 1.2, '모멸': 1.8, '기분 나쁘': 1.5, '기분나쁘': 1.5,
+    '안좋': 1.0, '별로': 1.0, '재미없': 1.2, '필요없': 0.8, '쓸데없': 1.2, '어이상실': 1.5,
+    '손절': 2.0, '등돌': 1.5, '떠나': 0.8, '그만두': 0.8, '해명': 0.6, '사과해': 1.0, '사과하라': 1.2,
+    '사과문': 0.4, '공식 사과': 0.4, '책임 통감': 0.4, '욕먹': 1.2, '욕하': 1.0, '비난': 1.5,
+    '규탄': 1.8, '고소': 1.2, '법적': 0.6, '위법': 1.5, '불법': 1.5, '신고': 0.8, '암표': 0.6,
+    '호구': 1.5, '기만': 1.8, '배신': 2.0, '거짓': 1.5, '변명': 1.2, '핑계': 1.2, '안타깝': 0.8,
+    '슬프': 1.0, '속상': 1.2, '서운': 1.0, '아쉽': 0.8, '힘들': 0.8, '괴롭': 1.2, '지쳤': 1.0,
+    'ㅠㅠ': 0.4, 'ㅜㅜ': 0.4, '😡': 1.5, '🤬': 1.8, '😠': 1.2, '👎': 1.2, '💢': 1.2,
+    'bad': 1.0, 'worst': 2.0, 'hate': 1.5, 'disappoint': 1.5, 'boycott': 2.0,
+}
+
+# 감정 표현 앞에 오는 부정어 ("안 좋다", "못 믿겠다")
+NEGATION_PREFIXES = ['안 ', '못 ', '전혀 ', '별로 안 ', '하나도 안 ']
+
+# 감정 표현 뒤에 오는 부정어 ("좋지 않다", "문제없다")
+NEGATION_SUFFIXES = ['지 않', '지않', '지 못', '지못', '지 마', '지마', '지 말', '없', '없어', '없다',
+                     '는 아니', '은 아니', '진 않']
+
+# 감정 표현 뒤에 떨어져 오는 부정 서술어 ("응원 못 하겠다", "지지는 안 해")
+NEGATION_FOLLOWERS = ['못 하', '못하', '못 해', '못해', '못 함', '안 하', '안하', '안 해', '안해', '안 함',
+                      '안 할', '안할', '못 할', '못할']
+
+# 부정어와 감정 표현 사이 허용 거리 (문자 수)
+PREFIX_GAP = 0
+SUFFIX_GAP = 2
+FOLLOWER_GAP = 2
+
+# 부정된 표현의 점수 배율 (부호 반전 후 곱함)
+NEGATION_FACTOR = 0.8
+
+# 점수가 이 값을 넘으면 긍정/부정으로 판단
+LABEL_THRESHOLD = 0.5
+
+KIND_POSITIVE = 0
+KIND_NEGATIVE = 1
+KIND_PREFIX = 2
+KIND_SUFFIX = 3
+KIND_FOLLOWER = 4
+
+_compiled = None
+_compile_lock = threading.Lock()
+
+
+def _trie_pattern(terms):
+    """단어 목록을 접두사를 공유하는 트라이 정규식으로 변환 (최장 일치 우선)"""
+    trie = {}
+    for term in terms:
+        node = trie
+        for char in term:
+            node = node.setdefault(char, {})
+        node[''] = True
+
+    def emit(node):
+        is_end = '' in node
+        branches = [re.escape(char) + emit(child) for char, child in sorted(node.items()) if char]
+
+        if not branches:
+            return ''
+
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        # 단어 끝 노드에서는 더 긴 단어를 먼저 시도하고 실패하면 여기서 멈춤
+        return f'(?:{body})?' if is_end else body
+
+    return emit(trie)
+
+
+def compile_lexicon(positive_terms=None, negative_terms=None):
+    """사전 전체를 하나의 패턴과 조회 테이블로 컴파일"""
+    positive_terms = POSITIVE_TERMS if positive_terms is None else positive_terms
+    negative_terms = NEGATIVE_TERMS if negative_terms is None else negative_terms
+
+    table = {}
+    for term in NEGATION_PREFIXES:
+        table[term] = (KIND_PREFIX, 0.0)
+    for term in NEGATION_SUFFIXES:
+        table[term] = (KIND_SUFFIX, 0.0)
+    for term in NEGATION_FOLLOWERS:
+        table[term] = (KIND_FOLLOWER, 0.0)
+    for term, weight in positive_terms.items():
+        table[term.lower()] = (KIND_POSITIVE, weight)
+    for term, weight in negative_terms.items():
+        table[term.lower()] = (KIND_NEGATIVE, weight)
+
+    return {
+        'pattern': re.compile(_trie_pattern(table.keys())),
+        'table': table
+    }
+
+
+def _get_compiled():
+    global _compiled
+
+    if _compiled is None:
+        with _compile_lock:
+            if _compiled is None:
+                _compiled = compile_lexicon()
+
+    return _compiled
+
+
+def score_texts(texts, compiled=None):
+    """트윗 묶음을 한 번에 점수화
+
+    반환값 (모두 길이 len(texts)의 NumPy 배열):
+    - positive / negative: 긍정/부정 가중치 합 (부정어 반영 후)
+    - score: positive - negative
+    - hits: 매칭된 감정 표현 수
+    - labels: LABELS 인덱스 (0=긍정, 1=부정, 2=중립)
+    """
+    compiled = compiled or _get_compiled()
+    n_docs = len(texts)
+
+    # 문서 사이에 줄바꿈을 넣어 이어붙임 (사전 단어에는 줄바꿈이 없으므로 문서 경계를 넘지 않음)
+    cleaned = [(text or '').replace('\n', ' ').lower() for text in texts]
+    lengths = np.fromiter((len(text) + 1 for text in cleaned), dtype=np.int64, count=n_docs)
+    doc_starts = np.concatenate(([0], np.cumsum(lengths)[:-1])) if n_docs else lengths
+    corpus = '\n'.join(cleaned)
+
+    table = compiled['table']
+    starts, ends, kinds, weights = [], [], [], []
+    for match in compiled['pattern'].finditer(corpus):
+        kind, weight = table[match.group()]
+        starts.append(match.start())
+        ends.append(match.end())
+        kinds.append(kind)
+        weights.append(weight)
+
+    starts = np.asarray(starts, dtype=np.int64)
+    ends = np.asarray(ends, dtype=np.int64)
+    kinds = np.asarray(kinds, dtype=np.int8)
+    weights = np.asarray(weights, dtype=np.float64)
+    docs = np.searchsorted(doc_starts, starts, side='right') - 1
+
+    is_sentiment = kinds <= KIND_NEGATIVE
+
+    # 바로 앞 매치가 같은 문서의 접두 부정어인지 / 바로 뒤 매치가 접미 부정어나 부정 서술어인지
+    same_doc = docs[1:] == docs[:-1]
+    gaps = starts[1:] - ends[:-1]
+    prefixed = np.concatenate(([False], (kinds[:-1] == KIND_PREFIX) & same_doc & (gaps <= PREFIX_GAP)))
+    followed = ((kinds[1:] == KIND_SUFFIX) & (gaps <= SUFFIX_GAP)) | ((kinds[1:] == KIND_FOLLOWER) & (gaps <= FOLLOWER_GAP))
+    suffixed = np.concatenate((followed & same_doc, [False]))
+    negated = is_sentiment & (prefixed ^ suffixed)  # 이중 부정은 상쇄
+
+    signed = np.where(kinds == KIND_POSITIVE, weights, -weights)
+    signed = np.where(negated, -signed * NEGATION_FACTOR, signed)
+    signed = np.where(is_sentiment, signed, 0.0)
+
+    positive = np.bincount(docs, weights=np.clip(signed, 0, None), minlength=n_docs)
+    negative = np.bincount(docs, weights=np.clip(-signed, 0, None), minlength=n_docs)
+    hits = np.bincount(docs[is_sentiment], minlength=n_docs)
+    score = positive - negative
+
+    labels = np.full(n_docs, LABELS.index('중립'), dtype=np.int8)
+    labels[score > LABEL_THRESHOLD] = LABELS.index('긍정')
+    labels[score < -LABEL_THRESHOLD] = LABELS.index('부정')
+
+    return {
+        'positive': positive,
+        'negative': negative,
+        'score': score,
+        'hits': hits,
+        'labels': labels
+    }
+
+
+def classify_texts(texts):
+    """트윗 묶음의 감정 라벨 목록 (긍정/부정/중립)"""
+    if not texts:
+        return []
+    return [LABELS[i] for i in score_texts(texts)['labels']]
+
+
+def benchmark(n_docs=100000):
+    """처리량 측정 (트윗/초)"""
+    import time
+
+    samples = [
+        '데이식스 팬미팅 본인확인 너무 과도하다 실망이야',
+        '그래도 데식이들 응원해 항상 사랑해',
+        '공지 확인 안 하고 간 사람도 문제 없는 건 아니지',
+        '기사 나왔네 상황 지켜보자',
+        '개인정보 요구는 말도 안 된다 jyp 무책임',
+    ]
+    texts = [samples[i % len(samples)] + f' {i}' for i in range(n_docs)]
+
+    start = time.perf_counter()
+    score_texts(texts)
+    elapsed = time.perf_counter() - start
+
+    print(f"사전 감정분석: {n_docs:,}개 {elapsed:.2f}초 ({n_docs / elapsed:,.0f}개/초)")
+    return n_docs / elapsed
+
+
+if __name__ == "__main__":
+    benchmark()
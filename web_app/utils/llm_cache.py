@@ -0,0 +1,162 @@
+# -*- coding: utf-8 -*-
+"""
+LLM 응답 캐시 모듈
+
+(모델, 메시지, 샘플링 파라미터, 프롬프트 버전) 해시를 키로 사용하는 2단 캐시입니다.
+- 메모리: 크기 제한 LRU
+- 디스크: data/llm_cache/<키 앞 2자리>/<키>.json (개수/용량 제한, 마지막 사용 시각(mtime) 순 제거)
+프롬프트 템플릿을 수정하면 해당 프롬프트 버전을 올려 이전 응답을 무효화합니다.
+"""
+import glob
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from datetime import datetime
+
+from utils import cache_store
+
+MEMORY_MAX_ENTRIES = 2048
+
+# 디스크 캐시 제한 (초과시 오래 안 쓴 것부터 삭제)
+DISK_MAX_ENTRIES = 20000
+DISK_MAX_BYTES = 200 * 1024 * 1024
+
+# 디스크 정리 확인 주기 (저장 N번마다 한 번 파일 목록 확인)
+DISK_EVICT_INTERVAL = 100
+
+CACHE_DIR = cache_store.data_path('llm_cache')
+
+_memory = OrderedDict()
+_lock = threading.Lock()
+_stats = {'memory_hits': 0, 'disk_hits': 0, 'misses': 0, 'evictions': 0}
+_puts_since_evict = [DISK_EVICT_INTERVAL]
+
+
+def make_key(model, messages, params, prompt_version):
+    """요청 내용 기반 캐시 키 (sha256)"""
+    payload = json.dumps(
+        {
+            'model': model,
+            'prompt_version': prompt_version,
+            'messages': messages,
+            'params': params
+        },
+        ensure_ascii=False,
+        sort_keys=True
+    )
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def _disk_path(key):
+    return os.path.join(CACHE_DIR, key[:2], f"{key}.json")
+
+
+def _remember(key, content):
+    """메모리 LRU에 저장 (초과분은 오래된 것부터 제거)"""
+    with _lock:
+        _memory[key] = content
+        _memory.move_to_end(key)
+        while len(_memory) > MEMORY_MAX_ENTRIES:
+            _memory.popitem(last=False)
+
+
+def get(key):
+    """캐시 조회 (메모리 → 디스크 순, 없으면 None)"""
+    with _lock:
+        if key in _memory:
+            _memory.move_to_end(key)
+            _stats['memory_hits'] += 1
+            return _memory[key]
+
+    path = _disk_path(key)
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            content = json.load(f)['content']
+    except (OSError, ValueError, KeyError):
+        with _lock:
+            _stats['misses'] += 1
+        return None
+
+    # 마지막 사용 시각 갱신 (정리 순서 기준)
+    try:
+        os.utime(path)
+    except OSError:
+        pass
+
+    _remember(key, content)
+    with _lock:
+        _stats['disk_hits'] += 1
+    return content
+
+
+def put(key, content, prompt_version=None):
+    """캐시 저장 (메모리 + 디스크)"""
+    if content is None:
+        return
+
+    _remember(key, content)
+
+    try:
+        cache_store.atomic_write_json(_disk_path(key), {
+            'key': key,
+            'prompt_version': prompt_version,
+            'created_at': datetime.now().isoformat(),
+            'content': content
+        })
+    except OSError as e:
+        print(f"LLM 캐시 저장 실패: {e}")
+        return
+
+    with _lock:
+        _puts_since_evict[0] += 1
+        due = _puts_since_evict[0] >= DISK_EVICT_INTERVAL
+        if due:
+            _puts_since_evict[0] = 0
+    if due:
+        _evict_if_needed()
+
+
+def _evict_if_needed():
+    """디스크 캐시 개수/용량 초과시 마지막 사용 시각이 오래된 항목부터 삭제"""
+    entries = []
+    for path in glob.glob(os.path.join(CACHE_DIR, '*', '*.json')):
+        try:
+            stat = os.stat(path)
+        except OSError:
+            continue
+        entries.append((stat.st_mtime, stat.st_size, path))
+
+    remaining = len(entries)
+    total_bytes = sum(size for _, size, _ in entries)
+    if remaining <= DISK_MAX_ENTRIES and total_bytes <= DISK_MAX_BYTES:
+        return
+
+    removed = 0
+    for _, size, path in sorted(entries):
+        if remaining <= DISK_MAX_ENTRIES and total_bytes <= DISK_MAX_BYTES:
+            break
+        try:
+            os.remove(path)
+        except OSError:
+            continue
+        remaining -= 1
+        total_bytes -= size
+        removed += 1
+
+    with _lock:
+        _stats['evictions'] += removed
+    print(f"LLM 캐시 정리: {removed}개 삭제")
+
+
+def clear_memory():
+    """메모리 캐시 비우기 (디스크는 유지)"""
+    with _lock:
+        _memory.clear()
+
+
+def get_stats():
+    """캐시 적중 통계"""
+    with _lock:
+        return {**_stats, 'memory_entries': len(_memory)}
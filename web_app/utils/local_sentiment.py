@@ -0,0 +1,392 @@
+# -*- coding: utf-8 -*-
+"""
+로컬 CPU 감정분류 모듈
+
+문자 n-gram 해싱 특징 + 다항 로지스틱 회귀(NumPy)로 GPU 없이 트윗을 분류합니다.
+학습 데이터는 LLM 이 정한 라벨만 사용합니다: LLM 분류 결과 로그(data/sentiment_labels.jsonl)와
+SNS 분석 캐시(sns_cache_*.json) 중 label_source 가 'llm' 인 대표 트윗.
+(로컬 모델/사전 라벨이나 유사 중복에 복사된 라벨로 학습하면 모델이 자기 오류를 강화함)
+
+    python -m utils.local_sentiment   # web_app 디렉토리에서 실행, 학습 후 저장
+"""
+import glob
+import json
+import os
+import re
+import threading
+import time
+import zlib
+from datetime import datetime
+
+import numpy as np
+
+from utils import cache_store
+from utils.sentiment_labels import LABELS, LABEL_INDEX
+
+N_FEATURES = 2 ** 18
+NGRAM_RANGE = (1, 3)
+
+# 이 신뢰도(최대 확률) 미만인 트윗만 LLM으로 보냄
+DEFAULT_CONFIDENCE_THRESHOLD = 0.7
+
+# 학습에 사용하는 라벨 출처
+LLM_LABEL_SOURCE = 'llm'
+
+# 이보다 적은 라벨로는 모델을 만들지 않음
+MIN_TRAINING_SAMPLES = 30
+
+# 마지막 학습 이후 새 LLM 라벨이 이만큼 쌓이면 백그라운드 재학습
+RETRAIN_NEW_LABELS = 200
+
+# 모델이 없을 때 학습 재시도 간격 (초, 라벨 부족으로 실패한 경우)
+RETRAIN_RETRY_SECONDS = 600
+
+DATA_DIR = cache_store.DATA_ROOT
+MODEL_FILE = os.path.join(DATA_DIR, 'local_sentiment_model.npz')
+LABEL_LOG_FILE = os.path.join(DATA_DIR, 'sentiment_labels.jsonl')
+
+URL_PATTERN = re.compile(r'https?://\S+')
+SPACE_PATTERN = re.compile(r'\s+')
+
+_model = None
+_model_lock = threading.Lock()
+_training = {'running': False, 'last_attempt': None, 'new_labels': 0}
+_label_log_lock = threading.Lock()
+
+
+def _normalize(text):
+    text = URL_PATTERN.sub(' ', text or '').lower()
+    return SPACE_PATTERN.sub(' ', text).strip()
+
+
+def featurize(text):
+    """문자 n-gram 해싱 특징 (특징 인덱스, L2 정규화된 값)"""
+    padded = f" {_normalize(text)} "
+    counts = {}
+
+    for n in range(NGRAM_RANGE[0], NGRAM_RANGE[1] + 1):
+        for i in range(len(padded) - n + 1):
+            index = zlib.crc32(padded[i:i + n].encode('utf-8')) % N_FEATURES
+            counts[index] = counts.get(index, 0) + 1
+
+    if not counts:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float32)
+
+    indices = np.fromiter(counts.keys(), dtype=np.int64, count=len(counts))
+    values = np.log1p(np.fromiter(counts.values(), dtype=np.float32, count=len(counts)))
+    values /= np.linalg.norm(values)
+    return indices, values
+
+
+def _featurize_batch(texts):
+    """여러 문서를 평탄화된 희소 배열(문서 번호, 특징 인덱스, 값)로 변환"""
+    doc_ids, feature_ids, values = [], [], []
+
+    for doc, text in enumerate(texts):
+        indices, vals = featurize(text)
+        doc_ids.append(np.full(len(indices), doc, dtype=np.int64))
+        feature_ids.append(indices)
+        values.append(vals)
+
+    if not texts:
+        empty = np.zeros(0, dtype=np.int64)
+        return empty, empty, np.zeros(0, dtype=np.float32)
+
+    return np.concatenate(doc_ids), np.concatenate(feature_ids), np.concatenate(values)
+
+
+def _logits(model, n_docs, doc_ids, feature_ids, values):
+    weights = model['weights']
+    logits = np.empty((n_docs, len(LABELS)), dtype=np.float64)
+
+    for k in range(len(LABELS)):
+        logits[:, k] = np.bincount(
+            doc_ids, weights=weights[feature_ids, k] * values, minlength=n_docs
+        )
+
+    return logits + model['bias']
+
+
+def _softmax(logits):
+    logits = logits - logits.max(axis=1, keepdims=True)
+    exp = np.exp(logits)
+    return exp / exp.sum(axis=1, keepdims=True)
+
+
+def train_model(texts, labels, epochs=200, learning_rate=2.0, l2=1e-4):
+    """다항 로지스틱 회귀 학습 (클래스 불균형은 가중치로 보정)"""
+    pairs = [(t, LABEL_INDEX[l]) for t, l in zip(texts, labels) if t and l in LABEL_INDEX]
+    if not pairs:
+        return None
+
+    n_docs = len(pairs)
+    y = np.array([label for _, label in pairs], dtype=np.int64)
+    doc_ids, feature_ids, values = _featurize_batch([text for text, _ in pairs])
+
+    class_counts = np.bincount(y, minlength=len(LABELS)).astype(np.float64)
+    class_weights = n_docs / (len(LABELS) * np.maximum(class_counts, 1))
+    sample_weights = class_weights[y]
+
+    one_hot = np.zeros((n_docs, len(LABELS)))
+    one_hot[np.arange(n_docs), y] = 1.0
+
+    model = {
+        'weights': np.zeros((N_FEATURES, len(LABELS)), dtype=np.float64),
+        'bias': np.zeros(len(LABELS), dtype=np.float64)
+    }
+
+    for _ in range(epochs):
+        probs = _softmax(_logits(model, n_docs, doc_ids, feature_ids, values))
+        grad = (probs - one_hot) * sample_weights[:, None] / n_docs
+
+        for k in range(len(LABELS)):
+            grad_w = np.bincount(
+                feature_ids, weights=grad[doc_ids, k] * values, minlength=N_FEATURES
+            )
+            model['weights'][:, k] -= learning_rate * (grad_w + l2 * model['weights'][:, k])
+        model['bias'] -= learning_rate * grad.sum(axis=0)
+
+    model['n_samples'] = n_docs
+    return model
+
+
+def predict_proba(model, texts):
+    """클래스 확률 (문서 수 × 3, 열 순서는 LABELS)"""
+    if not texts:
+        return np.zeros((0, len(LABELS)))
+
+    doc_ids, feature_ids, values = _featurize_batch(texts)
+    return _softmax(_logits(model, len(texts), doc_ids, feature_ids, values))
+
+
+def predict(model, texts):
+    """(라벨 목록, 신뢰도 배열) 반환"""
+    probs = predict_proba(model, texts)
+    best = probs.argmax(axis=1)
+    return [LABELS[i] for i in best], probs.max(axis=1)
+
+
+def save_model(model, path=MODEL_FILE):
+    """모델 저장 (.npz, 임시 파일에 쓴 뒤 교체해서 다른 프로세스가 쓰다 만 파일을 읽지 않음)"""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temp_file = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(temp_file, 'wb') as f:
+            np.savez_compressed(
+                f,
+                weights=model['weights'].astype(np.float32),
+                bias=model['bias'],
+                n_samples=model.get('n_samples', 0)
+            )
+        os.replace(temp_file, path)
+    finally:
+        if os.path.exists(temp_file):
+            os.remove(temp_file)
+
+
+def load_model(path=MODEL_FILE):
+    """저장된 모델 불러오기 (없으면 None)"""
+    if not os.path.exists(path):
+        return None
+
+    try:
+        with np.load(path) as data:
+            return {
+                'weights': data['weights'].astype(np.float64),
+                'bias': data['bias'],
+                'n_samples': int(data['n_samples'])
+            }
+    except Exception as e:
+        print(f"로컬 감정 모델 로드 실패: {e}")
+        return None
+
+
+def record_llm_labels(texts, labels):
+    """LLM 분류 결과를 학습용 로그에 추가 (실패로 라벨이 None 인 항목은 제외)"""
+    rows = [
+        {'text': text, 'sentiment': label, 'source': LLM_LABEL_SOURCE, 'recorded_at': datetime.now().isoformat()}
+        for text, label in zip(texts, labels) if text and label in LABEL_INDEX
+    ]
+    if not rows:
+        return
+
+    with _model_lock:
+        _training['new_labels'] += len(rows)
+
+    try:
+        with _label_log_lock:
+            os.makedirs(os.path.dirname(LABEL_LOG_FILE), exist_ok=True)
+            with open(LABEL_LOG_FILE, 'a', encoding='utf-8') as f:
+                for row in rows:
+                    f.write(json.dumps(row, ensure_ascii=False) + '\n')
+    except OSError as e:
+        print(f"라벨 로그 저장 실패: {e}")
+
+
+def load_training_data():
+    """SNS 캐시 파일과 LLM 라벨 로그에서 LLM 라벨만 (텍스트, 라벨) 수집 (같은 텍스트는 최신 라벨 사용)"""
+    labeled = {}
+
+    # 이전 위치(data/)와 캐시 저장소(data/cache/)의 SNS 분석 결과 모두 사용
+    cache_files = sorted(glob.glob(os.path.join(DATA_DIR, 'sns_cache_*.json')))
+    cache_files += sorted(glob.glob(os.path.join(cache_store.CACHE_DIR, 'sns_cache_*.json')))
+
+    for cache_file in cache_files:
+        try:
+            with open(cache_file, 'r', encoding='utf-8') as f:
+                cached = json.load(f)
+            for row in cached.get('data', {}).get('detailed_results', []):
+                # 출처 표시가 없는 이전 캐시 결과와 유사 중복에 복사된 라벨은 제외
+                if row.get('label_source') != LLM_LABEL_SOURCE or row.get('duplicate_of'):
+                    continue
+                if row.get('text') and row.get('sentiment') in LABEL_INDEX:
+                    labeled[row['text']] = row['sentiment']
+        except (OSError, ValueError, AttributeError):
+            continue
+
+    if os.path.exists(LABEL_LOG_FILE):
+        with open(LABEL_LOG_FILE, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    row = json.loads(line)
+                except ValueError:
+                    continue
+                # 로그는 record_llm_labels 만 기록 (source 없는 이전 줄도 LLM 라벨)
+                if row.get('source', LLM_LABEL_SOURCE) != LLM_LABEL_SOURCE:
+                    continue
+                if row.get('text') and row.get('sentiment') in LABEL_INDEX:
+                    labeled[row['text']] = row['sentiment']
+
+    return list(labeled.keys()), list(labeled.values())
+
+
+def retrain(save=True):
+    """수집된 라벨로 모델 재학습 (데이터 부족시 None)"""
+    global _model
+
+    texts, labels = load_training_data()
+    if len(texts) < MIN_TRAINING_SAMPLES:
+        print(f"로컬 감정 모델 학습 데이터 부족: {len(texts)}개 (최소 {MIN_TRAINING_SAMPLES}개)")
+        return None
+
+    model = train_model(texts, labels)
+    if model and save:
+        save_model(model)
+
+    with _model_lock:
+        _model = model
+
+    print(f"로컬 감정 모델 학습 완료: {len(texts)}개")
+    return model
+
+
+def _retrain_in_background():
+    try:
+        retrain()
+    except Exception as e:
+        print(f"로컬 감정 모델 학습 실패: {e}")
+    finally:
+        with _model_lock:
+            _training['running'] = False
+
+
+def _should_retrain(now):
+    """백그라운드 학습을 시작할지 (_model_lock 안에서 호출)"""
+    if _training['running']:
+        return False
+    if _training['new_labels'] >= RETRAIN_NEW_LABELS:
+        return True
+    # 모델이 없으면 처음 한 번, 이후 RETRAIN_RETRY_SECONDS 마다 재시도 (라벨이 모였을 수 있음)
+    last_attempt = _training['last_attempt']
+    return _model is None and (last_attempt is None or now - last_attempt >= RETRAIN_RETRY_SECONDS)
+
+
+def get_model():
+    """프로세스 공용 모델 (저장본, 없으면 None)
+
+    저장본이 없으면 백그라운드에서 학습을 시작하고 바로 None 을 반환합니다
+    (페이지 요청 안에서 학습하지 않음. 학습이 끝나면 이후 호출부터 사용).
+    라벨 부족으로 학습하지 못했으면 RETRAIN_RETRY_SECONDS 뒤에 다시 시도하고,
+    마지막 학습 이후 새 LLM 라벨이 RETRAIN_NEW_LABELS 개 쌓이면 다시 학습합니다.
+    """
+    global _model
+
+    with _model_lock:
+        if _model is None:
+            _model = load_model()
+
+        now = time.time()
+        start_training = _should_retrain(now)
+        if start_training:
+            _training.update(running=True, last_attempt=now, new_labels=0)
+        model = _model
+
+    if start_training:
+        threading.Thread(target=_retrain_in_background, name='local-sentiment-train', daemon=True).start()
+
+    return model
+
+
+def classify_with_escalation(texts, llm_classify, threshold=DEFAULT_CONFIDENCE_THRESHOLD, estimate_requests=None):
+    """로컬 모델로 먼저 분류하고, 신뢰도가 낮은 트윗만 LLM으로 보냄
+
+    llm_classify(texts) 는 (라벨 목록, LLM 요청 수)를 반환해야 합니다 (요청이 실패한 항목의 라벨은 None).
+    estimate_requests(n) 은 n개를 모두 LLM으로 분류할 때의 요청 수 (기본: 트윗당 1회).
+    반환값: (라벨 목록, 신뢰도 목록, 통계). 신뢰도는 로컬 모델이 정한 라벨만 있고 LLM 라벨은 None.
+    """
+    estimate_requests = estimate_requests or (lambda count: count)
+    model = get_model()
+
+    if model is None:
+        labels, llm_requests = llm_classify(texts)
+        record_llm_labels(texts, labels)
+        return labels, [None] * len(texts), {
+            'local_model': False,
+            'local_labeled': 0,
+            'escalated': len(texts),
+            'llm_requests': llm_requests,
+            'llm_calls_saved': 0
+        }
+
+    labels, confidences = predict(model, texts)
+    confidences = [float(c) for c in confidences]
+    escalate = [i for i, confidence in enumerate(confidences) if confidence < threshold]
+
+    llm_requests = 0
+    if escalate:
+        escalated_texts = [texts[i] for i in escalate]
+        llm_labels, llm_requests = llm_classify(escalated_texts)
+        for i, label in zip(escalate, llm_labels):
+            labels[i] = label
+            confidences[i] = None
+        record_llm_labels(escalated_texts, llm_labels)
+
+    stats = {
+        'local_model': True,
+        'local_labeled': len(texts) - len(escalate),
+        'escalated': len(escalate),
+        'llm_requests': llm_requests,
+        # 로컬 모델 없이 전부 LLM으로 분류했을 때(같은 배치/동시 설정) 대비 절약한 요청 수
+        'llm_calls_saved': max(estimate_requests(len(texts)) - llm_requests, 0)
+    }
+    print(f"   로컬 분류 {stats['local_labeled']}개 / LLM 위임 {stats['escalated']}개 "
+          f"(LLM 호출 {stats['llm_calls_saved']}회 절약)")
+
+    return labels, confidences, stats
+
+
+if __name__ == "__main__":
+    texts, labels = load_training_data()
+    print(f"학습 데이터: {len(texts)}개")
+
+    if len(texts) >= MIN_TRAINING_SAMPLES:
+        # 간단한 홀드아웃 정확도 (20%)
+        order = np.random.default_rng(0).permutation(len(texts))
+        split = int(len(texts) * 0.8)
+        train_idx, test_idx = order[:split], order[split:]
+        holdout = train_model([texts[i] for i in train_idx], [labels[i] for i in train_idx])
+        predicted, _ = predict(holdout, [texts[i] for i in test_idx])
+        accuracy = np.mean([p == labels[i] for p, i in zip(predicted, test_idx)])
+        print(f"홀드아웃 정확도: {accuracy * 100:.1f}%")
+
+    retrain()
@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+"""
+유사 중복 텍스트 묶기 모듈 (MinHash + LSH 밴딩)
+
+복사해서 이모지/멘션 하나만 바꾼 트윗처럼 거의 같은 텍스트를 한 묶음으로 묶습니다.
+- 정규화한 텍스트의 문자 SHINGLE_SIZE-gram 집합을 NUM_PERM 개 해시 함수로 MinHash 서명 생성 (NumPy)
+- 서명을 BANDS 개 밴드로 나눠 밴드가 하나라도 같은 묶음 대표만 후보로 비교 (전체 쌍 비교 없음)
+- 후보 대표와의 실제 자카드 유사도(shingle 집합)가 threshold 이상이면 그 묶음에 넣음
+  (묶음 구성원끼리 이어 붙이지 않고 모든 구성원이 대표와 직접 비슷해야 하므로,
+  A≈B, B≈C 로 관련 없는 A 와 C 가 한 묶음이 되는 연쇄가 생기지 않음)
+- 묶음 대표는 가장 앞(인게이지먼트 순 정렬이면 반응이 가장 큰) 텍스트
+"""
+import zlib
+
+import numpy as np
+
+from utils import text_normalizer
+
+SHINGLE_SIZE = 3
+
+# 해시 함수 수 = BANDS × 밴드당 행 수 (16 × 4: 유사도 0.8 쌍을 후보로 찾을 확률 99.9% 이상)
+NUM_PERM = 64
+BANDS = 16
+
+DEFAULT_THRESHOLD = 0.8
+
+# MinHash 추정 유사도가 threshold - 이 값 이상인 후보만 실제 자카드 계산 (64개 해시 추정 오차 여유)
+ESTIMATE_MARGIN = 0.15
+
+_PRIME = (1 << 31) - 1
+_rng = np.random.default_rng(20250718)
+_PERM_A = _rng.integers(1, _PRIME, size=NUM_PERM, dtype=np.uint64)
+_PERM_B = _rng.integers(0, _PRIME, size=NUM_PERM, dtype=np.uint64)
+
+
+def shingle_hashes(text, size=SHINGLE_SIZE):
+    """문자 n-gram 해시 배열 (기호/이모지/URL 제거, 소문자. 남는 글자가 없으면 원문 사용)"""
+    text = text_normalizer.normalize_text(text).lower() or (text or '').strip()
+    if len(text) <= size:
+        grams = {text}
+    else:
+        grams = {text[i:i + size] for i in range(len(text) - size + 1)}
+    return np.fromiter((zlib.crc32(gram.encode('utf-8')) for gram in grams), dtype=np.uint64, count=len(grams))
+
+
+def minhash_signatures(texts, shingles=None):
+    """텍스트별 MinHash 서명 (len(texts) × NUM_PERM, shingles 를 넘기면 해시 재계산 생략)"""
+    shingles = [shingle_hashes(text) for text in texts] if shingles is None else shingles
+    signatures = np.empty((len(shingles), NUM_PERM), dtype=np.uint64)
+    for i, hashes in enumerate(shingles):
+        signatures[i] = ((np.outer(_PERM_A, hashes) + _PERM_B[:, None]) % _PRIME).min(axis=1)
+    return signatures
+
+
+def jaccard(a, b):
+    """두 shingle 집합의 자카드 유사도"""
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
+
+
+def band_keys(signature, bands=BANDS):
+    """서명의 밴드별 버킷 키"""
+    rows = len(signature) // bands
+    return [(band, signature[band * rows:(band + 1) * rows].tobytes()) for band in range(bands)]
+
+
+def group_near_duplicates(texts, threshold=DEFAULT_THRESHOLD, bands=BANDS):
+    """유사 중복 묶기
+
+    (텍스트별 대표 인덱스 배열, 대표와의 자카드 유사도 배열) 반환. 대표 자신은 (자기 인덱스, 1.0).
+    앞에서부터 차례로, 밴드가 겹치는 기존 대표 중 유사도가 threshold 이상인 가장 앞 대표에 붙이고
+    없으면 새 대표가 됩니다. threshold 를 낮출 때는 bands 를 늘려야 후보를 놓치지 않습니다 (NUM_PERM 의 약수).
+    """
+    count = len(texts)
+    if count == 0:
+        return np.empty(0, dtype=np.int64), np.empty(0)
+
+    shingles = [shingle_hashes(text) for text in texts]
+    signatures = minhash_signatures(texts, shingles)
+    shingle_sets = [set(hashes.tolist()) for hashes in shingles]
+
+    representatives = np.arange(count, dtype=np.int64)
+    similarities = np.ones(count)
+    buckets = {}
+
+    # 버킷에는 대표만 등록 (바이럴 트윗처럼 같은 텍스트가 많아도 비교 대상은 대표 몇 개뿐)
+    for i in range(count):
+        keys = band_keys(signatures[i], bands)
+        candidates = np.array(sorted({rep for key in keys for rep in buckets.get(key, ())}), dtype=np.int64)
+        if len(candidates):
+            estimates = np.mean(signatures[candidates] == signatures[i], axis=1)
+            candidates = candidates[estimates >= threshold - ESTIMATE_MARGIN]
+        for rep in candidates:
+            similarity = jaccard(shingle_sets[i], shingle_sets[rep])
+            if similarity >= threshold:
+                representatives[i] = int(rep)
+                similarities[i] = similarity
+                break
+        else:
+            for key in keys:
+                buckets.setdefault(key, []).append(i)
+
+    return representatives, similarities
+
+
+def dedupe_stats(representatives):
+    """묶음 통계 (전체 수, 대표 수, 줄어든 수)"""
+    total = len(representatives)
+    unique = len(np.unique(representatives)) if total else 0
+    return {'total': total, 'representatives': unique, 'duplicates': total - unique}
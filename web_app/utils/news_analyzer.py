@@ -2,17 +2,35 @@
 """
 뉴스 분석 모듈 (개선 버전)
 """
-import json
 import requests
-import uuid
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from urllib.parse import urlparse
 from bs4 import BeautifulSoup
 import os
 from dotenv import load_dotenv
 import streamlit as st
-from datetime import datetime
+from utils.clova_client import chat, chat_stream
+from utils import article_store, data_store, extraction_rules, issue_catalog, news_clusters, refresh_scheduler
 
 load_dotenv()
 
+# 요약 프롬프트 템플릿 버전 (프롬프트 수정시 올려서 LLM 캐시 무효화)
+NEWS_SUMMARY_PROMPT_VERSION = 'news-summary-v1'
+
+# 뉴스 요약 캐시 유효 시간 (초)
+NEWS_CACHE_TTL = 3600
+
+# 후보 기사 동시 다운로드 설정
+ARTICLE_FETCH_WORKERS = 8
+PER_HOST_LIMIT = 2
+
+# DB에서 읽는 후보 기사 수 (최신순)
+NEWS_CANDIDATE_POOL = 50
+
+_host_semaphores = {}
+_host_lock = threading.Lock()
+
 
 def debug_environment():
     """환경 변수 및 설정 디버그"""
@@ -41,94 +59,144 @@ def debug_environment():
     return api_key
 
 
-def extract_article_content(url):
-    """뉴스 본문 추출 (개선된 버전)"""
+def get_host_semaphore(url):
+    """호스트별 동시 연결 수 제한용 세마포어"""
+    host = urlparse(url).netloc.lower()
+    with _host_lock:
+        if host not in _host_semaphores:
+            _host_semaphores[host] = threading.BoundedSemaphore(PER_HOST_LIMIT)
+        return _host_semaphores[host]
+
+
+def fetch_article_html(url, cancel_event=None, extra_headers=None):
+    """기사 HTML 다운로드 ((상태코드, 원문 bytes, 응답 헤더) 반환, 취소되면 None)"""
+    headers = {
+        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+        **(extra_headers or {})
+    }
+
+    with get_host_semaphore(url):
+        if cancel_event is not None and cancel_event.is_set():
+            return None
+
+        with requests.get(url, timeout=15, headers=headers, stream=True) as response:
+            chunks = []
+            for chunk in response.iter_content(chunk_size=16384):
+                if cancel_event is not None and cancel_event.is_set():
+                    return None
+                chunks.append(chunk)
+
+            return response.status_code, b''.join(chunks), response.headers
+
+
+def parse_article_content(html, preferred_selector=None):
+    """HTML에서 뉴스 본문 추출 ((본문, 사용한 선택자) 반환, 실패시 본문은 None)
+
+    preferred_selector 가 있으면 그 선택자를 가장 먼저 시도합니다.
+    """
+    soup = BeautifulSoup(html, 'lxml')
+
+    # 확장된 본문 선택자
+    content_selectors = [
+        '.view_con_t', '.article_content', '.news_content', '.content',
+        '.article-content', '.post-content', 'article', '.entry-content',
+        '.article-body', '.news-body', '.post-body', '.article_txt',
+        '#articleText', '.article_view', '.news_view', '.view_text'
+    ]
+
+    if preferred_selector in content_selectors:
+        content_selectors.remove(preferred_selector)
+        content_selectors.insert(0, preferred_selector)
+    elif preferred_selector == extraction_rules.PARAGRAPH_SELECTOR:
+        # 이 도메인은 <p> 이어붙이기만 성공했으므로 선택자 탐색 생략
+        content_selectors = []
+
+    article_text = None
+    used_selector = None
+    for selector in content_selectors:
+        article_content = soup.select_one(selector)
+        if article_content:
+            # 불필요한 태그 제거
+            for tag in article_content(['script', 'style', 'iframe', 'nav', 'footer']):
+                tag.decompose()
+
+            article_text = article_content.get_text(strip=True)
+            if len(article_text) > 300:  # 최소 길이 확인
+                print(f"본문 추출 성공: {selector} ({len(article_text)}자)")
+                used_selector = selector
+                break
+
+    # 전체 텍스트에서 추출 시도
+    if not article_text or len(article_text) < 300:
+        all_text = soup.get_text(strip=True)
+        # 본문으로 보이는 부분 추출
+        paragraphs = soup.find_all('p')
+        if paragraphs:
+            article_text = ' '.join([p.get_text(strip=True) for p in paragraphs])
+            used_selector = extraction_rules.PARAGRAPH_SELECTOR
+        else:
+            article_text = all_text
+            used_selector = None
+
+    # JavaScript 필요 사이트 감지
+    js_indicators = ['javascript', '자바스크립트', 'enable', 'browser', 'disabled']
+    if any(indicator in article_text.lower() for indicator in js_indicators) and len(article_text) < 1000:
+        print("JavaScript 필요 사이트로 판단")
+        return None, used_selector
+
+    # 길이 제한 및 정리
+    if article_text:
+        article_text = article_text[:8000]  # 토큰 제한 고려
+
+        if len(article_text) > 300:
+            print(f"본문 추출 완료: {len(article_text)}자")
+            return article_text, used_selector
+
+    print(f"본문이 너무 짧음: {len(article_text) if article_text else 0}자")
+    return None, used_selector
+
+
+def extract_article_content(url, cancel_event=None):
+    """뉴스 본문 추출 (저장소 재사용, 도메인별로 성공했던 선택자 우선 시도)"""
+    stored = article_store.get(url)
+    if article_store.is_fresh(stored):
+        print(f"저장된 본문 사용: {len(stored['text'] or '')}자")
+        return stored['text']
+
     try:
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        }
-
-        response = requests.get(url, timeout=15, headers=headers)
-        response.encoding = 'utf-8'
-        soup = BeautifulSoup(response.text, 'html.parser')
-
-        # 확장된 본문 선택자
-        content_selectors = [
-            '.view_con_t', '.article_content', '.news_content', '.content',
-            '.article-content', '.post-content', 'article', '.entry-content',
-            '.article-body', '.news-body', '.post-body', '.article_txt',
-            '#articleText', '.article_view', '.news_view', '.view_text'
-        ]
-
-        article_text = None
-        for selector in content_selectors:
-            article_content = soup.select_one(selector)
-            if article_content:
-                # 불필요한 태그 제거
-                for tag in article_content(['script', 'style', 'iframe', 'nav', 'footer']):
-                    tag.decompose()
-
-                article_text = article_content.get_text(strip=True)
-                if len(article_text) > 300:  # 최소 길이 확인
-                    print(f"본문 추출 성공: {selector} ({len(article_text)}자)")
-                    break
-
-        # 전체 텍스트에서 추출 시도
-        if not article_text or len(article_text) < 300:
-            all_text = soup.get_text(strip=True)
-            # 본문으로 보이는 부분 추출
-            paragraphs = soup.find_all('p')
-            if paragraphs:
-                article_text = ' '.join([p.get_text(strip=True) for p in paragraphs])
-            else:
-                article_text = all_text
-
-        # JavaScript 필요 사이트 감지
-        js_indicators = ['javascript', '자바스크립트', 'enable', 'browser', 'disabled']
-        if any(indicator in article_text.lower() for indicator in js_indicators) and len(article_text) < 1000:
-            print("JavaScript 필요 사이트로 판단")
+        fetched = fetch_article_html(url, cancel_event, article_store.conditional_headers(stored))
+        if fetched is None:
             return None
 
-        # 길이 제한 및 정리
-        if article_text:
-            article_text = article_text[:8000]  # 토큰 제한 고려
+        status_code, raw, response_headers = fetched
+        raw_hash = article_store.content_hash(raw)
 
-            if len(article_text) > 300:
-                print(f"본문 추출 완료: {len(article_text)}자")
-                return article_text
+        # 변경 없음 (304 또는 원문 동일) → 파싱 생략
+        if stored and (status_code == 304 or raw_hash == stored.get('content_hash')):
+            print("변경 없음 - 저장된 본문 사용")
+            article_store.mark_validated(url, stored)
+            return stored['text']
 
-        print(f"본문이 너무 짧음: {len(article_text) if article_text else 0}자")
-        return None
+        html = raw.decode('utf-8', errors='replace')
+        article_text, selector = parse_article_content(html, extraction_rules.get_selector(url))
+        extraction_rules.record_result(url, selector, bool(article_text))
+
+        if status_code == 200:
+            article_store.put(
+                url, article_text, raw_hash,
+                etag=response_headers.get('ETag'),
+                last_modified=response_headers.get('Last-Modified')
+            )
+        return article_text
 
     except Exception as e:
         print(f"본문 추출 실패: {e}")
+        extraction_rules.record_result(url, None, False)
         return None
 
 
-def summarize_with_clova(content, investor_type, api_key):
-    """HyperCLOVA X로 뉴스 요약 (개선된 버전)"""
-    if not api_key:
-        print("API 키가 없습니다")
-        return None
-
-    request_id = str(uuid.uuid4()).replace('-', '')
-
-    # 다양한 헤더 설정 시도
-    headers_list = [
-        {
-            'Authorization': api_key,
-            'X-NCP-CLOVASTUDIO-REQUEST-ID': request_id,
-            'Content-Type': 'application/json; charset=utf-8',
-            'Accept': 'text/event-stream'
-        },
-        {
-            'Authorization': f'Bearer {api_key}',
-            'X-NCP-CLOVASTUDIO-REQUEST-ID': request_id,
-            'Content-Type': 'application/json; charset=utf-8',
-            'Accept': 'text/event-stream'
-        }
-    ]
-
+def build_summary_request(content, investor_type):
+    """투자자 유형별 뉴스 요약 요청 (messages, params) 구성"""
     # 투자자 유형별 세분화된 프롬프트
     if investor_type == "MIRAE":
         system_prompt = """당신은 엔터테인먼트 투자 분석 전문가입니다.
@@ -170,8 +238,7 @@ ASAP형 투자자를 위해 다음 뉴스의 핵심을 빠르게 파악할 수 
         {"role": "user", "content": f"뉴스 내용:\n\n{content[:6000]}"}  # 길이 제한
     ]
 
-    request_data = {
-        'messages': messages,
+    params = {
         'topP': 0.6,
         'topK': 0,
         'maxTokens': 800 if investor_type == "MIRAE" else 400,
@@ -182,47 +249,38 @@ ASAP형 투자자를 위해 다음 뉴스의 핵심을 빠르게 파악할 수 
         'seed': 0
     }
 
-    # 여러 헤더로 시도
-    for i, headers in enumerate(headers_list):
-        try:
-            print(f"API 호출 시도 {i + 1}: {investor_type}형")
-
-            with requests.post(
-                    'https://clovastudio.stream.ntruss.com/v3/chat-completions/HCX-005',
-                    headers=headers,
-                    json=request_data,
-                    stream=True,
-                    timeout=30
-            ) as r:
-
-                print(f"응답 상태: {r.status_code}")
-
-                if r.status_code == 401:
-                    print("인증 실패")
-                    continue
-                elif r.status_code != 200:
-                    print(f"HTTP 오류: {r.status_code}")
-                    continue
-
-                for line in r.iter_lines():
-                    if line:
-                        line_text = line.decode("utf-8")
-                        if line_text.startswith('data:'):
-                            try:
-                                data = json.loads(line_text[5:])
-                                if 'message' in data and data['message'].get('content'):
-                                    if data.get('finishReason') == 'stop':
-                                        summary = data['message']['content']
-                                        print(f"요약 생성 성공: {len(summary)}자")
-                                        return summary
-                            except json.JSONDecodeError:
-                                continue
-
-        except Exception as e:
-            print(f"API 호출 실패 {i + 1}: {e}")
-            continue
-
-    return None
+    return messages, params
+
+
+def summarize_with_clova(content, investor_type, api_key):
+    """HyperCLOVA X로 뉴스 요약 (개선된 버전)"""
+    if not api_key:
+        print("API 키가 없습니다")
+        return None
+
+    messages, params = build_summary_request(content, investor_type)
+
+    print(f"API 호출: {investor_type}형")
+    summary = chat(messages, params, api_key=api_key, timeout=30,
+                   prompt_version=NEWS_SUMMARY_PROMPT_VERSION)
+
+    if summary:
+        print(f"요약 생성 성공: {len(summary)}자")
+
+    return summary
+
+
+def stream_summary_with_clova(content, investor_type, api_key, completion=None):
+    """HyperCLOVA X 뉴스 요약 스트리밍 (생성되는 텍스트 조각을 yield, 완료 여부는 completion 에 표시)"""
+    if not api_key:
+        print("API 키가 없습니다")
+        return
+
+    messages, params = build_summary_request(content, investor_type)
+
+    print(f"API 스트리밍 호출: {investor_type}형")
+    yield from chat_stream(messages, params, api_key=api_key, timeout=30,
+                           prompt_version=NEWS_SUMMARY_PROMPT_VERSION, completion=completion)
 
 
 def get_fallback_summary(investor_type):
@@ -236,116 +294,289 @@ def get_fallback_summary(investor_type):
 법적 문제 소지도 제기되고 있어 단기적으로 부정적 여론이 지속될 가능성이 높습니다. 이번 사건은 팬덤과 아티스트 간 신뢰 관계에 즉각적인 타격을 줄 것으로 예상되며, 빠른 사과와 개선책 발표가 필요한 상황입니다."""
 
 
-def find_working_news(json_file, investor_type, max_tries=8):
-    """JSON에서 작동하는 뉴스 찾아서 요약 (개선 버전)"""
+def build_fallback_news_result(investor_type):
+    """대체 요약 결과"""
+    return {
+        "title": "데이식스 팬미팅 본인확인 논란",
+        "url": "#",
+        "date": "2025-07-18",
+        "summary": get_fallback_summary(investor_type),
+        "investor_type": investor_type,
+        "success": True,
+        "source": "fallback"
+    }
 
-    # 환경 디버깅
-    api_key = debug_environment()
 
-    # JSON 읽기
+def load_news_data(json_file):
+    """뉴스 JSON/JSONL 로드 (파일이 없으면 None)"""
     try:
-        with open(json_file, 'r', encoding='utf-8') as f:
-            news_data = json.load(f)
+        return list(data_store.iter_json_records(json_file))
     except FileNotFoundError:
         print(f"파일을 찾을 수 없습니다: {json_file}")
-        return {
-            "title": "데이식스 팬미팅 본인확인 논란",
-            "url": "#",
-            "date": "2025-07-18",
-            "summary": get_fallback_summary(investor_type),
-            "investor_type": investor_type,
-            "success": True,
-            "source": "fallback"
-        }
+        return None
 
-    if not news_data:
-        return {"error": "뉴스 데이터 없음"}
 
-    print(f"🔍 총 {len(news_data)}개 뉴스에서 분석 시작 ({investor_type}형)")
+def load_issue_news(issue, limit=NEWS_CANDIDATE_POOL):
+    """이슈 뉴스 목록 (DB에 있으면 최신순 limit 개만 조회, 없으면 JSON 파일. 둘 다 없으면 None)"""
+    try:
+        if data_store.has_rows('news', issue['issue_id']):
+            return data_store.recent_news(issue['issue_id'], limit)
+    except Exception as e:
+        print(f"뉴스 DB 조회 실패 - 파일 사용: {e}")
+
+    return load_news_data(issue_catalog.issue_data_path(issue, 'news_file'))
+
 
-    # 뉴스 리스트 순회
-    for i, news in enumerate(news_data[:max_tries]):
-        print(f"\n[{i + 1}/{min(max_tries, len(news_data))}] 처리 중...")
-        print(f"제목: {news['title'][:50]}...")
+def iter_working_articles(news_data, max_tries=8):
+    """후보 기사를 동시에 받아 본문 추출에 성공한 순서대로 (시도 순번, 뉴스, 본문) yield
 
-        # 본문 추출
-        article_text = extract_article_content(news['link'])
+    같은 스토리의 전재/재작성 기사는 묶어서 대표 기사 하나만 받습니다
+    (yield 하는 뉴스에 story_size, story_count 포함). 제너레이터를 닫으면 남은 다운로드를 취소합니다.
+    """
+    stories = news_clusters.story_candidates(news_data)
+    if stories:
+        print(f"기사 {len(news_data)}개 → 스토리 {len(stories)}개 (대표 기사만 시도)")
+
+    # 추출 성공률 높은 도메인부터 시도 (늘 실패하는 도메인은 뒤로, 같으면 큰 스토리부터)
+    candidates = extraction_rules.rank_candidates(stories)[:max_tries]
+    if not candidates:
+        return
+
+    cancel_event = threading.Event()
+    executor = ThreadPoolExecutor(max_workers=min(ARTICLE_FETCH_WORKERS, len(candidates)))
+
+    # 후보 기사를 동시에 받아 먼저 통과한 기사부터 사용
+    futures = {
+        executor.submit(extract_article_content, news['link'], cancel_event): news
+        for news in candidates
+    }
+
+    try:
+        for tried_count, future in enumerate(as_completed(futures), 1):
+            news = futures[future]
+            article_text = future.result()
+
+            print(f"\n[{tried_count}/{len(candidates)}] {news['title'][:50]}...")
+
+            if not article_text:
+                print("본문 추출 실패 - 다음 뉴스 시도")
+                continue
 
-        if article_text:
             print(f"본문 길이: {len(article_text)}자")
+            yield tried_count, news, article_text
 
-            # API로 요약 시도
-            if api_key:
-                summary = summarize_with_clova(article_text, investor_type, api_key)
-
-                if summary:
-                    return {
-                        "title": news['title'],
-                        "url": news['link'],
-                        "date": news.get('pub_date', '2025-07-18'),
-                        "summary": summary,
-                        "investor_type": investor_type,
-                        "tried_count": i + 1,
-                        "success": True,
-                        "source": "api"
-                    }
-                else:
-                    print("API 요약 실패 - 다음 뉴스 시도")
-            else:
-                print("API 키 없음 - 대체 요약 사용")
-                break
-        else:
-            print("본문 추출 실패 - 다음 뉴스 시도")
+    finally:
+        # 남은 다운로드 취소 (대기 중인 작업은 취소, 진행 중인 작업은 중단 신호)
+        cancel_event.set()
+        for future in futures:
+            future.cancel()
+        executor.shutdown(wait=False)
 
-    # 모든 시도 실패시 대체 요약 반환
-    print("모든 뉴스 처리 실패 - 대체 요약 사용")
+
+def build_news_result(news, summary, investor_type, tried_count):
+    """API 요약 결과"""
     return {
-        "title": "데이식스 팬미팅 본인확인 논란",
-        "url": "#",
-        "date": "2025-07-18",
-        "summary": get_fallback_summary(investor_type),
+        "title": news['title'],
+        "url": news['link'],
+        "date": news.get('pub_date', '2025-07-18'),
+        "summary": summary,
         "investor_type": investor_type,
+        "tried_count": tried_count,
+        "story_size": news.get('story_size', 1),
+        "story_count": news.get('story_count'),
         "success": True,
-        "source": "fallback"
+        "source": "api"
     }
 
 
-def get_day6_news_summary(investor_type):
-    """데이식스 본인확인 이슈 뉴스 요약 (개선 버전)"""
-    json_file = "data/day6_news.json"
+def find_working_news(json_file, investor_type, max_tries=8, news_data=None):
+    """JSON에서 작동하는 뉴스 찾아서 요약 (개선 버전, news_data 를 넘기면 파일 대신 사용)"""
 
-    # 캐시 확인
-    cache_file = f"data/news_cache_{investor_type.lower()}.json"
+    # 환경 디버깅
+    api_key = debug_environment()
+
+    # JSON 읽기
+    if news_data is None:
+        news_data = load_news_data(json_file)
+    if news_data is None:
+        return build_fallback_news_result(investor_type)
+
+    if not news_data:
+        return {"error": "뉴스 데이터 없음"}
+
+    print(f"🔍 총 {len(news_data)}개 뉴스에서 분석 시작 ({investor_type}형)")
 
+    if not api_key:
+        print("API 키 없음 - 대체 요약 사용")
+        return build_fallback_news_result(investor_type)
+
+    articles = iter_working_articles(news_data, max_tries)
     try:
-        if os.path.exists(cache_file):
-            with open(cache_file, 'r', encoding='utf-8') as f:
-                cached_data = json.load(f)
-                # 캐시가 1시간 이내라면 사용
-                cache_time = datetime.fromisoformat(cached_data.get('timestamp', '2000-01-01'))
-                if (datetime.now() - cache_time).seconds < 3600:
-                    print(f"캐시된 {investor_type}형 뉴스 요약 사용")
-                    return cached_data['data']
-    except:
-        pass
-
-    # 새로 생성
-    result = find_working_news(json_file, investor_type)
-
-    # 캐시 저장
-    if result.get('success'):
-        try:
-            os.makedirs('data', exist_ok=True)
-            cache_data = {
-                'timestamp': datetime.now().isoformat(),
-                'data': result
-            }
-            with open(cache_file, 'w', encoding='utf-8') as f:
-                json.dump(cache_data, f, ensure_ascii=False, indent=2)
-        except:
-            pass
-
-    return result
+        for tried_count, news, article_text in articles:
+            # API로 요약 시도
+            summary = summarize_with_clova(article_text, investor_type, api_key)
+
+            if summary:
+                return build_news_result(news, summary, investor_type, tried_count)
+
+            print("API 요약 실패 - 다음 뉴스 시도")
+    finally:
+        articles.close()
+
+    # 모든 시도 실패시 대체 요약 반환
+    print("모든 뉴스 처리 실패 - 대체 요약 사용")
+    return build_fallback_news_result(investor_type)
+
+
+def news_cache_name(investor_type, issue):
+    """이슈 × 투자자 유형별 뉴스 요약 캐시 이름"""
+    return f"news_cache_{issue['issue_id']}_{investor_type.lower()}"
+
+
+def compute_news_summary(investor_type, issue):
+    """이슈 뉴스 요약 생성 (캐시 미사용, 뉴스는 이때 DB/파일에서 처음 읽음)"""
+    return find_working_news(issue_catalog.issue_data_path(issue, 'news_file'), investor_type,
+                             news_data=load_issue_news(issue))
+
+
+def is_cacheable_result(result):
+    """캐시에 저장할 결과인지 (성공 결과만)"""
+    return bool(result.get('success'))
+
+
+def load_cached_news_summary(investor_type, issue):
+    """캐시된 뉴스 요약 (없으면 None)
+
+    NEWS_CACHE_TTL 이 지난 요약도 바로 반환하고, 갱신은 백그라운드에서 실행합니다.
+    """
+    cached = refresh_scheduler.lookup(
+        news_cache_name(investor_type, issue), NEWS_CACHE_TTL,
+        lambda: compute_news_summary(investor_type, issue), is_cacheable_result
+    )
+    if cached:
+        print(f"캐시된 {investor_type}형 뉴스 요약 사용")
+    return cached
+
+
+def save_news_summary_cache(investor_type, issue, result):
+    """뉴스 요약 캐시 저장 (성공 결과만)"""
+    if is_cacheable_result(result):
+        refresh_scheduler.store(news_cache_name(investor_type, issue), result)
+
+
+def get_news_summary(investor_type, issue=None, refresh=False):
+    """이슈 뉴스 요약 (issue 미지정시 기본 이슈, refresh=True 면 캐시를 무시하고 새로 생성)"""
+    issue = issue_catalog.resolve_issue(issue)
+
+    # 캐시 확인 (만료된 요약은 반환 후 백그라운드 갱신)
+    cached = None if refresh else load_cached_news_summary(investor_type, issue)
+    if cached:
+        return cached
+
+    # 새로 생성 (성공 결과만 캐시 저장)
+    return refresh_scheduler.refresh_now(
+        news_cache_name(investor_type, issue), NEWS_CACHE_TTL,
+        lambda: compute_news_summary(investor_type, issue), is_cacheable_result
+    )
+
+
+def get_news_summary_stream(investor_type, issue=None, refresh=False):
+    """이슈 뉴스 요약 스트리밍 버전 (refresh=True 면 캐시를 무시하고 새로 생성)
+
+    (결과 dict, 요약 텍스트 조각 iterator) 를 반환합니다.
+    결과 dict 의 summary 는 iterator 를 끝까지 소비한 뒤 채워지고, 그때 캐시에 저장됩니다.
+    완료 신호 없이 끊긴 스트림은 summary 를 비워 두고 truncated=True 로 표시합니다 (캐시 저장 안 함).
+    """
+    issue = issue_catalog.resolve_issue(issue)
+    json_file = issue_catalog.issue_data_path(issue, 'news_file')
+
+    cache_name = news_cache_name(investor_type, issue)
+    if refresh:
+        refresh_scheduler.track(cache_name, NEWS_CACHE_TTL, lambda: compute_news_summary(investor_type, issue),
+                                is_cacheable_result)
+    else:
+        cached = load_cached_news_summary(investor_type, issue)
+        if cached:
+            return cached, iter([cached.get('summary', '')])
+
+    # 스트림이 끝날 때까지 스케줄러가 같은 요약을 따로 계산하지 않도록 갱신 중으로 표시
+    marked = refresh_scheduler.mark_refreshing(cache_name)
+    try:
+        result, chunks = _start_news_summary_stream(investor_type, issue, json_file)
+    except BaseException:
+        if marked:
+            refresh_scheduler.clear_refreshing(cache_name)
+        raise
+
+    if not marked:
+        return result, chunks
+    return result, refresh_scheduler.refreshing_until_done(cache_name, chunks)
+
+
+def _start_news_summary_stream(investor_type, issue, json_file):
+    """캐시가 없을 때 요약 스트림 시작 (결과 dict, 요약 텍스트 조각 iterator)"""
+    api_key = debug_environment()
+    news_data = load_issue_news(issue)
+
+    if not api_key or not news_data:
+        # 스트리밍할 요약이 없으므로 기존 경로로 처리 (대체 요약)
+        result = find_working_news(json_file, investor_type, news_data=news_data)
+        save_news_summary_cache(investor_type, issue, result)
+        return result, iter([result.get('summary', '')])
+
+    # 본문 추출에 성공한 기사 순서대로, 요약 스트림이 첫 조각을 내보내는 기사를 사용
+    # (요약 요청이 실패하면 find_working_news 처럼 다음 기사 시도, 찾으면 남은 다운로드 취소)
+    stream = None
+    articles = iter_working_articles(news_data)
+    try:
+        for tried_count, news, article_text in articles:
+            completion = {}
+            deltas = stream_summary_with_clova(article_text, investor_type, api_key, completion)
+            first_delta = next(deltas, None)
+            if first_delta:
+                stream = tried_count, news, deltas, first_delta, completion
+                break
+            print("API 요약 실패 - 다음 뉴스 시도")
+    finally:
+        articles.close()
+
+    if stream is None:
+        print("모든 뉴스 처리 실패 - 대체 요약 사용")
+        result = build_fallback_news_result(investor_type)
+        save_news_summary_cache(investor_type, issue, result)
+        return result, iter([result['summary']])
+
+    tried_count, news, deltas, first_delta, completion = stream
+    result = build_news_result(news, None, investor_type, tried_count)
+
+    def summary_chunks():
+        parts = [first_delta]
+        yield first_delta
+        for delta in deltas:
+            parts.append(delta)
+            yield delta
+
+        if not completion.get('completed'):
+            # 중간에 끊긴 요약은 저장하지 않음 (summary 가 비어 있으면 리포트 캐시에도 저장되지 않음)
+            print("요약 스트림 중단 - 캐시에 저장하지 않음")
+            result['truncated'] = True
+            yield "\n\n⚠️ 요약 생성이 중간에 끊겼습니다. 새로고침하면 다시 생성합니다."
+            return
+
+        result['summary'] = ''.join(parts)
+        save_news_summary_cache(investor_type, issue, result)
+
+    return result, summary_chunks()
+
+
+def get_day6_news_summary(investor_type, refresh=False):
+    """데이식스 본인확인 이슈 뉴스 요약 (기본 이슈)"""
+    return get_news_summary(investor_type, refresh=refresh)
+
+
+def get_day6_news_summary_stream(investor_type):
+    """데이식스 본인확인 이슈 뉴스 요약 스트리밍 버전 (기본 이슈)"""
+    return get_news_summary_stream(investor_type)
 
 
 # 테스트 함수
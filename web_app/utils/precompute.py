@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+"""
+리포트 사전 계산 모듈
+
+Streamlit 없이 이슈 카탈로그의 모든 이슈 × 투자자 유형(MIRAE/ASAP)의 뉴스 요약, SNS 분석과
+재무 인사이트를 워커 풀에서 계산해 캐시 저장소(utils.cache_store)에 저장합니다.
+데이터 수집 직후 실행해 두면 사용자 요청은 항상 캐시에서 처리됩니다.
+
+    python -m utils.precompute                      # web_app 디렉토리에서 실행
+    python -m utils.precompute --types ASAP --sections news sns --workers 2
+"""
+import argparse
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from utils import issue_catalog
+from utils.news_analyzer import get_news_summary
+from utils.sns_analyzer import get_sns_analysis
+from utils.dart_analyzer import get_financial_insight
+
+INVESTOR_TYPES = ["MIRAE", "ASAP"]
+SECTIONS = ["news", "sns", "financial"]
+
+DEFAULT_WORKERS = 4
+
+# 섹션별 분석 함수 (캐시를 무시하고 새로 계산해 저장)
+SECTION_RUNNERS = {
+    "news": lambda issue_id, investor_type: get_news_summary(investor_type, issue_id, refresh=True),
+    "sns": lambda issue_id, investor_type: get_sns_analysis(investor_type, issue_id, refresh=True),
+    # 재무 인사이트는 투자자 유형과 무관 (종목별로 캐시)
+    "financial": lambda issue_id, investor_type: get_financial_insight(issue_id, refresh=True)
+}
+
+
+def build_jobs(issues=None, investor_types=None, sections=None):
+    """(이슈 ID, 섹션, 투자자 유형) 작업 목록 (이슈 미지정시 카탈로그 전체)"""
+    jobs = []
+    financial_stocks = set()
+
+    for issue in issues or [item['issue_id'] for item in issue_catalog.iter_issues()]:
+        for section in sections or SECTIONS:
+            if section == "financial":
+                # 같은 종목의 재무 인사이트는 한 번만
+                stock_code = (issue_catalog.get_issue(issue) or {}).get('stock_code')
+                if stock_code not in financial_stocks:
+                    financial_stocks.add(stock_code)
+                    jobs.append((issue, section, None))
+                continue
+            for investor_type in investor_types or INVESTOR_TYPES:
+                jobs.append((issue, section, investor_type))
+
+    return jobs
+
+
+def run_job(job):
+    """작업 하나 실행 후 (성공 여부, 결과 출처, 소요 시간) 반환"""
+    issue, section, investor_type = job
+    start = time.time()
+
+    try:
+        result = SECTION_RUNNERS[section](issue, investor_type)
+        success = bool(result) and result.get('success', True)
+        source = result.get('source', '-') if result else None
+    except Exception as e:
+        print(f"사전 계산 실패 {job}: {e}")
+        success, source = False, None
+
+    return success, source, time.time() - start
+
+
+def precompute(issues=None, investor_types=None, sections=None, workers=DEFAULT_WORKERS):
+    """모든 작업을 워커 풀에서 실행하고 작업별 결과 목록 반환"""
+    if not issues:
+        # 카탈로그 전체를 계산할 때는 메뉴 인덱스도 새로 만듦 (메뉴 화면에서는 만들지 않음)
+        issue_catalog.rebuild_index()
+
+    jobs = build_jobs(issues, investor_types, sections)
+    print(f"사전 계산 시작: {len(jobs)}개 작업 (워커 {workers}개)")
+
+    results = []
+    start = time.time()
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(run_job, job): job for job in jobs}
+
+        for future in as_completed(futures):
+            issue, section, investor_type = futures[future]
+            success, source, elapsed = future.result()
+            results.append({
+                'issue': issue,
+                'section': section,
+                'investor_type': investor_type,
+                'success': success,
+                'source': source,
+                'elapsed': round(elapsed, 2)
+            })
+            print(f"{'✅' if success else '❌'} {issue} / {section} / {investor_type or '-'} "
+                  f"({source or '실패'}, {elapsed:.1f}초)")
+
+    failed = sum(1 for r in results if not r['success'])
+    print(f"사전 계산 완료: {len(results) - failed}개 성공, {failed}개 실패 ({time.time() - start:.1f}초)")
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="리포트 사전 계산 (캐시 워밍)")
+    parser.add_argument('--issues', nargs='+', help="대상 이슈 ID (기본: 카탈로그 전체)")
+    parser.add_argument('--types', nargs='+', choices=INVESTOR_TYPES, help="투자자 유형 (기본: 전체)")
+    parser.add_argument('--sections', nargs='+', choices=SECTIONS, help="섹션 (기본: 전체)")
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS, help="동시 작업 수")
+    args = parser.parse_args(argv)
+
+    results = precompute(args.issues, args.types, args.sections, max(1, args.workers))
+    return 0 if all(r['success'] for r in results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
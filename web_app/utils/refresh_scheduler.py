@@ -0,0 +1,249 @@
+# -*- coding: utf-8 -*-
+"""
+캐시 백그라운드 갱신 모듈 (stale-while-revalidate)
+
+- 만료된 캐시도 MAX_STALE_AGE 이내면 바로 반환하고, 갱신은 백그라운드 워커에서 실행
+- 최근 조회된 키(HOT_WINDOW 이내)는 스케줄러 스레드가 만료 전에 미리 갱신
+- 키별 메타데이터(경과 시간, 마지막 갱신 상태/소요 시간/오류)는 get_status() 로 확인
+"""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from utils import cache_store
+
+# 만료 후에도 이 시간(초)까지는 이전 결과를 먼저 반환 (그 이상 오래되면 새로 계산될 때까지 대기)
+MAX_STALE_AGE = 24 * 3600
+
+# TTL 대비 이 비율만큼 지나면 만료 전에 미리 갱신
+REFRESH_AHEAD_RATIO = 0.8
+
+# 이 시간(초) 안에 조회된 키만 미리 갱신
+HOT_WINDOW = 1800
+
+# 갱신에 실패한 키는 이 시간(초) 동안 미리 갱신하지 않음
+FAILURE_BACKOFF = 300
+
+# 스케줄러 점검 주기 (초)
+CHECK_INTERVAL = 30
+
+REFRESH_WORKERS = 2
+
+_keys = {}
+_lock = threading.Lock()
+_executor = ThreadPoolExecutor(max_workers=REFRESH_WORKERS, thread_name_prefix='cache-refresh')
+_scheduler_thread = None
+_stop_event = threading.Event()
+
+
+def _register(name, ttl, compute, cacheable):
+    """키 등록 (조회 시각 갱신) 후 메타데이터 반환"""
+    with _lock:
+        meta = _keys.setdefault(name, {
+            'status': None,
+            'refreshing': False,
+            'last_refresh_at': None,
+            'last_duration': None,
+            'last_error': None,
+            'refresh_count': 0
+        })
+        meta.update({'ttl': ttl, 'compute': compute, 'cacheable': cacheable, 'last_access': time.time()})
+        return meta
+
+
+def _run_refresh(name):
+    """갱신 실행 (결과 저장 + 메타데이터 기록)"""
+    with _lock:
+        meta = _keys[name]
+        compute, cacheable = meta['compute'], meta['cacheable']
+
+    start = time.time()
+    result = None
+    try:
+        result = compute()
+        if result is not None and (cacheable is None or cacheable(result)):
+            cache_store.put(name, result)
+            status, error = 'ok', None
+        else:
+            status, error = 'failed', '저장할 수 없는 결과'
+    except Exception as e:
+        print(f"캐시 갱신 실패 ({name}): {e}")
+        status, error = 'failed', str(e)
+
+    with _lock:
+        meta.update({
+            'status': status,
+            'refreshing': False,
+            'last_refresh_at': time.time(),
+            'last_duration': round(time.time() - start, 2),
+            'last_error': error,
+            'refresh_count': meta['refresh_count'] + 1
+        })
+
+    return result
+
+
+def _schedule_refresh(name):
+    """백그라운드 갱신 요청 (같은 키가 갱신 중이면 무시)"""
+    with _lock:
+        meta = _keys[name]
+        if meta['refreshing']:
+            return False
+        meta['refreshing'] = True
+
+    _executor.submit(_run_refresh, name)
+    return True
+
+
+def track(name, ttl, compute, cacheable=None):
+    """캐시를 읽지 않고 키만 등록 (캐시를 무시하고 새로 계산하는 경로에서 mark_refreshing 전에 호출)"""
+    _register(name, ttl, compute, cacheable)
+    ensure_started()
+
+
+def lookup(name, ttl, compute, cacheable=None):
+    """캐시 조회 (계산은 하지 않음)
+
+    유효하면 그대로, 만료됐지만 MAX_STALE_AGE 이내면 이전 결과를 반환하면서 백그라운드 갱신을 예약합니다.
+    없거나 너무 오래됐으면 None.
+    """
+    _register(name, ttl, compute, cacheable)
+    ensure_started()
+
+    data, age, fresh = cache_store.get_with_age(name, ttl)
+    if data is None:
+        return None
+
+    if fresh:
+        return data
+
+    if age < ttl + MAX_STALE_AGE:
+        if _schedule_refresh(name):
+            print(f"만료된 캐시 사용 후 백그라운드 갱신: {name} ({age:.0f}초 경과)")
+        return data
+
+    return None
+
+
+def serve(name, ttl, compute, cacheable=None):
+    """stale-while-revalidate 조회 (사용할 캐시가 없으면 직접 계산 후 저장)"""
+    data = lookup(name, ttl, compute, cacheable)
+    if data is not None:
+        return data
+
+    return refresh_now(name, ttl, compute, cacheable)
+
+
+def refresh_now(name, ttl, compute, cacheable=None):
+    """즉시 계산 후 저장하고 결과 반환"""
+    meta = _register(name, ttl, compute, cacheable)
+    with _lock:
+        meta['refreshing'] = True
+    return _run_refresh(name)
+
+
+def store(name, data):
+    """다른 경로(스트리밍 등)에서 완성한 결과 저장 + 메타데이터 기록"""
+    cache_store.put(name, data)
+
+    with _lock:
+        meta = _keys.get(name)
+        if meta:
+            meta.update({'status': 'ok', 'last_refresh_at': time.time(), 'last_error': None})
+
+
+def mark_refreshing(name):
+    """다른 경로(스트리밍 등)가 키를 계산하는 동안 백그라운드 갱신을 막음 (이미 갱신 중이거나 등록 전이면 False)"""
+    with _lock:
+        meta = _keys.get(name)
+        if meta is None or meta['refreshing']:
+            return False
+        meta['refreshing'] = True
+        return True
+
+
+def clear_refreshing(name):
+    """mark_refreshing 표시 해제"""
+    with _lock:
+        meta = _keys.get(name)
+        if meta:
+            meta['refreshing'] = False
+
+
+def refreshing_until_done(name, chunks):
+    """chunks 를 끝까지 소비하거나 닫을 때(GC 포함) mark_refreshing 표시를 해제하는 iterator"""
+    def wrapper():
+        try:
+            yield
+            yield from chunks
+        finally:
+            clear_refreshing(name)
+
+    # 시작해 둬야 소비하기 전에 닫혀도 finally 가 실행됨
+    stream = wrapper()
+    next(stream)
+    return stream
+
+
+def _refresh_due_keys():
+    """최근 조회됐고 곧 만료될 키를 미리 갱신 (캐시 항목이 없는 키는 조회 경로에서 계산)"""
+    now = time.time()
+    with _lock:
+        hot = [
+            (name, meta['ttl']) for name, meta in _keys.items()
+            if not meta['refreshing'] and now - meta['last_access'] < HOT_WINDOW
+            and not (meta['status'] == 'failed' and now - meta['last_refresh_at'] < FAILURE_BACKOFF)
+        ]
+
+    for name, ttl in hot:
+        entry = cache_store.read_entry(name)
+        if entry is None:
+            continue
+        if cache_store.entry_age(entry) >= ttl * REFRESH_AHEAD_RATIO:
+            if _schedule_refresh(name):
+                print(f"만료 전 미리 갱신: {name}")
+
+
+def _scheduler_loop():
+    while not _stop_event.wait(CHECK_INTERVAL):
+        try:
+            _refresh_due_keys()
+        except Exception as e:
+            print(f"캐시 갱신 스케줄러 오류: {e}")
+
+
+def ensure_started():
+    """스케줄러 스레드 시작 (프로세스당 한 번)"""
+    global _scheduler_thread
+
+    if _scheduler_thread is not None:
+        return
+
+    with _lock:
+        if _scheduler_thread is None:
+            _scheduler_thread = threading.Thread(
+                target=_scheduler_loop, name='cache-refresh-scheduler', daemon=True
+            )
+            _scheduler_thread.start()
+
+
+def get_status(name=None):
+    """키별 메타데이터 (경과 시간, 마지막 갱신 상태 등)"""
+    with _lock:
+        names = [name] if name else list(_keys)
+        snapshot = {
+            n: {k: v for k, v in _keys[n].items() if k not in ('compute', 'cacheable')}
+            for n in names if n in _keys
+        }
+
+    now = time.time()
+    for n, meta in snapshot.items():
+        entry = cache_store.read_entry(n)
+        meta['age'] = round(cache_store.entry_age(entry), 1) if entry else None
+        meta['fresh'] = meta['age'] is not None and meta['age'] < meta['ttl']
+        meta['hot'] = now - meta['last_access'] < HOT_WINDOW
+        for field in ('last_refresh_at', 'last_access'):
+            if meta[field] is not None:
+                meta[f'{field}_ago'] = round(now - meta[field], 1)
+
+    return snapshot.get(name) if name else snapshot
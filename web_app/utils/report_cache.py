@@ -0,0 +1,133 @@
+# -*- coding: utf-8 -*-
+"""
+리포트 결과 프로세스 공용 캐시 모듈
+
+Streamlit 세션/재실행과 관계없이 (섹션, 이슈, 투자자 유형) 키로 분석 결과를 TTL 동안 보관합니다.
+같은 키가 동시에 없으면 한 요청만 계산하고, 나머지는 그 계산이 끝나기를 기다렸다가 결과를 공유합니다.
+"""
+import threading
+import time
+
+DEFAULT_TTL = 600
+
+# 먼저 시작한 계산이 이 시간(초) 안에 끝나지 않으면 기다리지 않고 직접 계산
+INFLIGHT_WAIT_TIMEOUT = 120
+
+_entries = {}
+_inflight = {}
+_lock = threading.Lock()
+_stats = {'hits': 0, 'misses': 0, 'waits': 0}
+
+
+def make_key(section, issue_info=None, investor_type=None):
+    """캐시 키 (섹션, 이슈, 투자자 유형)"""
+    issue_info = issue_info or {}
+    issue_id = issue_info.get('issue_id') or issue_info.get('query') or issue_info.get('title') or 'default'
+    return section, issue_id, investor_type
+
+
+def get(key):
+    """유효한 캐시 값 (없거나 만료되면 None)"""
+    with _lock:
+        entry = _entries.get(key)
+        if entry and entry[0] > time.time():
+            _stats['hits'] += 1
+            return entry[1]
+
+        if entry:
+            del _entries[key]
+        return None
+
+
+def put(key, value, ttl=DEFAULT_TTL):
+    """캐시 저장 (None 은 저장하지 않음)"""
+    if value is None:
+        return
+
+    with _lock:
+        _entries[key] = (time.time() + ttl, value)
+
+
+def begin(key):
+    """계산 시작 요청
+
+    다른 요청이 계산 중이 아니면 True (호출자가 계산 후 반드시 finish 호출).
+    계산 중이면 끝날 때까지 기다린 뒤 False 를 반환합니다 (결과는 get 으로 조회).
+    INFLIGHT_WAIT_TIMEOUT 안에 끝나지 않으면 None 을 반환합니다.
+    """
+    with _lock:
+        event = _inflight.get(key)
+        if event is None:
+            _inflight[key] = threading.Event()
+            _stats['misses'] += 1
+            return True
+        _stats['waits'] += 1
+
+    if not event.wait(INFLIGHT_WAIT_TIMEOUT):
+        print(f"리포트 계산 대기 시간 초과: {key}")
+        return None
+    return False
+
+
+def is_inflight(key):
+    """같은 키를 계산 중인 요청이 있는지"""
+    with _lock:
+        return key in _inflight
+
+
+def finish(key, value=None, ttl=DEFAULT_TTL):
+    """계산 완료 (value 가 있으면 저장) 후 대기 중인 요청 깨우기"""
+    put(key, value, ttl)
+
+    with _lock:
+        event = _inflight.pop(key, None)
+
+    if event:
+        event.set()
+
+
+def get_or_compute(key, compute, ttl=DEFAULT_TTL, cacheable=None):
+    """캐시 조회, 없으면 compute() 결과를 저장 후 반환 (같은 키의 동시 계산은 한 번만)
+
+    cacheable(value) 가 False 인 결과(실패 등)는 반환만 하고 저장하지 않습니다.
+    """
+    while True:
+        value = get(key)
+        if value is not None:
+            return value
+
+        started = begin(key)
+        if started:
+            break
+
+        # 기다린 계산이 성공했으면 그 결과 사용
+        value = get(key)
+        if value is not None:
+            return value
+
+        # 먼저 계산하던 요청이 실패했으면 다시 계산 주도권 요청 (다른 대기자가 잡으면 그 계산을 기다림)
+        if started is False:
+            continue
+        # 대기 시간 초과 - 캐시 없이 직접 계산
+        return compute()
+
+    value = None
+    try:
+        value = compute()
+        return value
+    finally:
+        if cacheable is not None and value is not None and not cacheable(value):
+            value = None
+        finish(key, value, ttl)
+
+
+def clear():
+    """캐시 비우기 (계산 중인 작업은 유지)"""
+    with _lock:
+        _entries.clear()
+
+
+def get_stats():
+    """캐시 통계"""
+    with _lock:
+        return {**_stats, 'entries': len(_entries), 'inflight': len(_inflight)}
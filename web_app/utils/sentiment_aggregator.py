@@ -0,0 +1,195 @@
+# -*- coding: utf-8 -*-
+"""
+감정 라벨 집계 모듈 (NumPy 배열 연산)
+
+라벨을 정수 코드로 바꾼 뒤 np.bincount 로 클래스별 합계를 한 번에 계산합니다.
+- 단순 비율: 트윗 수 × 유사 중복 가중치 (가중치가 없으면 기존 percentages 와 같은 값, counts 는 트윗 수)
+- 반응 가중 비율: (1 + 좋아요 + 리트윗) × 유사 중복 가중치
+- 팔로워 가중 비율: (1 + log(1 + 팔로워 수)) × 유사 중복 가중치
+  (팔로워 수를 그대로 쓰면 대형 계정 하나가 비율을 좌우해서 로그 스케일 사용)
+- 클래스별 대표 트윗: 반응 수 상위 k개 (argpartition, 전체 정렬 없음. 같으면 앞선 트윗)
+- 분산도: 긍정 +1 / 중립 0 / 부정 -1 점수의 평균(순감정)과 표준편차, 정규화 엔트로피
+
+    python -m utils.sentiment_aggregator --benchmark 5000000   # web_app 디렉토리에서 실행
+"""
+import argparse
+import time
+from collections import Counter
+
+import numpy as np
+
+from utils.sentiment_labels import LABELS
+
+# 라벨별 감정 점수 (LABELS 순서: 긍정, 부정, 중립)
+LABEL_SCORES = np.array([1.0, -1.0, 0.0])
+
+# 알 수 없는 라벨은 중립으로 집계
+DEFAULT_LABEL = '중립'
+
+# 클래스별 대표 트윗 수
+SAMPLE_TOP_K = 2
+
+_LABEL_CODES = {label: code for code, label in enumerate(LABELS)}
+
+
+def encode_labels(labels):
+    """라벨 목록 → 정수 코드 배열 (LABELS 순서)"""
+    default = _LABEL_CODES[DEFAULT_LABEL]
+    return np.fromiter((_LABEL_CODES.get(label, default) for label in labels), dtype=np.int64, count=len(labels))
+
+
+def field_array(records, field):
+    """레코드 목록의 숫자 필드 배열 (없거나 None 이면 0)"""
+    return np.fromiter((record.get(field) or 0 for record in records), dtype=np.float64, count=len(records))
+
+
+def engagement_weights(engagement, weights=None):
+    """반응 가중치 (1 + 좋아요 + 리트윗) × 유사 중복 가중치"""
+    result = engagement + 1.0
+    if weights is not None:
+        result *= weights
+    return result
+
+
+def follower_weights(followers, weights=None):
+    """팔로워 가중치 (1 + log(1 + 팔로워 수)) × 유사 중복 가중치 (없는 값은 0명)"""
+    followers = np.nan_to_num(np.asarray(followers, dtype=np.float64), nan=0.0)
+    result = np.log1p(np.maximum(followers, 0, out=followers), out=followers)
+    result += 1.0
+    if weights is not None:
+        result *= weights
+    return result
+
+
+def class_shares(codes, weights=None):
+    """클래스별 비율 배열 (합 1, 전체가 0이면 모두 0)"""
+    sums = np.bincount(codes, weights=weights, minlength=len(LABELS)).astype(np.float64)
+    total = sums.sum()
+    return sums / total if total > 0 else sums
+
+
+def dispersion(shares):
+    """비율 배열의 분산도 (순감정 -1~1, 점수 표준편차, 정규화 엔트로피 0~1)"""
+    net_score = float(shares @ LABEL_SCORES)
+    variance = float(shares @ LABEL_SCORES ** 2) - net_score ** 2
+    nonzero = shares[shares > 0]
+    entropy = float(-(nonzero * np.log(nonzero)).sum() / np.log(len(LABELS))) if len(nonzero) else 0.0
+    return {
+        'net_score': round(net_score, 4),
+        'std': round(max(variance, 0.0) ** 0.5, 4),
+        'entropy': round(entropy, 4)
+    }
+
+
+def top_k_indices(keys, candidates, k=SAMPLE_TOP_K):
+    """candidates(오름차순 인덱스 배열) 중 keys 가 큰 순서로 k개 인덱스 (같으면 인덱스가 작은 것 먼저)"""
+    if k <= 0 or len(candidates) == 0:
+        return candidates[:0]
+    if len(candidates) > k:
+        candidate_keys = keys[candidates]
+        kth = np.partition(candidate_keys, len(candidates) - k)[len(candidates) - k]
+        above = candidates[candidate_keys > kth]
+        tied = candidates[candidate_keys == kth][:k - len(above)]
+        candidates = np.concatenate([above, tied])
+    return candidates[np.lexsort((candidates, -keys[candidates]))]
+
+
+def _to_percentages(shares):
+    return {label: float(share * 100) for label, share in zip(LABELS, shares)}
+
+
+def aggregate(codes, like_counts=None, retweet_counts=None, followers=None, weights=None,
+              sample_mask=None, top_k=SAMPLE_TOP_K):
+    """감정 코드 배열 집계
+
+    weights 는 유사 중복 가중치(대표와의 유사도), sample_mask 는 대표 트윗 후보 (False 는 제외).
+    반환: {'total', 'counts', 'percentages', 'weighted_percentages', 'follower_percentages',
+    'dispersion': {'raw', 'engagement', 'followers'}, 'samples': {라벨: 인덱스 배열}}
+    """
+    codes = np.asarray(codes, dtype=np.int64)
+    count = len(codes)
+    engagement = np.zeros(count)
+    for values in (like_counts, retweet_counts):
+        if values is not None:
+            engagement += np.asarray(values, dtype=np.float64)
+    weights = None if weights is None else np.asarray(weights, dtype=np.float64)
+
+    counts = np.bincount(codes, minlength=len(LABELS))
+    shares = {
+        'raw': class_shares(codes, weights),
+        'engagement': class_shares(codes, engagement_weights(engagement, weights)),
+        'followers': class_shares(codes, follower_weights(np.zeros(count) if followers is None else followers, weights))
+    }
+
+    # 대표 트윗 후보에서 제외할 항목은 클래스 코드를 범위 밖으로 (클래스마다 마스크 한 번씩만 비교)
+    if sample_mask is not None:
+        codes = np.where(np.asarray(sample_mask, dtype=bool), codes, -1)
+    samples = {
+        label: top_k_indices(engagement, np.flatnonzero(codes == code), top_k)
+        for code, label in enumerate(LABELS)
+    }
+
+    return {
+        'total': count,
+        'counts': {label: int(value) for label, value in zip(LABELS, counts)},
+        'percentages': _to_percentages(shares['raw']),
+        'weighted_percentages': _to_percentages(shares['engagement']),
+        'follower_percentages': _to_percentages(shares['followers']),
+        'dispersion': {name: dispersion(value) for name, value in shares.items()},
+        'samples': samples
+    }
+
+
+def make_benchmark_data(count, seed=0):
+    """벤치마크용 가짜 라벨 트윗 (반응/팔로워 수는 긴 꼬리 분포)"""
+    rng = np.random.default_rng(seed)
+    return {
+        'codes': rng.choice(len(LABELS), size=count, p=[0.25, 0.6, 0.15]),
+        'like_counts': rng.zipf(2.0, size=count) - 1,
+        'retweet_counts': rng.zipf(2.5, size=count) - 1,
+        'followers': rng.lognormal(5, 2, size=count).astype(np.int64),
+        'weights': np.where(rng.random(count) < 0.1, 0.85, 1.0)
+    }
+
+
+def _baseline_aggregate(results, top_k=SAMPLE_TOP_K):
+    """이전 분석기 방식 (Counter + 라벨별 전체 순회, 반응 내림차순 정렬된 입력 가정)"""
+    sentiment_counts = Counter(r['sentiment'] for r in results)
+    total = len(results)
+    percentages = {label: (sentiment_counts.get(label, 0) / total * 100) if total > 0 else 0 for label in LABELS}
+    samples = {label: [r['index'] for r in results if r['sentiment'] == label][:top_k] for label in LABELS}
+    return percentages, samples
+
+
+def benchmark(count=5_000_000):
+    """이전 방식과 배열 집계 처리 시간 비교 (밀리초)"""
+    data = make_benchmark_data(count)
+    engagement = data['like_counts'] + data['retweet_counts']
+    order = np.lexsort((np.arange(count), -engagement))
+    data = {name: values[order] for name, values in data.items()}
+
+    results = [{'index': i, 'sentiment': LABELS[code]} for i, code in enumerate(data['codes'].tolist())]
+    start = time.perf_counter()
+    baseline_percentages, baseline_samples = _baseline_aggregate(results)
+    baseline_elapsed = time.perf_counter() - start
+
+    start = time.perf_counter()
+    aggregated = aggregate(**data)
+    elapsed = time.perf_counter() - start
+
+    assert all(abs(aggregated['counts'][label] / count * 100 - baseline_percentages[label]) < 1e-9 for label in LABELS)
+    assert {label: aggregated['samples'][label].tolist() for label in LABELS} == baseline_samples
+
+    print(f"baseline: {count:,}개 {baseline_elapsed * 1000:,.0f}ms (비율 + 대표 트윗만)")
+    print(f"   numpy: {count:,}개 {elapsed * 1000:,.0f}ms (비율 3종 + 대표 트윗 + 분산도)")
+    for name in ['percentages', 'weighted_percentages', 'follower_percentages']:
+        shares = ', '.join(f"{label} {value:.1f}%" for label, value in aggregated[name].items())
+        print(f"{name:>22}: {shares}")
+    print(f"{'dispersion':>22}: {aggregated['dispersion']['raw']}")
+    return {'baseline': baseline_elapsed, 'numpy': elapsed}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="감정 집계 처리 시간 측정")
+    parser.add_argument('--benchmark', type=int, default=5_000_000, help="측정할 트윗 수")
+    benchmark(parser.parse_args().benchmark)
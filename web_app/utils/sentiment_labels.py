@@ -0,0 +1,8 @@
+# -*- coding: utf-8 -*-
+"""
+감정 라벨 공통 상수 (사전/로컬 모델/집계 모듈이 같은 순서를 사용)
+"""
+
+# 라벨 순서 (배열 인덱스 0=긍정, 1=부정, 2=중립)
+LABELS = ['긍정', '부정', '중립']
+LABEL_INDEX = {label: i for i, label in enumerate(LABELS)}
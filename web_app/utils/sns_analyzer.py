@@ -2,69 +2,66 @@
 """
 SNS 감정분석 모듈 (개선 버전)
 """
-import json
-import requests
-import uuid
+import re
 from collections import Counter
+import hashlib
 import os
 from dotenv import load_dotenv
 import streamlit as st
-from datetime import datetime
+from utils.clova_client import chat, get_api_key
+from utils.clova_async import DEFAULT_CONCURRENCY, chat_many
+from utils import (data_store, issue_catalog, lexicon_sentiment, local_sentiment, near_duplicates,
+                   refresh_scheduler, sentiment_aggregator, text_normalizer)
 
 load_dotenv()
 
 
-def get_api_key():
-    """API 키 획득 (환경변수 또는 Streamlit secrets)"""
-    api_key = os.getenv('CLOVA_API_KEY')
+# 트윗 감정분석 샘플링 파라미터
+TWEET_SENTIMENT_PARAMS = {
+    'topP': 0.3,
+    'topK': 0,
+    'maxTokens': 5,
+    'temperature': 0.1,
+    'repetitionPenalty': 1.2,
+    'stop': [],
+    'includeAiFilters': True,
+    'seed': 0
+}
 
-    # Streamlit secrets 확인 (조용히)
-    try:
-        import streamlit as st
-        if hasattr(st, 'secrets') and hasattr(st.secrets, 'get'):
-            secrets_key = st.secrets.get('CLOVA_API_KEY')
-            if secrets_key and not api_key:
-                api_key = secrets_key
-    except:
-        pass  # 에러 메시지 출력하지 않음
+# 프롬프트 템플릿 버전 (프롬프트 수정시 올려서 LLM 캐시 무효화)
+TWEET_PROMPT_VERSION = 'tweet-sentiment-v1'
+BATCH_PROMPT_VERSION = 'tweet-batch-v1'
+REACTION_PROMPT_VERSION = 'sns-reaction-v1'
 
-    return api_key
+# 데이식스 이슈 SNS 분석에 사용하는 뉴스 맥락
+DAY6_NEWS_CONTEXT = "데이식스 팬미팅에서 과도한 본인확인 절차로 인한 팬들의 반발"
 
+# SNS 분석 캐시 유효 시간 (초)
+SNS_CACHE_TTL = 3600
 
-def analyze_single_tweet(tweet_text, news_context, stock_symbol, api_key):
-    """단일 트윗 감정분석 (개선 버전)"""
-    if not api_key:
-        # API 없을 때 간단한 키워드 기반 분석
-        positive_keywords = ['좋', '응원', '사랑', '최고', '대박', '감사', '화이팅']
-        negative_keywords = ['싫', '실망', '화', '최악', '문제', '비판', '반대']
-
-        text_lower = tweet_text.lower()
-        pos_count = sum(1 for word in positive_keywords if word in text_lower)
-        neg_count = sum(1 for word in negative_keywords if word in text_lower)
-
-        if pos_count > neg_count:
-            return '긍정'
-        elif neg_count > pos_count:
-            return '부정'
-        return '중립'
-
-    request_id = str(uuid.uuid4()).replace('-', '')
-
-    headers_list = [
-        {
-            'Authorization': api_key,
-            'X-NCP-CLOVASTUDIO-REQUEST-ID': request_id,
-            'Content-Type': 'application/json; charset=utf-8',
-            'Accept': 'text/event-stream'
-        },
-        {
-            'Authorization': f'Bearer {api_key}',
-            'X-NCP-CLOVASTUDIO-REQUEST-ID': request_id,
-            'Content-Type': 'application/json; charset=utf-8',
-            'Accept': 'text/event-stream'
-        }
-    ]
+# 이 유사도 이상인 트윗은 묶어서 대표 트윗만 분류 (None 이면 묶지 않음)
+NEAR_DUPLICATE_THRESHOLD = near_duplicates.DEFAULT_THRESHOLD
+
+# 유사 중복을 묶을 후보 수 (max_tweets 의 배수, 바이럴 복사 트윗이 상위 자리를 모두 차지하지 않도록)
+CANDIDATE_POOL_FACTOR = 10
+
+# 묶음 하나에서 집계에 넣는 최대 트윗 수 (대표 포함, 바이럴 묶음 하나가 비율을 좌우하지 않도록)
+MAX_GROUP_MEMBERS = 3
 
+# 배치 감정분석 기본 묶음 크기 (K)
+DEFAULT_BATCH_SIZE = 10
+
+# "3: 부정", "[3] 부정", "3. 부정", "3) 부정", "3번: 부정", "3번 트윗: 부정", '"3": "부정"' 형태 모두 허용
+BATCH_LABEL_PATTERN = re.compile(r'(\d+)\s*번?\s*(?:트윗)?\s*["\'\]]?\s*[.):：\-]?\s*["\']?\s*(긍정|부정|중립)')
+
+
+def classify_by_keywords(tweet_text):
+    """API 없을 때 사전 기반 분석 (단일 트윗)"""
+    return lexicon_sentiment.classify_texts([tweet_text])[0]
+
+
+def build_tweet_messages(tweet_text, news_context, stock_symbol):
+    """단일 트윗 감정분석 프롬프트 구성"""
     system_prompt = f"""당신은 주식 투자 전문 감정분석가입니다.
 
 현재 이슈: {news_context}
@@ -79,82 +76,257 @@ def analyze_single_tweet(tweet_text, news_context, stock_symbol, api_key):
 
 감정 하나만 답하고 설명은 절대 하지 마세요."""
 
-    messages = [
+    return [
         {"role": "system", "content": system_prompt},
         {"role": "user", "content": f"트윗: {tweet_text[:500]}"}  # 길이 제한
     ]
 
-    request_data = {
-        'messages': messages,
-        'topP': 0.3,
-        'topK': 0,
-        'maxTokens': 5,
-        'temperature': 0.1,
-        'repetitionPenalty': 1.2,
-        'stop': [],
-        'includeAiFilters': True,
-        'seed': 0
-    }
 
-    # 여러 헤더로 시도
-    for headers in headers_list:
-        try:
-            with requests.post(
-                    'https://clovastudio.stream.ntruss.com/v3/chat-completions/HCX-005',
-                    headers=headers,
-                    json=request_data,
-                    stream=True,
-                    timeout=15
-            ) as r:
-
-                if r.status_code != 200:
-                    continue
-
-                for line in r.iter_lines():
-                    if line:
-                        line_text = line.decode("utf-8")
-                        if line_text.startswith('data:'):
-                            try:
-                                data = json.loads(line_text[5:])
-                                if 'message' in data and data['message'].get('content'):
-                                    if data.get('finishReason') == 'stop':
-                                        sentiment = data['message']['content'].strip()
-                                        if '긍정' in sentiment:
-                                            return '긍정'
-                                        elif '부정' in sentiment:
-                                            return '부정'
-                                        else:
-                                            return '중립'
-                            except:
-                                continue
+def parse_sentiment_label(response_text):
+    """모델 응답을 긍정/부정/중립 라벨로 변환 (응답이 없으면(요청 실패) None, 중립 처리는 집계할 때)"""
+    if not response_text or not response_text.strip():
+        return None
+
+    response_text = response_text.strip()
+    if '긍정' in response_text:
+        return '긍정'
+    elif '부정' in response_text:
+        return '부정'
+    return '중립'
+
+
+def analyze_single_tweet(tweet_text, news_context, stock_symbol, api_key):
+    """단일 트윗 감정분석 (개선 버전)"""
+    if not api_key:
+        return classify_by_keywords(tweet_text)
+
+    messages = build_tweet_messages(tweet_text, news_context, stock_symbol)
+    sentiment = chat(messages, TWEET_SENTIMENT_PARAMS, api_key=api_key, timeout=15,
+                     prompt_version=TWEET_PROMPT_VERSION)
+
+    return parse_sentiment_label(sentiment)
+
+
+def classify_tweets_concurrently(tweet_texts, news_context, stock_symbol, api_key,
+                                 concurrency=DEFAULT_CONCURRENCY):
+    """여러 트윗을 공용 이벤트 루프에서 동시에 감정분석 (입력 순서대로 라벨 반환, 실패한 트윗은 None)"""
+    if not api_key:
+        return lexicon_sentiment.classify_texts(tweet_texts)
+
+    requests_list = [
+        (build_tweet_messages(text, news_context, stock_symbol), TWEET_SENTIMENT_PARAMS)
+        for text in tweet_texts
+    ]
+
+    try:
+        responses = chat_many(requests_list, concurrency=concurrency, api_key=api_key, timeout=15,
+                              prompt_version=TWEET_PROMPT_VERSION)
+    except Exception as e:
+        print(f"동시 감정분석 실패: {e}")
+        responses = [None] * len(tweet_texts)
+
+    return [parse_sentiment_label(response) for response in responses]
+
+
+def build_batch_messages(tweet_texts, news_context, stock_symbol):
+    """여러 트윗을 번호를 붙여 한 번에 분석하는 프롬프트 구성"""
+    system_prompt = f"""당신은 주식 투자 전문 감정분석가입니다.
+
+현재 이슈: {news_context}
+
+위 이슈가 {stock_symbol} 종목에 미칠 영향을 고려하여 번호가 붙은 트윗들을 각각 분석해주세요.
+각 트윗마다 반드시 다음 중 하나로만 답하세요: 긍정, 부정, 중립
+
+판단 기준:
+- 긍정: {stock_symbol}/아티스트에 대한 지지, 응원, 옹호, 지원 표현
+- 부정: 실망, 비판, 우려, 환멸, 불만 등 부정적 감정 표현  
+- 중립: 단순 사실 전달, 관련 없는 내용, 애매한 표현
+
+답변 형식 (트윗 하나당 한 줄, 설명 금지):
+1: 긍정
+2: 부정"""
+
+    numbered = '\n'.join(
+        f"{i}. {text[:500].replace(chr(10), ' ')}"  # 길이 제한, 줄바꿈 제거
+        for i, text in enumerate(tweet_texts, 1)
+    )
+
+    return [
+        {"role": "system", "content": system_prompt},
+        {"role": "user", "content": f"트윗 목록:\n{numbered}"}
+    ]
+
+
+def build_batch_params(batch_size):
+    """배치 크기에 맞춘 샘플링 파라미터"""
+    return {**TWEET_SENTIMENT_PARAMS, 'maxTokens': 10 * batch_size + 10}
+
+
+def parse_batch_labels(response_text, count):
+    """배치 응답에서 {번호(0부터): 라벨} 추출 (범위 밖/중복 번호는 무시)"""
+    labels = {}
+    if not response_text:
+        return labels
 
+    for match in BATCH_LABEL_PATTERN.finditer(response_text):
+        index = int(match.group(1)) - 1
+        if 0 <= index < count and index not in labels:
+            labels[index] = match.group(2)
+
+    return labels
+
+
+def classify_tweets_in_batches(tweet_texts, news_context, stock_symbol, api_key,
+                               batch_size=DEFAULT_BATCH_SIZE, concurrency=1, max_retries=1):
+    """K개씩 묶어 한 요청으로 감정분석 (라벨 목록, 요청 수 반환)
+
+    응답에서 빠졌거나 형식이 잘못된 항목만 다시 묶어 재요청하고,
+    그래도 남은 항목은 단일 트윗 분석으로 처리합니다 (그것도 실패하면 None).
+    """
+    if not api_key:
+        return lexicon_sentiment.classify_texts(tweet_texts), 0
+
+    batch_size = max(1, batch_size)
+    labels = [None] * len(tweet_texts)
+    pending = list(range(len(tweet_texts)))
+    request_count = 0
+
+    for attempt in range(max_retries + 1):
+        if not pending:
+            break
+
+        if attempt > 0:
+            print(f"   누락된 {len(pending)}개 항목 재요청 ({attempt}/{max_retries})")
+
+        chunks = [pending[i:i + batch_size] for i in range(0, len(pending), batch_size)]
+        requests_list = [
+            (build_batch_messages([tweet_texts[j] for j in chunk], news_context, stock_symbol),
+             build_batch_params(len(chunk)))
+            for chunk in chunks
+        ]
+
+        if concurrency > 1:
+            try:
+                responses = chat_many(requests_list, concurrency=concurrency, api_key=api_key, timeout=30,
+                                      prompt_version=BATCH_PROMPT_VERSION)
+            except Exception as e:
+                print(f"배치 동시 요청 실패: {e}")
+                responses = [None] * len(requests_list)
+        else:
+            responses = [
+                chat(messages, params, api_key=api_key, timeout=30, prompt_version=BATCH_PROMPT_VERSION)
+                for messages, params in requests_list
+            ]
+        request_count += len(requests_list)
+
+        for chunk, response in zip(chunks, responses):
+            for position, label in parse_batch_labels(response, len(chunk)).items():
+                labels[chunk[position]] = label
+
+        pending = [i for i in pending if labels[i] is None]
+
+    # 끝까지 누락된 항목은 단일 트윗 분석
+    for i in pending:
+        labels[i] = analyze_single_tweet(tweet_texts[i], news_context, stock_symbol, api_key)
+        request_count += 1
+
+    return labels, request_count
+
+
+def classify_tweets_with_llm(tweet_texts, news_context, stock_symbol, api_key,
+                            concurrency=1, batch_size=None):
+    """설정된 모드(배치/동시/순차)로 LLM 분류 (라벨 목록, 요청 수 반환)
+
+    요청이 실패한 트윗의 라벨은 None 입니다 (학습 라벨로 기록하지 않고, 집계할 때 중립으로 계산).
+    """
+    if batch_size:
+        print(f"   배치 분류 모드 (K={batch_size}, 동시성 {concurrency})")
+        return classify_tweets_in_batches(
+            tweet_texts, news_context, stock_symbol, api_key,
+            batch_size=batch_size, concurrency=concurrency
+        )
+
+    if concurrency > 1:
+        # 동시 분류 모드: 전체를 한 번에 요청 (지연시간 ≈ 가장 느린 1회 왕복)
+        print(f"   동시 분류 모드 (동시성 {concurrency})")
+        labels = classify_tweets_concurrently(
+            tweet_texts, news_context, stock_symbol, api_key, concurrency=concurrency
+        )
+        return labels, len(tweet_texts)
+
+    labels = []
+    for i, text in enumerate(tweet_texts):
+        try:
+            labels.append(analyze_single_tweet(text, news_context, stock_symbol, api_key))
         except Exception as e:
-            continue
+            print(f"트윗 {i + 1} 분석 실패: {e}")
+            labels.append(None)
 
-    return '중립'
+        if (i + 1) % 5 == 0:
+            print(f"   진행: {i + 1}/{len(tweet_texts)} 완료")
+
+    return labels, len(tweet_texts)
+
+
+def estimate_llm_requests(count, batch_size=None):
+    """트윗 count 개를 LLM으로 분류할 때의 기본 요청 수 (배치 모드면 묶음 수, 재요청 제외)"""
+    if batch_size:
+        return -(-count // max(1, batch_size))
+    return count
+
+
+def compare_batch_accuracy(tweets_file, news_context, stock_symbol, max_tweets=20,
+                           batch_size=DEFAULT_BATCH_SIZE):
+    """배치 모드와 단일 트윗 모드의 라벨 일치도 비교 (단일 모드를 기준으로 사용)"""
+    api_key = get_api_key()
+    if not api_key:
+        print("API 키가 없어 비교할 수 없습니다")
+        return None
+
+    texts = text_normalizer.normalize_batch(
+        [tweet.get('text', '') for tweet in load_top_tweets(tweets_file, max_tweets)], strip_symbols=False
+    )
+
+    single_labels = [analyze_single_tweet(text, news_context, stock_symbol, api_key) for text in texts]
+    batch_labels, batch_requests = classify_tweets_in_batches(
+        texts, news_context, stock_symbol, api_key, batch_size=batch_size
+    )
+
+    matched = sum(1 for a, b in zip(single_labels, batch_labels) if a == b)
+    confusion = Counter(f"{a}→{b}" for a, b in zip(single_labels, batch_labels) if a != b)
+    agreement = matched / len(texts) * 100 if texts else 0
 
+    print(f"📏 배치(K={batch_size}) vs 단일 일치율: {agreement:.1f}% ({matched}/{len(texts)})")
+    print(f"   요청 수: 단일 {len(texts)}회 → 배치 {batch_requests}회")
+    if confusion:
+        print(f"   불일치: {dict(confusion)}")
 
-def generate_reaction_summary(sentiment_counts, sample_tweets, investor_type, api_key):
-    """SNS 반응 요약 문장 생성 (개선 버전)"""
+    return {
+        'agreement': agreement,
+        'total': len(texts),
+        'single_requests': len(texts),
+        'batch_requests': batch_requests,
+        'mismatches': dict(confusion)
+    }
+
+
+def generate_reaction_summary(sentiment_counts, sample_tweets, investor_type, api_key, percentages=None):
+    """SNS 반응 요약 문장 생성 (개선 버전)
+
+    percentages 를 넘기면 (화면에 표시하는 가중 비율) 그 값으로 요약하고, 없으면 counts 로 계산합니다.
+    """
     total = sum(sentiment_counts.values())
     if total == 0:
         return "분석할 수 있는 데이터가 부족합니다."
 
-    percentages = {k: (v / total) * 100 for k, v in sentiment_counts.items()}
+    if percentages is None:
+        percentages = {k: (v / total) * 100 for k, v in sentiment_counts.items()}
     dominant_sentiment = max(percentages, key=percentages.get)
 
     # API 없을 때 기본 요약
     if not api_key:
         return get_fallback_reaction_summary(percentages, dominant_sentiment, investor_type)
 
-    request_id = str(uuid.uuid4()).replace('-', '')
-    headers = {
-        'Authorization': api_key,
-        'X-NCP-CLOVASTUDIO-REQUEST-ID': request_id,
-        'Content-Type': 'application/json; charset=utf-8',
-        'Accept': 'text/event-stream'
-    }
-
     # 투자자 유형별 더 명확한 프롬프트
     if investor_type == "MIRAE":
         system_prompt = f"""당신은 SNS 반응 분석 전문가입니다.
@@ -211,8 +383,7 @@ ASAP형 단기 투자자를 위해 감정 분석 결과를 상세히 요약해
         {"role": "user", "content": user_content}
     ]
 
-    request_data = {
-        'messages': messages,
+    params = {
         'topP': 0.8,
         'topK': 0,
         'maxTokens': 300 if investor_type == "MIRAE" else 500,
@@ -223,33 +394,12 @@ ASAP형 단기 투자자를 위해 감정 분석 결과를 상세히 요약해
         'seed': 0
     }
 
-    try:
-        with requests.post(
-                'https://clovastudio.stream.ntruss.com/v3/chat-completions/HCX-005',
-                headers=headers,
-                json=request_data,
-                stream=True,
-                timeout=25
-        ) as r:
-
-            if r.status_code != 200:
-                return get_fallback_reaction_summary(percentages, dominant_sentiment, investor_type)
-
-            for line in r.iter_lines():
-                if line:
-                    line_text = line.decode("utf-8")
-                    if line_text.startswith('data:'):
-                        try:
-                            data = json.loads(line_text[5:])
-                            if 'message' in data and data['message'].get('content'):
-                                if data.get('finishReason') == 'stop':
-                                    return data['message']['content']
-                        except:
-                            continue
-
-    except Exception as e:
-        print(f"요약 생성 실패: {e}")
+    summary = chat(messages, params, api_key=api_key, timeout=25,
+                   prompt_version=REACTION_PROMPT_VERSION)
+    if summary:
+        return summary
 
+    print("요약 생성 실패 - 대체 요약 사용")
     return get_fallback_reaction_summary(percentages, dominant_sentiment, investor_type)
 
 
@@ -268,84 +418,180 @@ def get_fallback_reaction_summary(percentages, dominant_sentiment, investor_type
             return f"""{dominant_sentiment}적 반응이 {percentages[dominant_sentiment]:.1f}%로 우세합니다. 다양한 의견이 표출되고 있으며, 팬덤 내에서도 의견이 분화되는 양상을 보이고 있습니다. 실시간으로 여론이 변화하고 있어 지속적인 모니터링이 필요한 상황입니다."""
 
 
-def analyze_sns_sentiment(tweets_file, news_context, stock_symbol, investor_type="MIRAE", max_tweets=20):
-    """SNS 감정분석 메인 함수 (개선 버전)"""
+def load_top_tweets(tweets_file, max_tweets, issue_id=None, since=None, until=None):
+    """인게이지먼트(좋아요 + 리트윗) 상위 트윗
 
-    # 트윗 데이터 로드
+    issue_id 의 트윗이 DB에 있으면 인덱스 조회로 max_tweets 개만 읽고 (since/until 은 작성 시각 기간),
+    없으면 파일을 읽으면서 크기 max_tweets 힙으로 상위 트윗을 고릅니다 (.jsonl 은 메모리 사용량 일정).
+    파일도 없으면 FileNotFoundError.
+    """
+    if issue_id:
+        try:
+            if data_store.has_rows('tweets', issue_id):
+                return data_store.top_tweets(issue_id, max_tweets, since=since, until=until)
+        except Exception as e:
+            print(f"트윗 DB 조회 실패 - 파일 사용: {e}")
+
+    tweets = data_store.iter_json_records(tweets_file)
+    if since or until:
+        tweets = (
+            tweet for tweet in tweets
+            if (not since or tweet.get('created_at', '') >= since)
+            and (not until or tweet.get('created_at', '') < until)
+        )
+
+    return data_store.top_records(tweets, max_tweets)
+
+
+def select_top_groups(representatives, limit, max_members=MAX_GROUP_MEMBERS):
+    """반응 순 후보 중 앞선 묶음 limit 개의 트윗 인덱스 (대표는 묶음에서 가장 앞선 트윗)
+
+    묶음마다 반응 순으로 max_members 개까지만 남깁니다 (결과는 최대 limit × max_members 개).
+    """
+    kept = set(sorted(set(int(r) for r in representatives))[:limit])
+    members = Counter()
+    selected = []
+    for i, representative in enumerate(representatives):
+        representative = int(representative)
+        if representative in kept and members[representative] < max_members:
+            members[representative] += 1
+            selected.append(i)
+    return selected
+
+
+def analyze_sns_sentiment(tweets_file, news_context, stock_symbol, investor_type="MIRAE", max_tweets=20,
+                          concurrency=1, batch_size=None, local_threshold=None, issue_id=None,
+                          duplicate_threshold=NEAR_DUPLICATE_THRESHOLD):
+    """SNS 감정분석 메인 함수 (개선 버전)
+
+    concurrency > 1 이면 트윗들을 공용 이벤트 루프에서 동시에 분류합니다.
+    batch_size 를 지정하면 K개씩 묶어 한 요청으로 분류합니다 (묶음 요청도 동시 실행).
+    local_threshold 를 지정하면 로컬 모델로 먼저 분류하고 신뢰도가 낮은 트윗만 LLM으로 보냅니다.
+    issue_id 를 지정하면 DB에 저장된 트윗을 우선 사용합니다.
+    duplicate_threshold 이상 비슷한 트윗은 반응 상위 후보(max_tweets × CANDIDATE_POOL_FACTOR)에서 먼저 묶고,
+    앞선 묶음 max_tweets 개만 분석합니다 (묶음마다 MAX_GROUP_MEMBERS 개까지, total_analyzed 는
+    최대 max_tweets × MAX_GROUP_MEMBERS). 묶음 대표만 분류하고, 나머지는 대표 라벨을
+    대표와의 유사도(weight)와 함께 물려받습니다 (비율은 모두 weight 적용, counts 는 트윗 수).
+    """
+    pool_size = max_tweets if duplicate_threshold is None else max_tweets * CANDIDATE_POOL_FACTOR
+
+    # 상위 후보 트윗 로드 (인게이지먼트 기준)
     try:
-        with open(tweets_file, 'r', encoding='utf-8') as f:
-            tweets_data = json.load(f)
+        target_tweets = load_top_tweets(tweets_file, pool_size, issue_id=issue_id)
     except FileNotFoundError:
         print(f"파일을 찾을 수 없습니다: {tweets_file}")
         # 대체 데이터 반환
         return get_fallback_sns_result(investor_type)
 
-    if not tweets_data:
+    if not target_tweets:
         return get_fallback_sns_result(investor_type)
 
     api_key = get_api_key()
     print(f"API 키 상태: {'있음' if api_key else '없음'}")
 
-    # 상위 트윗 분석 (인게이지먼트 기준)
-    sorted_tweets = sorted(
-        tweets_data,
-        key=lambda x: x.get('like_count', 0) + x.get('retweet_count', 0),
-        reverse=True
-    )
-
     results = []
     print(f"🤖 [{investor_type}형] SNS 감정분석 시작... (최대 {max_tweets}개)")
 
-    for i, tweet in enumerate(sorted_tweets[:max_tweets]):
-        try:
-            sentiment = analyze_single_tweet(
-                tweet['text'], news_context, stock_symbol, api_key
-            )
-
-            results.append({
-                'tweet_id': tweet.get('id', f'tweet_{i}'),
-                'text': tweet['text'],
-                'sentiment': sentiment,
-                'like_count': tweet.get('like_count', 0),
-                'retweet_count': tweet.get('retweet_count', 0)
-            })
+    # 분류용 텍스트 정규화 (엔티티/URL/공백 정리, 감정 사전에 쓰이는 이모지와 기호는 유지)
+    target_texts = text_normalizer.normalize_batch(
+        [tweet.get('text', '') for tweet in target_tweets], strip_symbols=False
+    )
 
-            if (i + 1) % 5 == 0:
-                print(f"   진행: {i + 1}/{max_tweets} 완료")
+    # 유사 중복 묶기 → 앞선 묶음 max_tweets 개 선택 (대표 트윗만 분류)
+    if duplicate_threshold is not None:
+        representatives, weights = near_duplicates.group_near_duplicates(target_texts, duplicate_threshold)
+        selected = select_top_groups(representatives, max_tweets)
+        new_index = {index: position for position, index in enumerate(selected)}
+        target_tweets = [target_tweets[index] for index in selected]
+        target_texts = [target_texts[index] for index in selected]
+        representatives = [new_index[int(representatives[index])] for index in selected]
+        weights = [weights[index] for index in selected]
+    else:
+        representatives, weights = list(range(len(target_texts))), [1.0] * len(target_texts)
+    rep_indices = sorted(set(int(r) for r in representatives))
+    rep_position = {index: position for position, index in enumerate(rep_indices)}
+    rep_texts = [target_texts[index] for index in rep_indices]
+    dedupe_stats = near_duplicates.dedupe_stats(representatives)
+    if dedupe_stats['duplicates']:
+        print(f"유사 트윗 묶음: {dedupe_stats['total']}개 → 대표 {dedupe_stats['representatives']}개만 분류")
+
+    rep_confidences = [None] * len(rep_texts)
+    local_stats = None
+
+    # 라벨 출처 (로컬 모델 학습에는 'llm' 라벨만 사용)
+    rep_sources = ['llm'] * len(rep_texts)
+
+    def llm_classify(texts):
+        return classify_tweets_with_llm(
+            texts, news_context, stock_symbol, api_key,
+            concurrency=concurrency, batch_size=batch_size
+        )
 
-        except Exception as e:
-            print(f"트윗 {i + 1} 분석 실패: {e}")
-            # 기본값으로 중립 처리
-            results.append({
-                'tweet_id': f'tweet_{i}',
-                'text': tweet.get('text', ''),
-                'sentiment': '중립',
-                'like_count': tweet.get('like_count', 0),
-                'retweet_count': tweet.get('retweet_count', 0)
-            })
-
-    # 결과 집계
-    sentiments = [r['sentiment'] for r in results]
-    sentiment_counts = Counter(sentiments)
-
-    total = len(results)
-    percentages = {
-        '긍정': (sentiment_counts.get('긍정', 0) / total * 100) if total > 0 else 0,
-        '부정': (sentiment_counts.get('부정', 0) / total * 100) if total > 0 else 0,
-        '중립': (sentiment_counts.get('중립', 0) / total * 100) if total > 0 else 0
-    }
+    if not api_key:
+        # 사전 기반 분석: 전체 트윗을 한 번에 점수화
+        rep_labels = lexicon_sentiment.classify_texts(rep_texts)
+        rep_sources = ['lexicon'] * len(rep_texts)
+        llm_requests = 0
+    elif local_threshold is not None:
+        # 로컬 모델 우선, 신뢰도 낮은 트윗만 LLM으로 (신뢰도가 있는 라벨은 로컬 모델이 정한 것)
+        rep_labels, rep_confidences, local_stats = local_sentiment.classify_with_escalation(
+            rep_texts, llm_classify, threshold=local_threshold,
+            estimate_requests=lambda count: estimate_llm_requests(count, batch_size)
+        )
+        rep_sources = ['llm' if confidence is None else 'local' for confidence in rep_confidences]
+        llm_requests = local_stats['llm_requests']
+    else:
+        rep_labels, llm_requests = llm_classify(rep_texts)
+        # 이후 로컬 모델 학습 데이터로 사용
+        local_sentiment.record_llm_labels(rep_texts, rep_labels)
+
+    # LLM 요청이 실패한 대표 트윗은 출처 없음 (라벨 None, 집계에서만 중립으로 계산)
+    rep_sources = [source if label is not None else None for source, label in zip(rep_sources, rep_labels)]
+    failed_labels = rep_labels.count(None)
+    if failed_labels:
+        print(f"⚠️ LLM 분류 실패 {failed_labels}개 - 집계에서 중립으로 계산")
+
+    for i, tweet in enumerate(target_tweets):
+        representative = int(representatives[i])
+        position = rep_position[representative]
+        weight = float(weights[i])
+        confidence = rep_confidences[position]
+        results.append({
+            'tweet_id': tweet.get('id', f'tweet_{i}'),
+            'text': tweet.get('text', ''),
+            'sentiment': rep_labels[position],
+            'confidence': confidence * weight if confidence is not None else None,
+            'weight': weight,
+            'label_source': rep_sources[position],
+            'duplicate_of': None if representative == i else target_tweets[representative].get('id', f'tweet_{representative}'),
+            'like_count': tweet.get('like_count', 0),
+            'retweet_count': tweet.get('retweet_count', 0),
+            'author_followers': tweet.get('author_followers', 0)
+        })
+
+    # 결과 집계 (단순/반응 가중/팔로워 가중 비율, 분산도, 라벨별 반응 상위 대표 트윗)
+    aggregated = sentiment_aggregator.aggregate(
+        sentiment_aggregator.encode_labels([r['sentiment'] for r in results]),
+        like_counts=sentiment_aggregator.field_array(results, 'like_count'),
+        retweet_counts=sentiment_aggregator.field_array(results, 'retweet_count'),
+        followers=sentiment_aggregator.field_array(results, 'author_followers'),
+        weights=[r['weight'] for r in results],
+        sample_mask=[r['duplicate_of'] is None and r['sentiment'] is not None for r in results]
+    )
+    total = aggregated['total']
+    sentiment_counts = aggregated['counts']
+    percentages = aggregated['percentages']
 
-    # 대표 트윗 선별
+    # 대표 트윗 (유사 중복 제외)
     sample_tweets = {
-        '긍정': [r for r in results if r['sentiment'] == '긍정'][:2],
-        '부정': [r for r in results if r['sentiment'] == '부정'][:2],
-        '중립': [r for r in results if r['sentiment'] == '중립'][:2]
+        label: [results[index] for index in indices]
+        for label, indices in aggregated['samples'].items()
     }
 
     # 반응 요약 생성
     print(f"📝 [{investor_type}형] 반응 요약 생성 중...")
     reaction_summary = generate_reaction_summary(
-        sentiment_counts, sample_tweets, investor_type, api_key
+        sentiment_counts, sample_tweets, investor_type, api_key, percentages=percentages
     )
 
     print(f"✅ [{investor_type}형] SNS 분석 완료!")
@@ -353,13 +599,20 @@ def analyze_sns_sentiment(tweets_file, news_context, stock_symbol, investor_type
     return {
         'success': True,
         'percentages': percentages,
+        'weighted_percentages': aggregated['weighted_percentages'],
+        'follower_percentages': aggregated['follower_percentages'],
+        'dispersion': aggregated['dispersion'],
         'sentiment_counts': sentiment_counts,
         'total_analyzed': total,
         'sample_tweets': sample_tweets,
         'reaction_summary': reaction_summary,
         'detailed_results': results,
         'investor_type': investor_type,
-        'api_used': bool(api_key)
+        'api_used': bool(api_key),
+        'llm_requests': llm_requests,
+        'failed_labels': failed_labels,
+        'local_stats': local_stats,
+        'dedupe_stats': dedupe_stats
     }
 
 
@@ -394,49 +647,75 @@ def get_fallback_sns_result(investor_type):
     }
 
 
-def get_day6_sns_analysis(news_context, investor_type="MIRAE"):
-    """데이식스 본인확인 이슈 SNS 분석 (캐시 지원)"""
-    tweets_file = "data/day6_tweets.json"
+def issue_news_context(issue, news_context=None):
+    """분류 프롬프트에 넣을 이슈 설명 (지정값 → 이슈의 news_context → description)"""
+    return news_context or issue.get('news_context') or issue.get('description', '')
 
-    # 캐시 확인
-    cache_file = f"data/sns_cache_{investor_type.lower()}.json"
 
-    try:
-        if os.path.exists(cache_file):
-            with open(cache_file, 'r', encoding='utf-8') as f:
-                cached_data = json.load(f)
-                # 캐시가 1시간 이내라면 사용
-                cache_time = datetime.fromisoformat(cached_data.get('timestamp', '2000-01-01'))
-                if (datetime.now() - cache_time).seconds < 3600:
-                    print(f"캐시된 {investor_type}형 SNS 분석 사용")
-                    return cached_data['data']
-    except:
-        pass
-
-    # 새로 분석
-    result = analyze_sns_sentiment(tweets_file, news_context, "JYP", investor_type, max_tweets=15)
-
-    # 캐시 저장
-    if result.get('success'):
-        try:
-            os.makedirs('data', exist_ok=True)
-            cache_data = {
-                'timestamp': datetime.now().isoformat(),
-                'data': result
-            }
-            with open(cache_file, 'w', encoding='utf-8') as f:
-                json.dump(cache_data, f, ensure_ascii=False, indent=2)
-        except:
-            pass
+def sns_cache_name(investor_type, issue, news_context=None):
+    """이슈 × 투자자 유형별 SNS 분석 캐시 이름
+
+    이슈 설명을 따로 지정했으면 그 해시를 붙여 기본 설명의 결과와 섞이지 않게 합니다.
+    """
+    name = f"sns_cache_{issue['issue_id']}_{investor_type.lower()}"
+    context = issue_news_context(issue, news_context)
+    if context != issue_news_context(issue):
+        name += f"_{hashlib.sha256(context.encode('utf-8')).hexdigest()[:12]}"
+    return name
+
+
+def compute_sns_analysis(investor_type, issue, news_context=None):
+    """이슈 SNS 분석 실행 (캐시 미사용, 트윗은 이때 DB/파일에서 처음 읽음)"""
+    tweets_file = issue_catalog.issue_data_path(issue, 'tweets_file')
+    news_context = issue_news_context(issue, news_context)
+
+    # SNS_BATCH_SIZE 환경변수로 배치 모드 사용 (미설정시 트윗별 동시 분류)
+    batch_size = int(os.getenv('SNS_BATCH_SIZE', '0')) or None
+    # SNS_LOCAL_THRESHOLD 환경변수로 로컬 모델 우선 분류 사용
+    local_threshold = float(os.getenv('SNS_LOCAL_THRESHOLD', '0')) or None
+    return analyze_sns_sentiment(tweets_file, news_context, issue.get('stock_symbol', ''), investor_type,
+                                 max_tweets=15, concurrency=DEFAULT_CONCURRENCY, batch_size=batch_size,
+                                 local_threshold=local_threshold, issue_id=issue['issue_id'])
+
+
+def get_sns_analysis(investor_type="MIRAE", issue=None, refresh=False, news_context=None):
+    """이슈 SNS 분석 (캐시 지원, issue 미지정시 기본 이슈, refresh=True 면 캐시를 무시하고 새로 분석)
+
+    캐시가 만료됐으면 이전 결과를 바로 반환하고 백그라운드에서 갱신합니다.
+    """
+    issue = issue_catalog.resolve_issue(issue)
+    cache_name = sns_cache_name(investor_type, issue, news_context)
+
+    def compute():
+        return compute_sns_analysis(investor_type, issue, news_context)
+
+    if refresh:
+        return refresh_scheduler.refresh_now(cache_name, SNS_CACHE_TTL, compute, is_cacheable_result)
+
+    cached = refresh_scheduler.lookup(cache_name, SNS_CACHE_TTL, compute, is_cacheable_result)
+    if cached:
+        print(f"캐시된 {investor_type}형 SNS 분석 사용")
+        return cached
+
+    # 새로 분석 (성공 결과만 캐시 저장)
+    return refresh_scheduler.refresh_now(cache_name, SNS_CACHE_TTL, compute, is_cacheable_result)
+
+
+def get_day6_sns_analysis(news_context=DAY6_NEWS_CONTEXT, investor_type="MIRAE", refresh=False):
+    """데이식스 본인확인 이슈 SNS 분석 (기본 이슈)"""
+    return get_sns_analysis(investor_type, refresh=refresh, news_context=news_context)
+
 
-    return result
+def is_cacheable_result(result):
+    """캐시에 저장할 결과인지 (성공 결과만)"""
+    return bool(result.get('success'))
 
 
 def test_sns_analysis():
     """SNS 분석 테스트"""
     print("SNS 분석 테스트 시작")
 
-    news_context = "데이식스 팬미팅에서 과도한 본인확인 절차로 인한 팬들의 반발"
+    news_context = DAY6_NEWS_CONTEXT
 
     for investor_type in ["MIRAE", "ASAP"]:
         print(f"\n=== {investor_type}형 테스트 ===")
@@ -0,0 +1,176 @@
+# -*- coding: utf-8 -*-
+"""
+트윗/기사 텍스트 정규화 모듈 (수집기와 분석기 공용)
+
+- HTML 엔티티 디코딩 → URL 제거 → (선택) 한글/영문/숫자/#/@ 외 기호 제거 → 공백 정리
+- 정규식은 모듈 로드시 한 번만 컴파일, 공백 정리는 정규식 대신 split/join (약 3배 빠름)
+- 묶음 처리: 리스트는 컴파일된 정규식으로, pandas Series 는 .str 벡터 연산으로 처리
+  (pyarrow 가 있으면 Arrow 문자열로 바꿔 RE2 로 실행. RE2 의 \\w, \\s 는 ASCII 전용이라
+  유니코드 속성으로 같은 문자 집합을 지정한 패턴을 따로 사용)
+- 품질 필터(짧은 글, 링크 도배, 봇 키워드)와 완전 중복 제거 마스크 제공
+
+    python -m utils.text_normalizer --benchmark 1000000   # web_app 디렉토리에서 실행, 처리량 측정
+"""
+import argparse
+import html
+import importlib.util
+import random
+import re
+import time
+
+import pandas as pd
+
+# pyarrow 가 설치되어 있으면 Arrow 문자열로 벡터 처리 (import 하지 않고 설치 여부만 확인)
+ARROW_STRING_DTYPE = 'string[pyarrow]' if importlib.util.find_spec('pyarrow') else None
+
+URL_PATTERN = re.compile(r'http[s]?://[^\s]+')
+SYMBOL_PATTERN = re.compile(r'[^\w\s가-힣#@]')
+
+# Arrow(RE2)용 패턴: 파이썬 str 정규식의 \s, \w 와 같은 문자 집합
+# (파이썬 유니코드 표에 아직 없는 최신 문자만 RE2 쪽에서 글자로 취급)
+_RE2_SPACE = r'\s\p{Z}\x{0b}\x{1c}-\x{1f}\x{85}'
+_RE2_WORD = r'\p{L}\p{N}_'
+RE2_URL_PATTERN = rf'http[s]?://[^{_RE2_SPACE}]+'
+RE2_SYMBOL_PATTERN = rf'[^{_RE2_WORD}{_RE2_SPACE}#@]'
+RE2_SPACE_RUN_PATTERN = rf'[{_RE2_SPACE}]+'
+
+# 봇/자동 게시 트윗 키워드 (대소문자 무시)
+BOT_KEYWORDS = ['bot', '자동', 'automatic']
+BOT_PATTERN = re.compile('|'.join(re.escape(keyword) for keyword in BOT_KEYWORDS), re.IGNORECASE)
+
+# 이보다 짧은 정규화 텍스트는 제외
+MIN_TEXT_LENGTH = 10
+
+# 링크가 이보다 많으면 링크 도배로 보고 제외
+MAX_LINKS = 1
+
+
+def normalize_text(text, strip_symbols=True):
+    """텍스트 하나 정규화 (strip_symbols=False 면 이모지/문장부호 유지)"""
+    text = html.unescape(text or '')
+    text = URL_PATTERN.sub('', text)
+    if strip_symbols:
+        text = SYMBOL_PATTERN.sub(' ', text)
+    return ' '.join(text.split())
+
+
+def normalize_series(texts, strip_symbols=True):
+    """pandas Series 정규화 (.str 벡터 연산, '&' 가 있는 행만 엔티티 디코딩)"""
+    texts = texts.fillna('').astype(ARROW_STRING_DTYPE or str)
+
+    has_entity = texts.str.contains('&', regex=False)
+    if has_entity.any():
+        texts = texts.copy()
+        texts[has_entity] = texts[has_entity].map(html.unescape)
+
+    if ARROW_STRING_DTYPE is None:
+        texts = texts.str.replace(URL_PATTERN, '', regex=True)
+        if strip_symbols:
+            texts = texts.str.replace(SYMBOL_PATTERN, ' ', regex=True)
+        return texts.str.split().str.join(' ')
+
+    texts = texts.str.replace(RE2_URL_PATTERN, '', regex=True)
+    if strip_symbols:
+        texts = texts.str.replace(RE2_SYMBOL_PATTERN, ' ', regex=True)
+    return texts.str.replace(RE2_SPACE_RUN_PATTERN, ' ', regex=True).str.strip(' ')
+
+
+def normalize_batch(texts, strip_symbols=True):
+    """텍스트 묶음 정규화 (리스트 → 리스트, Series → Series)"""
+    if isinstance(texts, pd.Series):
+        return normalize_series(texts, strip_symbols)
+    return [normalize_text(text, strip_symbols) for text in texts]
+
+
+def is_low_quality(text):
+    """수집 제외 대상인지 (너무 짧음 / 링크 도배 / 봇 키워드)"""
+    return (len(text) < MIN_TEXT_LENGTH
+            or text.count('https://') > MAX_LINKS
+            or BOT_PATTERN.search(text) is not None)
+
+
+def quality_mask(texts):
+    """정규화된 텍스트 묶음 중 남길 항목 (리스트 → bool 리스트, Series → bool Series)"""
+    if isinstance(texts, pd.Series):
+        bot_pattern = BOT_PATTERN if ARROW_STRING_DTYPE is None else f"(?i){BOT_PATTERN.pattern}"
+        return ~((texts.str.len() < MIN_TEXT_LENGTH)
+                 | (texts.str.count('https://') > MAX_LINKS)
+                 | texts.str.contains(bot_pattern)).astype(bool)
+    return [not is_low_quality(text) for text in texts]
+
+
+def unique_mask(texts, seen=None):
+    """처음 나온 텍스트만 True (seen 집합을 넘기면 이전 묶음과도 비교하고 갱신)"""
+    seen = set() if seen is None else seen
+    mask = []
+    for text in texts:
+        mask.append(text not in seen)
+        seen.add(text)
+    return mask
+
+
+def clean_tweet_texts(texts, seen=None):
+    """수집기용: 정규화 + 품질 필터 + 중복 제거. (정규화 텍스트 목록, 남길 항목 bool 목록) 반환"""
+    normalized = normalize_batch(list(texts))
+    keep = unique_mask(normalized, seen)
+    quality = quality_mask(normalized)
+    return normalized, [k and q for k, q in zip(keep, quality)]
+
+
+def make_benchmark_texts(count, seed=0):
+    """벤치마크용 가짜 트윗 (URL, 엔티티, 이모지, 멘션 포함)"""
+    rng = random.Random(seed)
+    words = ['데이식스', '본인확인', '팬미팅', '너무', '과도한', '개인정보', '응원해', 'JYP', '진짜', '환불',
+             '#DAY6', '@day6official', '&amp;', '&quot;', '😡', '❤', 'ㅠㅠ', '!!', '...', 'bot']
+    texts = []
+    for _ in range(count):
+        text = ' '.join(rng.choice(words) for _ in range(rng.randint(5, 25)))
+        if rng.random() < 0.3:
+            text += f" https://t.co/{rng.randrange(10 ** 8)}"
+        texts.append(text)
+    return texts
+
+
+def _baseline_clean(text):
+    """이전 수집기 방식 (트윗마다 정규식 4번 + 봇 키워드 부분 문자열 검사)"""
+    text = html.unescape(text.strip())
+    text = re.sub(r'http[s]?://[^\s]+', '', text)
+    text = re.sub(r'[^\w\s가-힣#@]', ' ', text)
+    text = re.sub(r'\s+', ' ', text).strip()
+    keep = not (len(text) < 10 or text.count('https://') > 1
+                or any(bot_keyword in text.lower() for bot_keyword in BOT_KEYWORDS))
+    return text, keep
+
+
+def benchmark(count=1_000_000):
+    """이전 방식 / 리스트 경로 / pandas 경로의 정규화 + 품질 필터 처리량 측정 (초당 트윗 수)"""
+    texts = make_benchmark_texts(count)
+    results = {}
+
+    start = time.perf_counter()
+    baseline = [_baseline_clean(text) for text in texts]
+    results['baseline'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    normalized = normalize_batch(texts)
+    quality_mask(normalized)
+    results['list'] = time.perf_counter() - start
+
+    series = pd.Series(texts)
+    start = time.perf_counter()
+    normalized_series = normalize_batch(series)
+    quality_mask(normalized_series)
+    results['pandas'] = time.perf_counter() - start
+
+    assert normalized == normalized_series.tolist() == [text for text, _ in baseline]
+    assert quality_mask(normalized) == quality_mask(normalized_series).tolist() == [keep for _, keep in baseline]
+
+    for name, elapsed in results.items():
+        print(f"{name:>8}: {count:,}개 {elapsed:.2f}초 ({count / elapsed:,.0f}개/초)")
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="텍스트 정규화 처리량 측정")
+    parser.add_argument('--benchmark', type=int, default=1_000_000, help="측정할 트윗 수")
+    benchmark(parser.parse_args().benchmark)